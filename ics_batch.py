@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+ics_batch.py
+
+Batch mode for ICS_generator.py: one calendar per learner/cohort, fanned out
+across a process pool.
+
+The cohort manifest is CSV (header row) or JSON (list of objects) with:
+    name        required; used for the default output name and to scope UIDs
+    start_date  YYYY-MM-DD (default: ics_schedule.START_DATE)
+    tzid        default: ics_schedule.TZID
+    months      enabled months, e.g. "1-6" or "1,3,5" (default: all)
+    format      ics | icalendar | json | csv (default: ics)
+    output      default: <out_dir>/<name>.<ext>
+
+Description fragments, their escaped forms and the VTIMEZONE blocks are warmed
+once in the parent before the pool starts (inherited by forked workers) and by
+the pool initializer otherwise, so every cohort a worker renders reuses them.
+"""
+
+import csv
+import datetime as dt
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ics_schedule import (DAY_THEMES, FOOTER_FRAGMENTS, PLAN, SLOT_EXTRAS, START_DATE, TOTAL_WEEKS, TZID,
+                          fragments, iter_records, month_fragments, theme_fragments)
+from ics_serializers import SERIALIZERS, escape_text, open_output, vtimezone
+
+EXTENSIONS = {"ics": "ics", "icalendar": "ics", "json": "json", "csv": "csv"}
+
+
+def parse_months(spec):
+    # "1-3,6" -> {1, 2, 3, 6}; empty -> None (all months)
+    if spec is None or str(spec).strip() == "":
+        return None
+    if isinstance(spec, (list, tuple)):
+        return {int(m) for m in spec}
+    months = set()
+    for part in str(spec).split(","):
+        lo, _, hi = part.strip().partition("-")
+        months.update(range(int(lo), int(hi or lo) + 1))
+    return months
+
+def load_cohorts(path, out_dir="."):
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".json"):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+    cohorts = []
+    for row in rows:
+        name = row["name"].strip()
+        fmt = (row.get("format") or "ics").strip()
+        if fmt not in SERIALIZERS:
+            raise ValueError(f"cohort {name!r}: unknown format {fmt!r}")
+        start = row.get("start_date")
+        cohorts.append({
+            "name": name,
+            "start_date": dt.date.fromisoformat(start.strip()) if start else START_DATE,
+            "tzid": (row.get("tzid") or TZID).strip(),
+            "months": parse_months(row.get("months")),
+            "format": fmt,
+            "output": row.get("output") or os.path.join(out_dir, f"{name}.{EXTENSIONS[fmt]}"),
+        })
+    return cohorts
+
+def warm_caches(tzids):
+    # Everything that does not depend on the cohort: VTIMEZONE blocks and the
+    # month/theme description fragments with their escaped bytes.
+    for tzid in tzids:
+        vtimezone(tzid)
+    lines = list(FOOTER_FRAGMENTS) + list(fragments(*SLOT_EXTRAS.values()))
+    for theme, _ in DAY_THEMES.values():
+        head, micro = theme_fragments(theme)
+        lines += head + micro
+    for _, weeks in PLAN:
+        lines += month_fragments(weeks[4], weeks[5], weeks[6]) + tuple(weeks)
+    for line in lines:
+        escape_text(line)
+
+def render_cohort(cohort):
+    # Runs in a worker process; returns (name, output, events, seconds)
+    t0 = time.perf_counter()
+    records = iter_records(cohort["start_date"], TOTAL_WEEKS, months=cohort["months"])
+    out, _ = open_output(cohort["output"])
+    try:
+        events = SERIALIZERS[cohort["format"]](records, out, tzid=cohort["tzid"], scope=cohort["name"])
+    finally:
+        out.close()
+    return cohort["name"], cohort["output"], events, time.perf_counter() - t0
+
+def run_batch(manifest_path, out_dir=".", workers=None):
+    cohorts = load_cohorts(manifest_path, out_dir)
+    for c in cohorts:
+        parent = os.path.dirname(c["output"])
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+    tzids = sorted({c["tzid"] for c in cohorts})
+    warm_caches(tzids)
+
+    t0 = time.perf_counter()
+    total_events = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_caches, initargs=(tzids,)) as pool:
+        for name, output, events, seconds in pool.map(render_cohort, cohorts):
+            total_events += events
+            print(f"  {name}: {events} events -> {output} ({seconds:.3f}s)")
+    elapsed = time.perf_counter() - t0
+
+    rate = len(cohorts) / elapsed if elapsed else float("inf")
+    print(f"Wrote {len(cohorts)} calendars, {total_events} events in {elapsed:.2f}s "
+          f"({rate:.1f} calendars/s, {total_events / elapsed if elapsed else 0:.0f} events/s)")
+    return len(cohorts), total_events, elapsed
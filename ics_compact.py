@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+ics_compact.py
+
+Compaction pass for the raw ics writer: the weekday sessions of a month are
+folded into one recurring VEVENT per (month, weekday, slot) instead of one
+VEVENT per week, so the alarm, the shared description lines and the event
+envelope are written once per series.
+
+Instance times are preserved exactly. A series whose sessions share their time
+of day and length becomes RRULE:FREQ=WEEKLY;COUNT=n (with EXDATE for skipped
+weeks); one with a fixed length but moving start times lists the extra starts
+in RDATE; anything else uses RDATE;VALUE=PERIOD with a per-instance duration.
+The series carries its first session's summary and description; every session
+whose text differs gets a RECURRENCE-ID override with its own, so each instance
+reads exactly as in the uncompacted calendar. Overrides cost about as much as
+the single events they replace, so a group is only written as a series when
+that is smaller. Checkpoints, sprints, demos and the reflect event stay as they
+are.
+
+Usage:
+    python ics_compact.py            # report size reduction and verify instances
+                                     # (times, summaries and descriptions)
+"""
+
+import collections
+import datetime as dt
+import sys
+
+from ics_schedule import START_DATE, TOTAL_WEEKS, TZID, event_uid, fmt_local, iter_records
+from ics_serializers import calendar_header, event_block, iter_ics, write_calendar
+
+SERIES_SLOTS = ("am1", "am2", "pm")
+
+
+def series_key(rec):
+    # Records sharing a key are candidates for one recurring VEVENT
+    if rec.slot in SERIES_SLOTS and not rec.rrule:
+        return (rec.month, rec.day, rec.slot)
+    return None
+
+def _duration(delta):
+    minutes, seconds = divmod(int(delta.total_seconds()), 60)
+    hours, minutes = divmod(minutes, 60)
+    return "PT" + (f"{hours}H" if hours else "") + (f"{minutes}M" if minutes else "") + \
+        (f"{seconds}S" if seconds or not (hours or minutes) else "")
+
+def recurrence(group, tzid):
+    # (rrule, extra content lines) reproducing the start/end of every member
+    first = group[0]
+    length = first.end - first.start
+    same_length = all(rec.end - rec.start == length for rec in group)
+    weekly = all((rec.start - first.start) % dt.timedelta(weeks=1) == dt.timedelta() for rec in group)
+    if same_length and weekly:
+        starts = {rec.start for rec in group}
+        count = (group[-1].start - first.start) // dt.timedelta(weeks=1) + 1
+        gaps = [first.start + dt.timedelta(weeks=k) for k in range(count)]
+        gaps = [fmt_local(t) for t in gaps if t not in starts]
+        extra = [f"EXDATE;TZID={tzid}:{','.join(gaps)}"] if gaps else []
+        return f"FREQ=WEEKLY;COUNT={count}", extra
+    if same_length:
+        values = ",".join(fmt_local(rec.start) for rec in group[1:])
+        return None, [f"RDATE;TZID={tzid}:{values}"]
+    values = ",".join(f"{fmt_local(rec.start)}/{_duration(rec.end - rec.start)}" for rec in group[1:])
+    return None, [f"RDATE;VALUE=PERIOD;TZID={tzid}:{values}"]
+
+def iter_compact_ics(records, tzid=TZID, scope=None):
+    # Like ics_serializers.iter_ics(), but series are collected per month and
+    # emitted when the month ends, so only one month of records is held at once
+    yield from calendar_header(tzid)
+
+    def flush(groups):
+        for key, group in groups.items():
+            singles = [single(rec) for rec in group]
+            if len(group) > 1:
+                blocks = series(key, group)
+                if sum(map(len, blocks)) < sum(map(len, singles)):
+                    singles = blocks
+            yield from singles
+
+    def series(key, group):
+        # master VEVENT for the group plus RECURRENCE-ID overrides for sessions whose
+        # text differs from the first one's
+        first = group[0]
+        rrule, extra = recurrence(group, tzid)
+        uid = event_uid("series", *key, scope=scope)
+        blocks = [event_block(first.summary, first.description, first.start, first.end, tzid,
+                              uid=uid, rrule=rrule, extra=extra)]
+        for rec in group[1:]:
+            if rec.summary != first.summary or rec.description != first.description:
+                blocks.append(event_block(rec.summary, rec.description, rec.start, rec.end, tzid, uid=uid,
+                                          extra=[f"RECURRENCE-ID;TZID={tzid}:{fmt_local(rec.start)}"]))
+        return blocks
+
+    def single(rec):
+        uid = event_uid(*rec.identity, scope=scope) if scope else rec.uid
+        return event_block(rec.summary, rec.description, rec.start, rec.end, tzid, uid=uid, rrule=rec.rrule)
+
+    groups = {}
+    month = None
+    for rec in records:
+        key = series_key(rec)
+        if rec.month != month:
+            yield from flush(groups)
+            groups, month = {}, rec.month
+        if key is None:
+            yield single(rec)
+        else:
+            groups.setdefault(key, []).append(rec)
+    yield from flush(groups)
+
+    yield b"END:VCALENDAR"
+
+def write_compact_ics(records, out, tzid=TZID, flush=False, scope=None, **_):
+    return write_calendar(out, iter_compact_ics(records, tzid, scope), flush=flush)
+
+def render(components):
+    return b"".join(component + b"\r\n" for component in components)
+
+def instances(ics_bytes, tzid, horizon):
+    # Multiset of (start, end, summary, description) after expanding RRULE/RDATE/EXDATE
+    # and applying RECURRENCE-ID overrides with ics_import
+    from ics_import import iter_buffer_events
+    return collections.Counter((ev.start, ev.end, ev.summary, ev.description)
+                               for ev in iter_buffer_events(ics_bytes, tzid, horizon, descriptions=True))
+
+def compare(records, tzid=TZID, horizon=None):
+    # Renders both forms and returns a report dict; "identical" is True when
+    # the expanded instances match exactly, text included
+    records = list(records)
+    if horizon is None:
+        last = max(rec.end for rec in records)
+        horizon = dt.datetime.combine(last.date() + dt.timedelta(weeks=1), dt.time())
+    full = render(iter_ics(records, tzid))
+    compact = render(iter_compact_ics(records, tzid))
+    full_instances = instances(full, tzid, horizon)
+    compact_instances = instances(compact, tzid, horizon)
+    return {
+        "events": full.count(b"BEGIN:VEVENT"),
+        "compact_events": compact.count(b"BEGIN:VEVENT"),
+        "bytes": len(full),
+        "compact_bytes": len(compact),
+        "reduction": 1 - len(compact) / len(full),
+        "instances": sum(full_instances.values()),
+        "identical": full_instances == compact_instances,
+    }
+
+def main():
+    report = compare(iter_records(START_DATE, TOTAL_WEEKS))
+    print(f"VEVENTs: {report['events']} -> {report['compact_events']}")
+    print(f"Bytes:   {report['bytes']} -> {report['compact_bytes']} ({report['reduction']:.1%} smaller)")
+    print(f"Instances: {report['instances']} expanded, identical: {report['identical']}")
+    return 0 if report["identical"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+ics_import.py
+
+Fast reader for existing .ics exports, used to merge generated plans with real
+calendars (see ICS_generator.py --busy).
+
+The file is memory-mapped and scanned once. Folded lines are only unfolded for
+the few properties we keep (UID, SUMMARY, DTSTART, DTEND, DURATION, RRULE,
+RDATE, EXDATE, RECURRENCE-ID, STATUS, TRANSP); DESCRIPTION (unless asked for) and
+other bulky properties are skipped without being copied. Overridden instances
+(VEVENTs with a RECURRENCE-ID) replace the occurrence of their series they name. Times are converted to naive local wall time in the
+target TZID with the same zone rules vtimezone() writes. Events are loaded into
+an IntervalIndex so "what is busy between X and Y" is a bisect, not a scan.
+
+Usage:
+    python ics_import.py calendar.ics --between 2026-01-12T00:00 2026-01-19T00:00
+"""
+
+import argparse
+import datetime as dt
+import logging
+import mmap
+import re
+import time
+
+from ics_intervals import IntervalIndex
+from ics_schedule import TZID
+from ics_serializers import TIMEZONE_RULES, utc_offset, utc_to_local
+
+logger = logging.getLogger(__name__)
+
+WANTED = frozenset([b"UID", b"SUMMARY", b"DTSTART", b"DTEND", b"DURATION", b"RRULE", b"RDATE", b"EXDATE",
+                    b"RECURRENCE-ID", b"STATUS", b"TRANSP", b"BEGIN", b"END"])
+WANTED_WITH_DESCRIPTION = WANTED | {b"DESCRIPTION"}
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_DURATION_RE = re.compile(r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+_UNESCAPE_RE = re.compile(r"\\([\\;,nN])")
+# Recurring events are expanded at most this far past their start unless a horizon is given
+DEFAULT_HORIZON = dt.timedelta(days=2 * 366)
+
+
+class ImportedEvent:
+    __slots__ = ("uid", "summary", "start", "end", "all_day", "recurring", "description")
+
+    def __init__(self, uid, summary, start, end, all_day=False, recurring=False, description=None):
+        self.uid = uid
+        self.summary = summary
+        self.start = start
+        self.end = end
+        self.all_day = all_day
+        self.recurring = recurring
+        self.description = description  # only read with descriptions=True
+
+    def __repr__(self):
+        return f"ImportedEvent({self.summary!r}, {self.start:%Y-%m-%d %H:%M}-{self.end:%Y-%m-%d %H:%M})"
+
+
+def _content_line_re(names):
+    alternatives = b"|".join(sorted(names, key=len, reverse=True))
+    # A wanted property at the start of a line plus any folded continuation lines
+    return re.compile(rb"^(" + alternatives + rb")[;:][^\r\n]*(?:\r?\n[ \t][^\r\n]*)*",
+                      re.MULTILINE | re.IGNORECASE)
+
+_FOLD_RE = re.compile(rb"\r?\n[ \t]")
+_WANTED_RE = _content_line_re(WANTED)
+_WANTED_DESCRIPTION_RE = _content_line_re(WANTED_WITH_DESCRIPTION)
+
+def iter_content_lines(buf, wanted=WANTED):
+    # Yields (NAME, unfolded_line) for wanted properties. The regex scan runs over
+    # the mapped buffer in C, so unwanted properties (and their continuation lines)
+    # are skipped without being copied or unfolded.
+    if wanted is WANTED:
+        pattern = _WANTED_RE
+    elif wanted is WANTED_WITH_DESCRIPTION:
+        pattern = _WANTED_DESCRIPTION_RE
+    else:
+        pattern = _content_line_re(wanted)
+    for m in pattern.finditer(buf):
+        line = m.group(0)
+        if b"\n" in line:
+            line = _FOLD_RE.sub(b"", line)
+        yield m.group(1).upper(), line
+
+def split_property(line):
+    # b"DTSTART;TZID=America/Chicago:20260112T060000" -> ("DTSTART", {"TZID": ...}, "20260112T060000")
+    text = line.decode("utf-8", errors="replace")
+    if '"' not in text:
+        i = text.find(":")
+    else:
+        # The value starts at the first colon outside a quoted parameter value
+        in_quotes = False
+        for i, ch in enumerate(text):
+            if ch == '"':
+                in_quotes = not in_quotes
+            elif ch == ":" and not in_quotes:
+                break
+    if i == -1:
+        i = len(text)
+    head, value = text[:i], text[i + 1:]
+    name, *raw_params = head.split(";")
+    params = {}
+    for p in raw_params:
+        key, _, val = p.partition("=")
+        params[key.upper()] = val.strip('"')
+    return name.upper(), params, value
+
+def unescape_text(value):
+    return _UNESCAPE_RE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+def _basic_datetime(v):
+    # "YYYYMMDDTHHMMSS" without strptime, which dominates import time otherwise
+    return dt.datetime(int(v[0:4]), int(v[4:6]), int(v[6:8]), int(v[9:11]), int(v[11:13]), int(v[13:15]))
+
+def parse_datetime(value, params, tzid=TZID):
+    # Returns (naive local datetime in tzid, all_day)
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return dt.datetime(int(value[0:4]), int(value[4:6]), int(value[6:8])), True
+    if value.endswith("Z"):
+        return utc_to_local(_basic_datetime(value), tzid), False
+    local = _basic_datetime(value)
+    src = params.get("TZID")
+    if not src or src == tzid:
+        return local, False  # floating or already in the target zone
+    if src in TIMEZONE_RULES:
+        return utc_to_local(local - utc_offset(src, local), tzid), False
+    try:
+        from zoneinfo import ZoneInfo
+        aware = local.replace(tzinfo=ZoneInfo(src))
+        utc = aware.astimezone(dt.timezone.utc).replace(tzinfo=None)
+        return utc_to_local(utc, tzid), False
+    except Exception:  # unknown zone: treat as local wall time
+        logger.warning("Unknown TZID %r; treating %s as local time", src, value)
+        return local, False
+
+def parse_duration(value):
+    m = _DURATION_RE.match(value.strip())
+    if not m:
+        raise ValueError(f"bad DURATION: {value!r}")
+    sign, weeks, days, hours, minutes, seconds = m.groups()
+    delta = dt.timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                         minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -delta if sign == "-" else delta
+
+def parse_rrule(value):
+    return dict(part.split("=", 1) for part in value.split(";") if "=" in part)
+
+def expand_rrule(start, rule, until=None, exdates=(), tzid=TZID):
+    # Occurrence starts for DAILY/WEEKLY rules (INTERVAL, COUNT, UNTIL, BYDAY),
+    # before `until`. Other frequencies yield only the first occurrence.
+    freq = rule.get("FREQ")
+    interval = int(rule.get("INTERVAL", 1))
+    count = int(rule["COUNT"]) if "COUNT" in rule else None
+    if "UNTIL" in rule:
+        limit, all_day = parse_datetime(rule["UNTIL"], {}, tzid)
+        # UNTIL is inclusive
+        limit += dt.timedelta(days=1) if all_day else dt.timedelta(seconds=1)
+        until = limit if until is None else min(until, limit)
+    if until is None and count is None:
+        raise ValueError("unbounded RRULE needs an explicit `until`")
+    exdates = set(exdates)
+    if freq not in ("DAILY", "WEEKLY"):
+        logger.warning("RRULE FREQ=%s not expanded; using the first occurrence only", freq)
+        if start not in exdates:
+            yield start
+        return
+    if freq == "DAILY":
+        days = [0]
+        step = dt.timedelta(days=interval)
+        period_start = start
+    else:
+        byday = rule.get("BYDAY")
+        days = sorted(WEEKDAYS[d[-2:]] for d in byday.split(",")) if byday else [start.weekday()]
+        step = dt.timedelta(weeks=interval)
+        period_start = start - dt.timedelta(days=start.weekday())
+    emitted = 0
+    while until is None or period_start < until:
+        for wd in days:
+            occ = period_start + dt.timedelta(days=wd) if freq == "WEEKLY" else period_start
+            if occ < start:
+                continue
+            if until is not None and occ >= until:
+                return
+            if count is not None and emitted >= count:
+                return
+            emitted += 1
+            if occ not in exdates:
+                yield occ
+        period_start += step
+
+def iter_events(path, tzid=TZID, horizon=None, descriptions=False):
+    # Streams busy ImportedEvents (cancelled and transparent events are skipped),
+    # expanding recurring events up to `horizon` (default: two years after their start).
+    # Recurring events come last: their overrides may appear anywhere in the file.
+    with open(path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return
+        try:
+            yield from iter_buffer_events(buf, tzid, horizon, descriptions)
+        finally:
+            buf.close()
+
+def iter_buffer_events(buf, tzid=TZID, horizon=None, descriptions=False):
+    # Same as iter_events() for an in-memory bytes object or an open mmap
+    depth = 0
+    props = None
+    series = []  # props of recurring events, expanded once every override is known
+    overridden = set()  # (uid, original start) replaced by a RECURRENCE-ID event
+    wanted = WANTED_WITH_DESCRIPTION if descriptions else WANTED
+    for name, line in iter_content_lines(buf, wanted):
+        if name == b"BEGIN":
+            if line[6:].strip().upper() == b"VEVENT":
+                props, depth = {}, 1
+            elif props is not None:
+                depth += 1  # VALARM etc. nested inside the event
+            continue
+        if name == b"END":
+            if props is not None:
+                depth -= 1
+                if depth == 0:
+                    if "RECURRENCE-ID" in props:
+                        # cancelled overrides remove their occurrence too
+                        original = parse_datetime(*props["RECURRENCE-ID"], tzid=tzid)[0]
+                        overridden.add((props.get("UID", ("",))[0], original))
+                    if "RRULE" in props or "RDATE" in props:
+                        series.append(props)
+                    else:
+                        yield from _events_from(props, tzid, horizon)
+                    props = None
+            continue
+        if props is not None and depth == 1:
+            pname, params, value = split_property(line)
+            if pname in ("EXDATE", "RDATE"):
+                props.setdefault(pname, []).extend((v, params) for v in value.split(","))
+            else:
+                props[pname] = (value, params)
+    for props in series:
+        yield from _events_from(props, tzid, horizon, overridden)
+
+def _rdate_period(value, params, length, tzid):
+    # RDATE value -> (start, end); PERIOD values carry their own end or duration
+    if "/" not in value:
+        start = parse_datetime(value, params, tzid)[0]
+        return start, start + length
+    first, second = value.split("/", 1)
+    start = parse_datetime(first, params, tzid)[0]
+    if second.lstrip("+-").startswith("P"):
+        return start, start + parse_duration(second)
+    return start, parse_datetime(second, params, tzid)[0]
+
+def _events_from(props, tzid, horizon, overridden=()):
+    if "DTSTART" not in props:
+        return
+    if props.get("STATUS", ("",))[0].upper() == "CANCELLED":
+        return
+    if props.get("TRANSP", ("",))[0].upper() == "TRANSPARENT":
+        return
+    start, all_day = parse_datetime(*props["DTSTART"], tzid=tzid)
+    if "DTEND" in props:
+        end, _ = parse_datetime(*props["DTEND"], tzid=tzid)
+    elif "DURATION" in props:
+        end = start + parse_duration(props["DURATION"][0])
+    else:
+        end = start + (dt.timedelta(days=1) if all_day else dt.timedelta())
+    length = end - start
+    uid = props.get("UID", ("",))[0]
+    summary = unescape_text(props.get("SUMMARY", ("",))[0])
+    description = unescape_text(props["DESCRIPTION"][0]) if "DESCRIPTION" in props else None
+    if "RRULE" not in props and "RDATE" not in props:
+        yield ImportedEvent(uid, summary, start, end, all_day, description=description)
+        return
+    exdates = {parse_datetime(v, p, tzid=tzid)[0] for v, p in props.get("EXDATE", ())}
+    if "RRULE" in props:
+        until = horizon or start + DEFAULT_HORIZON
+        rule = parse_rrule(props["RRULE"][0])
+        occurrences = [(occ, occ + length) for occ in expand_rrule(start, rule, until, exdates, tzid)]
+    elif start not in exdates:
+        occurrences = [(start, end)]  # DTSTART is always the first instance
+    else:
+        occurrences = []
+    for value, params in props.get("RDATE", ()):
+        occ_start, occ_end = _rdate_period(value, params, length, tzid)
+        if occ_start not in exdates:
+            occurrences.append((occ_start, occ_end))
+    for occ_start, occ_end in occurrences:
+        if (uid, occ_start) not in overridden:
+            yield ImportedEvent(uid, summary, occ_start, occ_end, all_day, recurring=True, description=description)
+
+def load_calendar(path, tzid=TZID, horizon=None):
+    # IntervalIndex of busy ImportedEvents keyed by (start, end)
+    return IntervalIndex((ev.start, ev.end, ev) for ev in iter_events(path, tzid, horizon))
+
+def busy_intervals(paths, tzid=TZID, horizon=None):
+    # (start, end) pairs from every export, in the form iter_records(busy=...) takes
+    return [(ev.start, ev.end) for path in paths for ev in iter_events(path, tzid, horizon)]
+
+def busy_between(index, start, end):
+    return [item for _, _, item in index.overlapping(start, end)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index an .ics file and list busy time.")
+    parser.add_argument("path")
+    parser.add_argument("--tzid", default=TZID)
+    parser.add_argument("--between", nargs=2, metavar=("START", "END"),
+                        help="ISO local datetimes, e.g. 2026-01-12T00:00 2026-01-19T00:00")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    index = load_calendar(args.path, args.tzid)
+    t1 = time.perf_counter()
+    print(f"Indexed {len(index)} busy intervals in {t1 - t0:.3f}s")
+    if args.between:
+        start, end = (dt.datetime.fromisoformat(v) for v in args.between)
+        hits = busy_between(index, start, end)
+        t2 = time.perf_counter()
+        for ev in hits:
+            print(f"{ev.start:%Y-%m-%d %H:%M} – {ev.end:%Y-%m-%d %H:%M}  {ev.summary}")
+        print(f"{len(hits)} busy intervals between {start} and {end} ({(t2 - t1) * 1e6:.0f}µs)")
+
+if __name__ == "__main__":
+    main()
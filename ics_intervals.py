@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+ics_intervals.py
+
+Sorted-interval index used by the session scheduler (ics_schedule.py) and
+for busy-time lookups. Intervals are half-open [start, end) and can be any
+mutually comparable values (datetimes, minutes, ...).
+
+Entries are kept sorted by start together with a running maximum of the end
+values, so an overlap query is a bisect plus a short backwards scan that stops
+as soon as no earlier interval can reach the query window: O(log n + k) for the
+k overlapping intervals in the usual case of non-nested calendars.
+"""
+
+import bisect
+
+
+class IntervalIndex:
+    __slots__ = ("_starts", "_ends", "_max_end", "_items")
+
+    def __init__(self, intervals=()):
+        # intervals: iterable of (start, end) or (start, end, item); bulk-built with one sort
+        rows = sorted(
+            ((iv[0], iv[1], iv[2] if len(iv) > 2 else None) for iv in intervals),
+            key=lambda row: (row[0], row[1]),
+        )
+        self._starts = [row[0] for row in rows]
+        self._ends = [row[1] for row in rows]
+        self._items = [row[2] for row in rows]
+        self._max_end = []
+        self._rebuild_max(0)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __iter__(self):
+        return zip(self._starts, self._ends, self._items)
+
+    def _rebuild_max(self, pos):
+        # Running maximum of end values from pos onwards; inserts are usually near
+        # the tail (schedules are generated in time order) so this stays cheap.
+        del self._max_end[pos:]
+        running = self._max_end[pos - 1] if pos else None
+        for end in self._ends[pos:]:
+            running = end if running is None or end > running else running
+            self._max_end.append(running)
+
+    def add(self, start, end, item=None):
+        if end < start:
+            raise ValueError(f"interval ends before it starts: {start!r} > {end!r}")
+        pos = bisect.bisect_right(self._starts, start)
+        self._starts.insert(pos, start)
+        self._ends.insert(pos, end)
+        self._items.insert(pos, item)
+        self._max_end.insert(pos, None)
+        self._rebuild_max(pos)
+
+    def overlapping(self, start, end):
+        # All (start, end, item) intersecting [start, end), in start order
+        hits = []
+        i = bisect.bisect_left(self._starts, end) - 1
+        while i >= 0 and self._max_end[i] > start:
+            if self._ends[i] > start:
+                hits.append((self._starts[i], self._ends[i], self._items[i]))
+            i -= 1
+        hits.reverse()
+        return hits
+
+    def is_free(self, start, end):
+        i = bisect.bisect_left(self._starts, end) - 1
+        while i >= 0 and self._max_end[i] > start:
+            if self._ends[i] > start:
+                return False
+            i -= 1
+        return True
+
+    def find_slot(self, preferred, duration, earliest, latest, step):
+        # Free start nearest to `preferred` within [earliest, latest], trying
+        # preferred, +step, -step, +2*step, ... ; None when the window is full.
+        if latest < earliest:
+            return None
+        preferred = min(max(preferred, earliest), latest)
+        if self.is_free(preferred, preferred + duration):
+            return preferred
+        k = 1
+        while True:
+            later = preferred + k * step
+            earlier = preferred - k * step
+            if later > latest and earlier < earliest:
+                # Window edges may be off the step grid
+                for edge in (latest, earliest):
+                    if self.is_free(edge, edge + duration):
+                        return edge
+                return None
+            if later <= latest and self.is_free(later, later + duration):
+                return later
+            if earlier >= earliest and self.is_free(earlier, earlier + duration):
+                return earlier
+            k += 1
@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+ics_schedule.py
+
+Schedule engine shared by ICS_generator.py and the tools/ calendar scripts.
+The plan is compiled once into a list of compact EventRecord objects; the
+serializers in ics_serializers.py only render records and never re-run the
+scheduling logic. Compiled schedules can be cached on disk between runs.
+"""
+
+import datetime as dt
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import uuid
+
+from ics_intervals import IntervalIndex
+
+logger = logging.getLogger(__name__)
+
+TZID = "America/Chicago"
+START_DATE = dt.date(2026, 1, 12)  # Second week of January 2026, Monday
+TOTAL_WEEKS = 12 * 4  # 48
+UID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, "ai-engineering-plan")
+# Bump when the scheduling logic changes so stale cache files are ignored
+SCHEMA_VERSION = 3
+
+# Durations rotate; milestone sessions may exceed 35 minutes
+DURATION_ROTATION = [15, 20, 25, 30, 35]
+
+DAY_THEMES = {
+    0: ("Theory", "Mon"),
+    1: ("Build", "Tue"),
+    2: ("Evaluate", "Wed"),
+    3: ("Optimize", "Thu"),
+    4: ("Demo", "Fri"),
+}
+
+PLAN = [
+    ("Month 01 — Math and Python Foundations", [
+        "Week 1: Linear algebra — vectors, matrices, norms, dot products, eigenvalues, condition number, numerical stability.",
+        "Week 2: Calculus — derivatives, gradients, chain rule, Jacobian, Hessian; simple optimization and gradient-based learning.",
+        "Week 3: Probability & statistics — distributions, expectation, variance, Bayes’ theorem, concentration bounds, bootstrap.",
+        "Week 4: Python engineering — venv, packaging, NumPy idioms, profiling, unit tests, reproducible experiments, benchmarking.",
+        "Deliverables focus: matrix utils, gradient solver, Monte Carlo notebook, numeric stability report, tests.",
+        "Mid-month checkpoint checklist: matrix utils API validated; gradient descent converges on toy loss; Monte Carlo notebook stable; numeric stability examples logged.",
+        "End-of-month demo checklist: tests green; publish 2–3 page stability report; README usage/examples; screencast of experiments."
+    ]),
+    ("Month 02 — Software Engineering Essentials", [
+        "Week 1: Linux CLI, shell scripting, env isolation (venv, direnv), process management.",
+        "Week 2: Git advanced workflows, branching, commit hygiene, PRs and reviews, PR templates.",
+        "Week 3: REST design, OpenAPI, validation, small FastAPI/Flask service.",
+        "Week 4: Docker basics, container best practices, reproducible images, logging/monitoring endpoints.",
+        "Deliverables focus: containerized API, CI pipeline, logging/health endpoints, deployment README.",
+        "Mid-month checkpoint checklist: branch strategy documented; PR template applied; CI passing baseline tests; minimal FastAPI with OpenAPI.",
+        "End-of-month demo checklist: reproducible Docker image; health/metrics endpoints; CI on PR; verified deployment steps."
+    ]),
+    ("Month 03 — Algorithms and Systems", [
+        "Week 1: Data structures & complexity — arrays, lists, trees, heaps, hashes, amortized analysis.",
+        "Week 2: Graphs — shortest paths, BFS/DFS/A*/Dijkstra; data flow applications.",
+        "Week 3: Memory layout, caching, floating-point formats, precision mitigation.",
+        "Week 4: Concurrency basics, thread safety, async patterns, time & memory profiling.",
+        "Deliverables focus: algorithm implementations + benchmarks, performance report, optimized component.",
+        "Mid-month checkpoint checklist: DS correctness; graph benchmarks; preliminary profiling notes.",
+        "End-of-month demo checklist: performance report with charts; optimized component vs baseline; reproducible benchmark suite."
+    ]),
+    ("Month 04 — Machine Learning Fundamentals", [
+        "Week 1: Linear/logistic regression, losses, gradient descent, optimization basics.",
+        "Week 2: Trees, ensembles (RF, GBM), k-means, bias–variance.",
+        "Week 3: Metrics (accuracy, precision/recall, ROC/AUC, RMSE), CV, HPO, model selection.",
+        "Week 4: Feature engineering, pipelines, interpretability, simple fairness checks.",
+        "Deliverables focus: multi-model pipeline, CV experiments, evaluation report.",
+        "Mid-month checkpoint checklist: baseline models trained; CV strategy chosen; metric calculations validated.",
+        "End-of-month demo checklist: end-to-end pipeline; comparison plots/table; failure mode analysis."
+    ]),
+    ("Month 05 — Deep Learning Foundations", [
+        "Week 1: MLPs, activations, init, optimizers (SGD, Adam).",
+        "Week 2: CNNs; vision or simple sequence tasks.",
+        "Week 3: RNNs, LSTM/GRU, sequence modeling, teacher forcing, truncated BPTT.",
+        "Week 4: Intro to transformers, attention, small encoder/decoder blocks.",
+        "Deliverables focus: MLP, simple CNN/RNN, toy transformer, training notebooks.",
+        "Mid-month checkpoint checklist: gradient checks pass; CNN/RNN curves stable; overfit small batch as sanity check.",
+        "End-of-month demo checklist: ablation notebook; toy transformer trains; clear docstrings/README."
+    ]),
+    ("Month 06 — Foundation Models and Model Selection", [
+        "Week 1: Transformer internals — MHA, residuals, layer norm; implementation exercises.",
+        "Week 2: Tokenization — BPE, WordPiece, SentencePiece; preprocessing pipelines.",
+        "Week 3: Scaling laws (e.g., Chinchilla), compute vs data, efficient training heuristics.",
+        "Week 4: Model comparison — open-weight vs API, licensing, cost/performance tradeoffs.",
+        "Deliverables focus: tokenizers, small scaling experiments, model-selection matrix.",
+        "Mid-month checkpoint checklist: tokenizer built & tested; small transformer experiment runs; data/compute estimates captured.",
+        "End-of-month demo checklist: selection matrix (licensing/cost); scaling plots; recommendation with tradeoffs."
+    ]),
+    ("Month 07 — Evaluation and Testing", [
+        "Week 1: Metrics — BLEU, ROUGE, perplexity, embedding similarity.",
+        "Week 2: Automated testing pipelines and functional correctness scenarios.",
+        "Week 3: Hallucination rates, toxicity scoring, bias metrics with detectors.",
+        "Week 4: Human eval workflows, annotation guidelines, inter-annotator agreement.",
+        "Deliverables focus: evaluation harness, annotation templates + guide, bias/hallucination analysis.",
+        "Mid-month checkpoint checklist: metrics computed on sample set; automated checks wired; detector baselines established.",
+        "End-of-month demo checklist: annotation guide; IAA stats; mitigation proposals summarized."
+    ]),
+    ("Month 08 — Retrieval‑Augmented Generation (RAG)", [
+        "Week 1: Ingestion, chunking strategies, metadata management.",
+        "Week 2: Embeddings and vector store (FAISS/Qdrant/etc.).",
+        "Week 3: Dense/sparse/hybrid retrieval; reranking experiments.",
+        "Week 4: Integrate retrieval with generation; optimize latency and relevance.",
+        "Deliverables focus: RAG demo, strategy comparison notebook.",
+        "Mid-month checkpoint checklist: corpus ingested + chunked; embeddings populated; initial retrieval works.",
+        "End-of-month demo checklist: grounded answers; latency/relevance plots; best strategy documented."
+    ]),
+    ("Month 09 — Finetuning Techniques", [
+        "Week 1: PEFT — LoRA, adapters, related techniques.",
+        "Week 2: Knowledge distillation — teacher/student.",
+        "Week 3: Model merging, adapter stacking, multi-task finetuning.",
+        "Week 4: Compare PEFT vs full finetune: compute, memory, accuracy.",
+        "Deliverables focus: PEFT experiments, distilled student, resource-performance report.",
+        "Mid-month checkpoint checklist: LoRA/adapters configured; student pipeline ready; metrics defined.",
+        "End-of-month demo checklist: PEFT vs full charts; student performance; resource analysis."
+    ]),
+    ("Month 10 — Prompt Engineering and Agent Systems", [
+        "Week 1: Prompt structuring, few-shot, chain-of-thought, templates.",
+        "Week 2: Robustness testing, defensive prompts, prompt injection simulations.",
+        "Week 3: Agent architecture — tools, planning, memory via vector stores.",
+        "Week 4: Safety guardrails, sandboxing, access control best practices.",
+        "Deliverables focus: prompt library + metrics, multi-tool agent, safety evaluations.",
+        "Mid-month checkpoint checklist: prompt variants compared; robustness failures captured; tool list scoped.",
+        "End-of-month demo checklist: agent prototype with memory; safety report; prompt metrics dashboard."
+    ]),
+    ("Month 11 — Inference Optimization and Feedback", [
+        "Week 1: Compression — quantization, pruning, light distillation.",
+        "Week 2: Batching, parallel inference, GPU/TPU/CPU considerations.",
+        "Week 3: Feedback systems — explicit/implicit, annotation, flywheel.",
+        "Week 4: Monitoring, caching, feedback-driven retraining triggers.",
+        "Deliverables focus: optimized inference pipeline (TTFT/TPOT), feedback prototype.",
+        "Mid-month checkpoint checklist: quantization/pruning applied; throughput baseline measured; batching configured.",
+        "End-of-month demo checklist: TTFT/TPOT improvements; quality preserved; feedback loop prototype demo."
+    ]),
+    ("Month 12 — Application Architecture, Security, Privacy & Ethics", [
+        "Week 1: App architecture — routing, gateways, context construction, caching.",
+        "Week 2: Security — prompt injection mitigation, adversarial inputs, tool sandboxing.",
+        "Week 3: Privacy — PII detection/redaction, differential privacy basics, compliance.",
+        "Week 4: Ethics & governance — audit trails, explainability, bias mitigation, GDPR/copyright.",
+        "Deliverables focus: secure privacy-aware demo, PII pipeline, threat model, ethics assessment.",
+        "Mid-month checkpoint checklist: routing/guardrails implemented; threat scenarios drafted; PII detection working.",
+        "End-of-month demo checklist: privacy-aware demo; redaction pipeline; threat model + ethics impact assessment."
+    ]),
+]
+
+MICRO_PROMPTS = {
+    "Theory": "Map key concepts; derive one equation; write 3 insight bullets; note one open question.",
+    "Build": "Implement one minimal slice; write a failing test first; commit with a clear message; push branch.",
+    "Evaluate": "Pick 2 metrics; run a small eval set; log 3 failure cases; file one issue to fix.",
+    "Optimize": "Profile one hotspot; apply one tweak; compare before/after; document the result concisely.",
+    "Demo": "Record a 60–90s clip; draft a 5-sentence summary; publish README snippet; share link.",
+}
+SLOT_EXTRAS = {
+    "am1": "AM1 focus: intent-setting, define 1–2 high-impact tasks.",
+    "am2": "AM2 focus: hands-on progress; capture notes; push commits.",
+    "pm": "PM focus: consolidate, document, mini-demo, update README.",
+}
+
+SLOT_LABELS = {
+    "am1": "AM Session 1",
+    "am2": "AM Session 2",
+    "pm": "PM Consolidation",
+}
+
+REFLECT_RRULE = "FREQ=WEEKLY;BYDAY=SU"
+
+# Allowed windows: AM sessions start 06:00–12:00, evening sessions end 18:00–21:00
+AM_WINDOW = (dt.time(6, 0), dt.time(12, 0))
+PM_END_WINDOW = (dt.time(18, 0), dt.time(21, 0))
+AM_SLOTS = ("am1", "am2")
+AM_GAP = dt.timedelta(minutes=45)  # AM2 starts at least this long after AM1
+PLACEMENT_STEP = dt.timedelta(minutes=15)
+# Placement order within a week: fixed milestones claim their time first
+SLOT_PRIORITY = {"demo": 0, "sprint": 1, "checkpoint": 2, "pm": 3, "am1": 4, "am2": 5}
+
+
+class EventRecord:
+    """One scheduled session. Times are naive local datetimes in the schedule's TZID.
+
+    description is a tuple of interned lines; records of the same month and theme
+    share the line objects, and serializers cache their escaped form per line.
+    """
+
+    __slots__ = ("month", "week", "day", "slot", "start", "end", "summary", "description", "rrule")
+
+    def __init__(self, month, week, day, slot, start, end, summary, description, rrule=None):
+        self.month = month
+        self.week = week
+        self.day = day
+        self.slot = slot
+        self.start = start
+        self.end = end
+        self.summary = summary
+        self.description = description
+        self.rrule = rrule
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f"EventRecord({self.identity!r}, {self.start:%Y-%m-%d %H:%M}-{self.end:%H:%M})"
+
+    @property
+    def identity(self):
+        if self.slot == "reflect":
+            return ("reflect",)
+        return (self.month, self.week, self.day, self.slot)
+
+    @property
+    def uid(self):
+        return event_uid(*self.identity)
+
+    @property
+    def description_text(self):
+        return "\n".join(self.description)
+
+    def content_hash(self):
+        return content_hash(self.summary, self.description_text, self.start, self.end, self.rrule)
+
+    def as_dict(self, scope=None):
+        return {
+            "uid": event_uid(*self.identity, scope=scope) if scope else self.uid,
+            "month": self.month,
+            "week": self.week,
+            "day": self.day,
+            "slot": self.slot,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "summary": self.summary,
+            "description": self.description_text,
+            "rrule": self.rrule,
+        }
+
+
+class Schedule:
+    """Compiled plan: the records plus the settings they were computed with."""
+
+    __slots__ = ("tzid", "start_date", "total_weeks", "records")
+
+    def __init__(self, tzid, start_date, total_weeks, records):
+        self.tzid = tzid
+        self.start_date = start_date
+        self.total_weeks = total_weeks
+        self.records = records
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+
+def fmt_local(dt_obj):
+    return dt_obj.strftime("%Y%m%dT%H%M%S")
+
+def event_uid(*identity, scope=None):
+    # Stable across runs: derived from (month, week, day, slot), not from content or time.
+    # scope (e.g. a cohort name) keeps UIDs of parallel calendars from colliding.
+    key = "/".join(str(part) for part in identity)
+    if scope:
+        key = f"{scope}:{key}"
+    return f"{uuid.uuid5(UID_NAMESPACE, key)}@ai-engineering-plan"
+
+def content_hash(summary, description, start_dt, end_dt, rrule=None):
+    h = hashlib.sha1()
+    for part in (summary, description, fmt_local(start_dt), fmt_local(end_dt), rrule or ""):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+def vary_am_start(week_idx, day_idx, slot_idx):
+    # AM sessions start between 06:00–12:00
+    base_hour = 6 + ((week_idx + day_idx + slot_idx) % 6)  # 6..11
+    minute = [0, 15, 30, 45][(week_idx + 2*day_idx + slot_idx) % 4]
+    return base_hour, minute
+
+def vary_pm_end(week_idx, day_idx):
+    # PM sessions end between 18:00–21:00
+    hour = 18 + ((week_idx + day_idx) % 4)  # 18..21
+    minute = [0, 15, 30, 45][(week_idx + day_idx) % 4]
+    return hour, minute
+
+def pick_duration(week_idx, day_idx, session_idx):
+    return DURATION_ROTATION[(week_idx + day_idx + session_idx) % len(DURATION_ROTATION)]
+
+def fragments(*lines):
+    # Interned so identical lines across records are one object (and one cache entry downstream)
+    return tuple(sys.intern(line) for line in lines)
+
+@functools.lru_cache(maxsize=None)
+def theme_fragments(theme_label):
+    micro = MICRO_PROMPTS.get(theme_label, "")
+    return fragments(f"Theme: {theme_label}"), fragments("", f"Micro-prompt: {micro}", "")
+
+@functools.lru_cache(maxsize=None)
+def month_fragments(month_deliverables, mid_checkpoint, end_demo):
+    return fragments(
+        f"Month deliverables emphasis: {month_deliverables}",
+        f"Mid-month checkpoint: {mid_checkpoint}",
+        f"End-of-month demo: {end_demo}",
+    )
+
+FOOTER_FRAGMENTS = fragments(
+    "",
+    "Workflow: dedicated Git branch; keep CI green; daily notes; weekly demo; journal 300–800 words on Sunday.",
+    "Reminder: 30-minute notification before session."
+)
+
+def build_description(theme_label, week_text, month_deliverables, mid_checkpoint, end_demo, checklist_extra=None):
+    # Returns description lines; month- and theme-level lines are computed once and reused
+    head, micro = theme_fragments(theme_label)
+    lines = head + fragments(week_text) + micro + month_fragments(month_deliverables, mid_checkpoint, end_demo)
+    if checklist_extra:
+        lines += fragments("", checklist_extra)
+    return lines + FOOTER_FRAGMENTS
+
+def session_window(rec, duration, am1_starts):
+    # (earliest, latest) start allowed for a record
+    day = rec.start.date()
+    if rec.slot in AM_SLOTS:
+        earliest = dt.datetime.combine(day, AM_WINDOW[0])
+        latest = dt.datetime.combine(day, AM_WINDOW[1])
+        if rec.slot == "am1":
+            latest -= AM_GAP  # leave room for AM2 before noon
+        elif day in am1_starts:
+            earliest = max(earliest, am1_starts[day] + AM_GAP)
+        return earliest, latest
+    return (dt.datetime.combine(day, PM_END_WINDOW[0]) - duration,
+            dt.datetime.combine(day, PM_END_WINDOW[1]) - duration)
+
+def place_sessions(records, index, step=PLACEMENT_STEP):
+    # Moves each record to the free start nearest its generated time, inside its
+    # window, avoiding everything already in `index` (busy blocks and earlier
+    # placements). Records are updated in place and added to the index.
+    am1_starts = {}
+    for rec in sorted(records, key=lambda r: SLOT_PRIORITY[r.slot]):
+        duration = rec.end - rec.start
+        earliest, latest = session_window(rec, duration, am1_starts)
+        start = index.find_slot(rec.start, duration, earliest, latest, step)
+        if start is None:
+            logger.warning("No free slot for %r; keeping %s", rec, rec.start)
+        else:
+            rec.start, rec.end = start, start + duration
+        index.add(rec.start, rec.end, rec)
+        if rec.slot == "am1":
+            am1_starts[rec.start.date()] = rec.start
+
+def iter_records(start_date=START_DATE, total_weeks=TOTAL_WEEKS, plan=PLAN, busy=None, months=None):
+    # Yields records in calendar order one week at a time, so streaming writers
+    # never need the whole plan in memory. busy: (start, end) pairs or an
+    # IntervalIndex of naive local times that sessions must avoid. months: the
+    # enabled month numbers (1-based); skipped months take no calendar time.
+    busy_index = IntervalIndex(busy or ())
+    week_start = start_date
+    week_idx = 0
+
+    for month_idx, (month_title, weeks) in enumerate(plan, start=1):
+        if months is not None and month_idx not in months:
+            continue
+        for w in range(4):
+            week_records = []
+            for day_offset in range(5):  # Mon..Fri
+                day_date = week_start + dt.timedelta(days=day_offset)
+                theme, theme_day = DAY_THEMES[day_offset]
+                week_text = weeks[w]
+                month_deliverables = weeks[4]
+                mid_checkpoint = weeks[5]
+                end_demo = weeks[6]
+
+                def session(slot, start, end):
+                    summary = f"{month_title} — Week {w+1} — {theme_day} {theme} — {SLOT_LABELS[slot]}"
+                    desc = build_description(theme, week_text, month_deliverables, mid_checkpoint, end_demo,
+                                             checklist_extra=SLOT_EXTRAS[slot])
+                    return EventRecord(month_idx, w + 1, day_offset, slot, start, end, summary, desc)
+
+                # AM Session 1
+                am1_h, am1_m = vary_am_start(week_idx, day_offset, 0)
+                am1_duration = pick_duration(week_idx, day_offset, 0)
+                am1_start = dt.datetime.combine(day_date, dt.time(am1_h, am1_m))
+                am1_end = am1_start + dt.timedelta(minutes=am1_duration)
+                week_records.append(session("am1", am1_start, am1_end))
+
+                # AM Session 2
+                am2_h, am2_m = vary_am_start(week_idx, day_offset, 1)
+                am2_start = dt.datetime.combine(day_date, dt.time(am2_h, am2_m))
+                min_gap = am1_start + dt.timedelta(minutes=45)
+                if am2_start < min_gap:
+                    am2_start = min_gap
+                am2_duration = pick_duration(week_idx, day_offset, 1)
+                am2_end = am2_start + dt.timedelta(minutes=am2_duration)
+                week_records.append(session("am2", am2_start, am2_end))
+
+                # PM Consolidation (ends 18:00–21:00)
+                pm_end_h, pm_end_m = vary_pm_end(week_idx, day_offset)
+                pm_end = dt.datetime.combine(day_date, dt.time(pm_end_h, pm_end_m))
+                pm_duration = pick_duration(week_idx, day_offset, 2)
+                # Allow milestone longer on Week 2 Wed and Week 4 Fri (+15)
+                if (w == 1 and day_offset == 2) or (w == 3 and day_offset == 4):
+                    pm_duration += 15
+                pm_start = pm_end - dt.timedelta(minutes=pm_duration)
+                week_records.append(session("pm", pm_start, pm_end))
+
+            # Week 2 Mid-month checkpoint (Wednesday)
+            if w == 1:
+                checkpoint_day = week_start + dt.timedelta(days=2)  # Wed
+                cp_end = dt.datetime.combine(checkpoint_day, dt.time(19, 35))
+                cp_start = cp_end - dt.timedelta(minutes=50)
+                cp_summary = f"{month_title} — Week 2 — Mid-month checkpoint (deep review)"
+                cp_desc = fragments(
+                    "Checkpoint focus: align outputs to deliverables; resolve blockers; plan remaining tasks.",
+                    weeks[5],
+                    "Artifacts: issues triage, updated roadmap, status notes, brief screen capture.",
+                    "Reminder: 30-minute notification before session."
+                )
+                week_records.append(EventRecord(month_idx, 2, 2, "checkpoint", cp_start, cp_end, cp_summary, cp_desc))
+
+            # Week 4 Deliverables sprint + End-of-month demo (Friday)
+            if w == 3:
+                sprint_day = week_start + dt.timedelta(days=4)  # Fri
+                sp_end = dt.datetime.combine(sprint_day, dt.time(20, 45))
+                sp_start = sp_end - dt.timedelta(minutes=55)
+                sp_summary = f"{month_title} — Week 4 — Deliverables sprint (portfolio polish)"
+                sp_desc = fragments(
+                    "Sprint checklist: finalize tests, polish docs, record demo, update portfolio and website.",
+                    weeks[4],
+                    "Targets: tests green; README & docs complete; demo published; portfolio entry created.",
+                    "Reminder: 30-minute notification before session."
+                )
+                week_records.append(EventRecord(month_idx, 4, 4, "sprint", sp_start, sp_end, sp_summary, sp_desc))
+
+                demo_end = dt.datetime.combine(sprint_day, dt.time(21, 0))
+                demo_start = demo_end - dt.timedelta(minutes=40)
+                demo_summary = f"{month_title} — Week 4 — End-of-month demo (public)"
+                demo_desc = fragments(
+                    "Public demo: present outcomes, key metrics, and lessons learned.",
+                    weeks[6],
+                    "Publish to: Google Docs summary, GitHub releases/tags, www.ronaldjwashington.com.",
+                    "Reminder: 30-minute notification before session."
+                )
+                week_records.append(EventRecord(month_idx, 4, 4, "demo", demo_start, demo_end, demo_summary, demo_desc))
+
+            # Sessions only collide within a week, so each week gets a small index
+            # seeded with the busy blocks that fall inside it
+            week_begin = dt.datetime.combine(week_start, dt.time())
+            week_index = IntervalIndex(busy_index.overlapping(week_begin, week_begin + dt.timedelta(days=7)))
+            place_sessions(week_records, week_index)
+            yield from week_records
+
+            week_start += dt.timedelta(days=7)
+            week_idx += 1
+            if week_idx >= total_weeks:
+                break
+        if week_idx >= total_weeks:
+            break
+
+    # Recurring Sunday Reflect & Showcase
+    first_sunday = start_date + dt.timedelta(days=(6 - start_date.weekday()) % 7)
+    reflect_start = dt.datetime.combine(first_sunday, dt.time(19, 0))
+    reflect_end = reflect_start + dt.timedelta(minutes=30)
+    reflect_summary = "Reflect & showcase — Weekly journal and portfolio update"
+    reflect_desc = fragments(
+        "Write 300–800 word journal in Google Docs.",
+        "Update GitHub repos and project showcase.",
+        "Push demos to www.ronaldjwashington.com.",
+        "Reminder: 30-minute notification before session."
+    )
+    yield EventRecord(0, 0, 6, "reflect", reflect_start, reflect_end, reflect_summary, reflect_desc,
+                      rrule=REFLECT_RRULE)
+
+def schedule_key(tzid=TZID, start_date=START_DATE, total_weeks=TOTAL_WEEKS, plan=PLAN, busy=(), months=None):
+    # Changes whenever anything that feeds the schedule changes (PLAN text and busy blocks included)
+    h = hashlib.sha1()
+    enabled = sorted(months) if months is not None else None
+    h.update(repr((SCHEMA_VERSION, tzid, start_date.isoformat(), total_weeks, plan, enabled)).encode("utf-8"))
+    for iv in busy:
+        h.update(f"{iv[0]}/{iv[1]};".encode("ascii"))
+    return h.hexdigest()
+
+def compile_schedule(tzid=TZID, start_date=START_DATE, total_weeks=TOTAL_WEEKS, plan=PLAN, cache_dir=None,
+                     busy=None, months=None):
+    # Computes the plan once; with cache_dir the result is reused across runs
+    # until PLAN, the settings or the busy blocks change.
+    busy = list(busy or ())
+    cache_path = None
+    if cache_dir:
+        key = schedule_key(tzid, start_date, total_weeks, plan, busy, months)
+        cache_path = os.path.join(cache_dir, f"schedule-{key}.pickle")
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+
+    schedule = Schedule(tzid, start_date, total_weeks, list(iter_records(start_date, total_weeks, plan, busy, months)))
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(schedule, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    return schedule
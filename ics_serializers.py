@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+ics_serializers.py
+
+Output formats for a compiled schedule (see ics_schedule.py). Every serializer
+takes an iterable of EventRecord objects plus an open binary stream and writes
+as it goes, so a generator from iter_records() streams with flat memory.
+
+The raw ics writer escapes TEXT values and folds content lines at 75 octets
+(RFC 5545). Escaped description lines are cached, so the month- and theme-level
+text shared by many sessions is escaped once.
+
+Register a new format by adding a writer to SERIALIZERS.
+"""
+
+import csv
+import datetime as dt
+import functools
+import io
+import json
+import os
+import socket
+import sys
+import uuid
+
+from ics_schedule import TZID, event_uid, fmt_local
+
+CRLF = b"\r\n"
+FOLD_WIDTH = 75  # octets per physical line, RFC 5545 section 3.1
+
+_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n"})
+_UTF8_CONTINUATION = 0xC0  # mask; continuation bytes are 0b10xxxxxx
+
+def dtstamp():
+    return dt.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+
+@functools.lru_cache(maxsize=8192)
+def escape_text(text):
+    # TEXT value escaping (backslash, semicolon, comma, newline) in one translate pass.
+    # Description lines are interned and shared, so most calls are cache hits.
+    return text.translate(_ESCAPE_TABLE).encode("utf-8")
+
+def fold(line):
+    # Folds one content line (bytes) at 75 octets in a single pass, never splitting
+    # a UTF-8 sequence. Short lines are returned unchanged.
+    if len(line) <= FOLD_WIDTH:
+        return line
+    out = bytearray()
+    pos, width, n = 0, FOLD_WIDTH, len(line)
+    while n - pos > width:
+        cut = pos + width
+        while line[cut] & _UTF8_CONTINUATION == 0x80:
+            cut -= 1
+        out += line[pos:cut]
+        out += b"\r\n "
+        pos = cut
+        width = FOLD_WIDTH - 1  # continuation lines start with a space
+    out += line[pos:]
+    return bytes(out)
+
+def text_line(name, text):
+    return fold(name + b":" + escape_text(text))
+
+def description_line(lines):
+    # Assembles DESCRIPTION from cached escaped fragments, then folds once
+    return fold(b"DESCRIPTION:" + b"\\n".join([escape_text(line) for line in lines]))
+
+# Standard/daylight UTC offsets (hours) and names; all follow the US rule:
+# daylight from the 2nd Sunday of March to the 1st Sunday of November, 02:00 local.
+# vtimezone() renders these and ics_import.py uses them to convert imported times.
+TIMEZONE_RULES = {
+    "America/New_York": (-5, "EST", -4, "EDT"),
+    "America/Chicago": (-6, "CST", -5, "CDT"),
+    "America/Denver": (-7, "MST", -6, "MDT"),
+    "America/Los_Angeles": (-8, "PST", -7, "PDT"),
+}
+DST_START = (3, 2)  # (month, nth Sunday)
+DST_END = (11, 1)
+
+def timezone_rule(tzid):
+    # Unknown zones fall back to the default plan zone, as before
+    return TIMEZONE_RULES.get(tzid, TIMEZONE_RULES[TZID])
+
+def nth_sunday(year, month, n):
+    first = dt.date(year, month, 1)
+    return first + dt.timedelta(days=(6 - first.weekday()) % 7 + 7 * (n - 1))
+
+def is_daylight(local_dt):
+    start = dt.datetime.combine(nth_sunday(local_dt.year, *DST_START), dt.time(2, 0))
+    end = dt.datetime.combine(nth_sunday(local_dt.year, *DST_END), dt.time(2, 0))
+    return start <= local_dt < end
+
+def utc_offset(tzid, local_dt):
+    std, _, dst, _ = timezone_rule(tzid)
+    return dt.timedelta(hours=dst if is_daylight(local_dt) else std)
+
+def utc_to_local(utc_dt, tzid):
+    # Naive UTC -> naive local wall time in tzid
+    std, _, dst, _ = timezone_rule(tzid)
+    daylight = utc_dt + dt.timedelta(hours=dst)
+    return daylight if is_daylight(daylight) else utc_dt + dt.timedelta(hours=std)
+
+def _fmt_offset(hours):
+    return f"{'-' if hours < 0 else '+'}{abs(hours):02d}00"
+
+@functools.lru_cache(maxsize=None)
+def vtimezone(tzid):
+    std, std_name, dst, dst_name = timezone_rule(tzid)
+    return CRLF.join([
+        b"BEGIN:VTIMEZONE",
+        fold(f"TZID:{tzid}".encode("utf-8")),
+        b"BEGIN:STANDARD",
+        b"DTSTART:19701101T020000",
+        b"RRULE:FREQ=YEARLY;BYMONTH=%d;BYDAY=%dSU" % (DST_END[0], DST_END[1]),
+        f"TZOFFSETFROM:{_fmt_offset(dst)}".encode("ascii"),
+        f"TZOFFSETTO:{_fmt_offset(std)}".encode("ascii"),
+        f"TZNAME:{std_name}".encode("ascii"),
+        b"END:STANDARD",
+        b"BEGIN:DAYLIGHT",
+        b"DTSTART:19700308T020000",
+        b"RRULE:FREQ=YEARLY;BYMONTH=%d;BYDAY=%dSU" % DST_START,
+        f"TZOFFSETFROM:{_fmt_offset(std)}".encode("ascii"),
+        f"TZOFFSETTO:{_fmt_offset(dst)}".encode("ascii"),
+        f"TZNAME:{dst_name}".encode("ascii"),
+        b"END:DAYLIGHT",
+        b"END:VTIMEZONE",
+    ])
+
+ALARM_BLOCK = CRLF.join([
+    b"BEGIN:VALARM",
+    b"TRIGGER:-PT30M",
+    b"ACTION:DISPLAY",
+    b"DESCRIPTION:Reminder",
+    b"END:VALARM",
+])
+
+def event_block(summary, description, start_dt, end_dt, tzid, include_alarm=True, uid=None, rrule=None,
+                stamp=None, sequence=0, extra=()):
+    # description is a sequence of plain-text lines (see ics_schedule.build_description);
+    # extra: further unfolded content lines (str), e.g. EXDATE/RDATE, placed after RRULE
+    uid = uid or str(uuid.uuid4())
+    parts = [
+        b"BEGIN:VEVENT",
+        f"DTSTAMP:{stamp or dtstamp()}".encode("ascii"),
+        fold(f"UID:{uid}".encode("utf-8")),
+        text_line(b"SUMMARY", summary),
+        description_line(description),
+        fold(f"DTSTART;TZID={tzid}:{fmt_local(start_dt)}".encode("utf-8")),
+        fold(f"DTEND;TZID={tzid}:{fmt_local(end_dt)}".encode("utf-8")),
+        b"TRANSP:OPAQUE",
+        b"STATUS:CONFIRMED",
+    ]
+    if sequence:
+        parts.append(b"SEQUENCE:%d" % sequence)
+    if rrule:
+        parts.append(fold(f"RRULE:{rrule}".encode("ascii")))
+    parts.extend(fold(line.encode("utf-8")) for line in extra)
+    if include_alarm:
+        parts.append(ALARM_BLOCK)
+    parts.append(b"END:VEVENT")
+    return CRLF.join(parts)
+
+def cancel_block(uid, entry, tzid, stamp):
+    # Tells subscribers an event from the previous manifest no longer exists
+    return CRLF.join([
+        b"BEGIN:VEVENT",
+        f"DTSTAMP:{stamp}".encode("ascii"),
+        fold(f"UID:{uid}".encode("utf-8")),
+        b"SEQUENCE:%d" % (entry["sequence"] + 1),
+        text_line(b"SUMMARY", entry["summary"]),
+        fold(f"DTSTART;TZID={tzid}:{entry['start']}".encode("utf-8")),
+        fold(f"DTEND;TZID={tzid}:{entry['end']}".encode("utf-8")),
+        b"STATUS:CANCELLED",
+        b"END:VEVENT",
+    ])
+
+def load_manifest(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["events"]
+
+def save_manifest(path, events, tzid=TZID):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"tzid": tzid, "events": events}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+def calendar_header(tzid=TZID):
+    # VCALENDAR preamble up to and including the VTIMEZONE block
+    return [
+        b"BEGIN:VCALENDAR",
+        b"PRODID:-//AI Engineering Plan//EN",
+        b"VERSION:2.0",
+        b"CALSCALE:GREGORIAN",
+        fold(f"X-WR-TIMEZONE:{tzid}".encode("utf-8")),
+        vtimezone(tzid),
+    ]
+
+def iter_ics(records, tzid=TZID, previous=None, manifest=None, changed_only=False, scope=None):
+    # Yields calendar components one at a time so callers can stream them out
+    # while the schedule loop is still running.
+    # previous: manifest of the last run; unchanged events keep their DTSTAMP/SEQUENCE.
+    # manifest: dict filled with this run's events (uid -> hash, stamp, sequence, ...).
+    # changed_only: emit only added/changed events plus cancellations for removed ones.
+    # scope: namespace for UIDs (see ics_schedule.event_uid).
+    previous = previous or {}
+    # Without a caller-supplied manifest the entries are only needed to find
+    # removed events; skipping them keeps plain streaming runs at flat memory
+    track = manifest is not None or changed_only
+    manifest = {} if manifest is None else manifest
+    now = dtstamp()
+
+    yield from calendar_header(tzid)
+
+    for rec in records:
+        uid = event_uid(*rec.identity, scope=scope) if scope else rec.uid
+        prev = previous.get(uid)
+        digest = rec.content_hash() if track or prev else None
+        unchanged = prev is not None and prev["hash"] == digest
+        if unchanged:
+            stamp, sequence = prev["dtstamp"], prev["sequence"]
+        else:
+            stamp, sequence = now, (prev["sequence"] + 1 if prev else 0)
+        if track:
+            manifest[uid] = {
+                "hash": digest,
+                "dtstamp": stamp,
+                "sequence": sequence,
+                "summary": rec.summary,
+                "start": fmt_local(rec.start),
+                "end": fmt_local(rec.end),
+            }
+        if changed_only and unchanged:
+            continue
+        yield event_block(rec.summary, rec.description, rec.start, rec.end, tzid, uid=uid, rrule=rec.rrule,
+                          stamp=stamp, sequence=sequence)
+
+    if changed_only:
+        for uid, entry in previous.items():
+            if uid not in manifest:
+                yield cancel_block(uid, entry, tzid, now)
+
+    yield b"END:VCALENDAR"
+
+def write_calendar(out, components, flush=False):
+    # Writes CRLF-terminated components to a binary stream without holding
+    # the calendar in memory; returns the number of VEVENTs written
+    count = 0
+    for component in components:
+        out.write(component)
+        out.write(CRLF)
+        if component.startswith(b"BEGIN:VEVENT"):
+            count += 1
+        if flush:
+            out.flush()
+    return count
+
+def write_ics(records, out, tzid=TZID, previous=None, manifest=None, changed_only=False, flush=False, scope=None):
+    return write_calendar(out, iter_ics(records, tzid, previous, manifest, changed_only, scope), flush=flush)
+
+def write_icalendar(records, out, tzid=TZID, flush=False, scope=None, **_):
+    # Same events rendered through the icalendar library (optional dependency)
+    from icalendar import Alarm, Calendar, Event, vText
+
+    cal = Calendar()
+    cal.add('prodid', '-//AI Engineering Plan//EN')
+    cal.add('version', '2.0')
+    cal.add('calscale', 'GREGORIAN')
+    cal.add('X-WR-TIMEZONE', vText(tzid))
+    head = cal.to_ical()
+    footer = b"END:VCALENDAR\r\n"
+    out.write(head[:-len(footer)])
+    out.write(vtimezone(tzid) + CRLF)
+
+    now = dt.datetime.now(dt.timezone.utc)
+    count = 0
+    for rec in records:
+        evt = Event()
+        evt.add('uid', event_uid(*rec.identity, scope=scope) if scope else rec.uid)
+        evt.add('dtstamp', now)
+        evt.add('summary', rec.summary)
+        evt.add('description', rec.description_text)
+        evt.add('dtstart', rec.start, parameters={'TZID': tzid})
+        evt.add('dtend', rec.end, parameters={'TZID': tzid})
+        if rec.rrule:
+            evt.add('rrule', dict(part.split("=") for part in rec.rrule.split(";")))
+        alarm = Alarm()
+        alarm.add('action', 'DISPLAY')
+        alarm.add('trigger', dt.timedelta(minutes=-30))
+        alarm.add('description', 'Reminder')
+        evt.add_component(alarm)
+        out.write(evt.to_ical())
+        count += 1
+        if flush:
+            out.flush()
+    out.write(footer)
+    return count
+
+def text_writer(write):
+    # json/csv produce text; wrap the binary output stream for the duration of the call
+    @functools.wraps(write)
+    def wrapper(records, out, **kwargs):
+        text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+        try:
+            return write(records, text, **kwargs)
+        finally:
+            text.flush()
+            text.detach()
+    return wrapper
+
+@text_writer
+def write_json(records, out, flush=False, scope=None, **_):
+    out.write("[")
+    sep = "\n"
+    count = 0
+    for rec in records:
+        out.write(sep)
+        out.write(json.dumps(rec.as_dict(scope), ensure_ascii=False))
+        sep = ",\n"
+        count += 1
+        if flush:
+            out.flush()
+    out.write("\n]\n")
+    return count
+
+CSV_FIELDS = ["uid", "month", "week", "day", "slot", "start", "end", "summary", "description", "rrule"]
+
+@text_writer
+def write_csv(records, out, flush=False, scope=None, **_):
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    count = 0
+    for rec in records:
+        writer.writerow(rec.as_dict(scope))
+        count += 1
+        if flush:
+            out.flush()
+    return count
+
+SERIALIZERS = {
+    "ics": write_ics,
+    "icalendar": write_icalendar,
+    "json": write_json,
+    "csv": write_csv,
+}
+
+def open_output(target):
+    # "-" streams to stdout, "tcp://host:port" to a socket, anything else is a file path.
+    # Returns (stream, is_live); live streams are flushed per component.
+    # Streams are binary: ICS content lines are CRLF-terminated octets.
+    if target == "-":
+        return sys.stdout.buffer, True
+    if target.startswith("tcp://"):
+        host, _, port = target[len("tcp://"):].rpartition(":")
+        sock = socket.create_connection((host, int(port)))
+        stream = sock.makefile("wb")
+        sock.close()  # the stream keeps the connection open until it is closed
+        return stream, True
+    return open(target, "wb"), False
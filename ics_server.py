@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+ics_server.py
+
+Subscription server for the generated plan (ICS_generator.py --serve), built
+on http.server only.
+
+    /                      the default plan (also /plan.ics)
+    /cohorts/<name>.ics    one calendar per cohort from the --batch manifest
+
+Feeds are rendered once and kept in memory, plain and gzip-compressed, in an
+LRU keyed by cohort. Each feed remembers the schedule_key() of its inputs
+(PLAN, start date, TZID, months, busy blocks) and is only re-rendered when
+that key or its format changes; the cohort manifest and --busy exports are
+re-read when their files change on disk. Changes to PLAN itself are picked up
+on restart.
+
+ETags hash the feed body without its DTSTAMP lines, so a feed that is rebuilt
+with the same content (after a restart, say) keeps its ETag and subscribers
+polling with If-None-Match keep getting 304 Not Modified. The gzip and plain
+representations get distinct strong ETags (the gzip one ends in "-gz") and
+responses carry Vary: Accept-Encoding.
+
+Usage:
+    python ICS_generator.py --serve 8080 [--batch cohorts.csv] [--busy work.ics]
+"""
+
+import collections
+import datetime as dt
+import email.utils
+import gzip
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from ics_schedule import PLAN, START_DATE, TOTAL_WEEKS, TZID, iter_records, schedule_key
+from ics_serializers import SERIALIZERS
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "ics": "text/calendar; charset=utf-8",
+    "icalendar": "text/calendar; charset=utf-8",
+    "json": "application/json; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+DEFAULT_FEED = ""  # LRU key of the plan served at /
+MAX_FEEDS = 64
+MAX_AGE = 300  # seconds clients may reuse a feed before revalidating
+_DTSTAMP_RE = re.compile(rb"\r\nDTSTAMP:[^\r\n]*")
+
+
+class Feed:
+    __slots__ = ("key", "etag", "gzip_etag", "body", "gzipped", "content_type", "modified")
+
+    def __init__(self, key, body, content_type):
+        self.key = key
+        digest = hashlib.sha1(_DTSTAMP_RE.sub(b"", body)).hexdigest()
+        self.etag = '"%s"' % digest
+        self.gzip_etag = '"%s-gz"' % digest  # a strong ETag is per representation
+        self.body = body
+        self.gzipped = gzip.compress(body, mtime=0)
+        self.content_type = content_type
+        self.modified = email.utils.formatdate(usegmt=True)
+
+
+def file_signature(paths):
+    # Cheap change detection for config files: (path, mtime, size) of each
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((path, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+class FeedStore:
+    # Thread-safe LRU of rendered feeds; render() runs outside the lock only
+    # for feeds that are missing or stale
+
+    def __init__(self, cohorts_path=None, busy_paths=(), fmt="ics", max_feeds=MAX_FEEDS):
+        self.cohorts_path = cohorts_path
+        self.busy_paths = list(busy_paths)
+        self.fmt = fmt
+        self.max_feeds = max_feeds
+        self.feeds = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.signature = None
+        self.cohorts = {}
+        self.busy = {}  # tzid -> [(start, end)]
+        self.keys = {}  # feed name -> (key, settings, busy), valid for the current config
+
+    def refresh_config(self):
+        # Re-reads the cohort manifest and busy exports when they change on disk
+        paths = ([self.cohorts_path] if self.cohorts_path else []) + self.busy_paths
+        signature = file_signature(paths)
+        if signature == self.signature:
+            return
+        cohorts = {}
+        if self.cohorts_path:
+            from ics_batch import load_cohorts
+            cohorts = {c["name"]: c for c in load_cohorts(self.cohorts_path)}
+        with self.lock:
+            self.cohorts, self.busy, self.keys, self.signature = cohorts, {}, {}, signature
+        logger.info("Loaded config: %d cohorts, %d busy calendars", len(cohorts), len(self.busy_paths))
+
+    def settings(self, name, cohorts):
+        # (start_date, tzid, months, fmt, scope) for a feed, or None if unknown
+        if name == DEFAULT_FEED:
+            return START_DATE, TZID, None, self.fmt, None
+        cohort = cohorts.get(name)
+        if cohort is None:
+            return None
+        return cohort["start_date"], cohort["tzid"], cohort["months"], cohort["format"], name
+
+    def busy_for(self, tzid, cohorts, busy):
+        # busy: the config's tzid -> intervals table, filled on first use
+        if not self.busy_paths:
+            return []
+        with self.lock:
+            intervals = busy.get(tzid)
+        if intervals is None:
+            from ics_import import busy_intervals
+            latest = max([START_DATE] + [c["start_date"] for c in cohorts.values()])
+            horizon = dt.datetime.combine(latest + dt.timedelta(weeks=TOTAL_WEEKS + 1), dt.time())
+            intervals = busy_intervals(self.busy_paths, tzid, horizon)
+            with self.lock:
+                intervals = busy.setdefault(tzid, intervals)
+        return intervals
+
+    def feed_key(self, name):
+        # (key, settings, busy) of a feed, or None if unknown; schedule_key() hashes every
+        # busy interval, so it runs once per feed and config instead of on every request
+        with self.lock:
+            cohorts, busy, keys = self.cohorts, self.busy, self.keys
+            entry = keys.get(name)
+        if entry is not None:
+            return entry
+        settings = self.settings(name, cohorts)
+        if settings is None:
+            return None
+        start_date, tzid, months, fmt, scope = settings
+        intervals = self.busy_for(tzid, cohorts, busy)
+        key = (schedule_key(tzid, start_date, TOTAL_WEEKS, PLAN, intervals, months), fmt, scope)
+        with self.lock:
+            # keys belongs to the config it was computed from; a reload swaps in a new table
+            return keys.setdefault(name, (key, settings, intervals))
+
+    def get(self, name):
+        self.refresh_config()
+        entry = self.feed_key(name)
+        if entry is None:
+            return None
+        key, (start_date, tzid, months, fmt, scope), busy = entry
+        with self.lock:
+            feed = self.feeds.get(name)
+            if feed is not None and feed.key == key:
+                self.feeds.move_to_end(name)
+                return feed
+
+        feed = self.render(key, start_date, tzid, months, fmt, scope, busy)
+        with self.lock:
+            self.feeds[name] = feed
+            self.feeds.move_to_end(name)
+            while len(self.feeds) > self.max_feeds:
+                self.feeds.popitem(last=False)
+        return feed
+
+    def render(self, key, start_date, tzid, months, fmt, scope, busy):
+        buf = io.BytesIO()
+        records = iter_records(start_date, TOTAL_WEEKS, busy=busy, months=months)
+        events = SERIALIZERS[fmt](records, buf, tzid=tzid, scope=scope)
+        logger.info("Rendered %s feed %r: %d events, %d bytes", fmt, scope or "plan", events, buf.tell())
+        return Feed(key, buf.getvalue(), CONTENT_TYPES[fmt])
+
+
+def feed_name(path):
+    # URL path -> LRU key, or None for unknown paths
+    path = unquote(urlsplit(path).path).rstrip("/")
+    if path in ("", "/plan.ics"):
+        return DEFAULT_FEED
+    if path.startswith("/cohorts/"):
+        name = path[len("/cohorts/"):]
+        for ext in (".ics", ".json", ".csv"):
+            if name.endswith(ext):
+                name = name[:-len(ext)]
+                break
+        return name or None
+    return None
+
+def etag_matches(header, etag):
+    # If-None-Match: "*" or a list of (possibly weak) entity tags
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+def accepts_gzip(header):
+    # Accept-Encoding with q-values: "gzip;q=0" refuses gzip, "*" covers it unless
+    # gzip is listed on its own
+    gzip_q = star_q = None
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        coding = coding.lower()
+        if coding in ("gzip", "x-gzip"):
+            gzip_q = q if gzip_q is None else max(gzip_q, q)
+        elif coding == "*":
+            star_q = q
+    q = gzip_q if gzip_q is not None else star_q
+    return q is not None and q > 0
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    store = None  # set by make_server()
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body):
+        name = feed_name(self.path)
+        feed = self.store.get(name) if name is not None else None
+        if feed is None:
+            self.send_error(404, "No such calendar")
+            return
+
+        gzip_ok = accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        etag = feed.gzip_etag if gzip_ok else feed.etag
+        if etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(304)
+            self.send_validators(feed, etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = feed.gzipped if gzip_ok else feed.body
+        self.send_response(200)
+        self.send_header("Content-Type", feed.content_type)
+        if gzip_ok:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_validators(feed, etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def send_validators(self, feed, etag):
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", feed.modified)
+        self.send_header("Cache-Control", f"max-age={MAX_AGE}")
+        self.send_header("Vary", "Accept-Encoding")
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def make_server(address, store):
+    handler = type("BoundFeedHandler", (FeedHandler,), {"store": store})
+    return ThreadingHTTPServer(address, handler)
+
+def parse_address(spec):
+    # "8080", ":8080" or "host:8080"
+    host, _, port = str(spec).rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+def serve(spec, cohorts_path=None, busy_paths=(), fmt="ics"):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    store = FeedStore(cohorts_path, busy_paths, fmt)
+    store.get(DEFAULT_FEED)  # render the default feed before accepting requests
+    server = make_server(parse_address(spec), store)
+    host, port = server.server_address[:2]
+    print(f"Serving calendars on http://{host}:{port}/ (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
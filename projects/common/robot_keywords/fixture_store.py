@@ -0,0 +1,195 @@
+# fixture_store.py
+"""Machine-wide cache of generated test arrays, shared by the Robot keyword libraries.
+
+Each fixture is keyed by (shape, dtype, seed, generator, distribution) and stored once
+as a .npy file under AI_FIXTURE_CACHE (default ~/.cache/ai-fixtures). Later requests,
+from any test, suite or parallel worker (pabot), map the file instead of generating the
+data again. Maps are copy-on-write, so a test that writes into its fixture never changes
+the cached file.
+
+Safety with concurrent workers:
+- files are written to a temporary name and published with os.replace, so readers see
+  either no file or a complete one
+- a per-fixture lock file (fcntl, where available) makes the first worker generate the
+  fixture while the others wait for it and then map the result
+- LRU order is the file mtime, bumped on every hit. Eviction deletes the oldest files
+  until the cache fits AI_FIXTURE_CACHE_MAX (default 2G). A file that another process
+  still has mapped stays readable on POSIX after it is removed. Lock files are empty
+  and never removed: unlinking one that another worker holds or waits on would let a
+  third worker lock a new file of the same name and generate the fixture concurrently.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: atomic os.replace alone still keeps readers safe
+    fcntl = None
+
+DEFAULT_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "ai-fixtures")
+DEFAULT_MAX_BYTES = "2G"
+GENERATORS = ("PCG64", "PCG64DXSM", "Philox", "SFC64", "MT19937")
+DISTRIBUTIONS = ("standard_normal", "uniform")
+CHUNK_BYTES = 64 << 20  # generated and written this much at a time
+
+
+def parse_size(value):
+    """1024, "512K", "64M" or "2G" -> bytes.
+
+    Kept local (ai_matrix.outofcore.parse_bytes reads the same format) so the store
+    works for any project, without a week's package on sys.path.
+    """
+    text = str(value).strip().upper().removesuffix("B")
+    scale = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}.get(text[-1:], 1)
+    return int(float(text.rstrip("KMG")) * scale)
+
+
+def generate(shape, dtype="float64", seed=0, generator="PCG64", distribution="standard_normal", out=None):
+    """Fixture data from np.random.Generator(<generator>(seed)), filled in row chunks.
+
+    Chunking consumes the stream in the same order as a single call, so the values do
+    not depend on CHUNK_BYTES. The NumPy version is part of the cache key because
+    Generator streams are only guaranteed stable within a release.
+    """
+    if generator not in GENERATORS:
+        raise ValueError(f"unknown generator {generator!r}; expected one of {GENERATORS}")
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution {distribution!r}; expected one of {DISTRIBUTIONS}")
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"fixtures support float32 and float64, got {dtype}")
+    rng = np.random.Generator(getattr(np.random, generator)(seed))
+    draw = rng.standard_normal if distribution == "standard_normal" else rng.random
+    shape = tuple(int(s) for s in shape)
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    flat = out.reshape(shape[0], -1)
+    rows = max(1, CHUNK_BYTES // max(1, flat.shape[1] * dtype.itemsize))
+    for r0 in range(0, flat.shape[0], rows):
+        r1 = min(r0 + rows, flat.shape[0])
+        draw(out=flat[r0:r1], dtype=dtype)
+    return out
+
+
+class FixtureStore:
+    def __init__(self, root=None, max_bytes=None):
+        self.root = root or os.environ.get("AI_FIXTURE_CACHE", DEFAULT_ROOT)
+        self.max_bytes = parse_size(max_bytes or os.environ.get("AI_FIXTURE_CACHE_MAX", DEFAULT_MAX_BYTES))
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def key(shape, dtype, seed, generator, distribution):
+        spec = {"shape": [int(s) for s in shape], "dtype": np.dtype(dtype).str, "seed": int(seed),
+                "generator": generator, "distribution": distribution, "numpy": np.__version__}
+        return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:20]
+
+    def path(self, key):
+        return os.path.join(self.root, key + ".npy")
+
+    @contextlib.contextmanager
+    def _locked(self, key):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.root, key + ".lock"), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def get(self, shape, dtype="float64", seed=0, generator="PCG64", distribution="standard_normal"):
+        """The fixture as a copy-on-write memmap, generating and caching it on first use."""
+        key = self.key(shape, dtype, seed, generator, distribution)
+        path = self.path(key)
+        if not os.path.exists(path):
+            with self._locked(key):
+                # another worker may have published it while we waited for the lock
+                if not os.path.exists(path):
+                    self._create(path, shape, dtype, seed, generator, distribution)
+                    self.misses += 1
+                    self.evict(keep=(path,))
+                    return np.load(path, mmap_mode="c")
+        self.hits += 1
+        with contextlib.suppress(OSError):
+            os.utime(path)  # LRU bump
+        return np.load(path, mmap_mode="c")
+
+    def _create(self, path, shape, dtype, seed, generator, distribution):
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-", suffix=".npy")
+        os.close(fd)
+        try:
+            out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.dtype(dtype),
+                                            shape=tuple(int(s) for s in shape))
+            generate(shape, dtype, seed, generator, distribution, out=out)
+            out.flush()
+            del out
+            os.chmod(tmp, 0o644)  # mkstemp creates 0600; fixtures are shared machine-wide
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+
+    def entries(self):
+        """[(path, bytes, mtime)] of cached fixtures, least recently used first."""
+        found = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".npy") or name.startswith(".tmp-"):
+                continue
+            path = os.path.join(self.root, name)
+            with contextlib.suppress(FileNotFoundError):
+                st = os.stat(path)
+                found.append((path, st.st_size, st.st_mtime))
+        return sorted(found, key=lambda e: e[2])
+
+    def size(self):
+        return sum(e[1] for e in self.entries())
+
+    def evict(self, keep=()):
+        """Remove least recently used fixtures until the cache fits max_bytes; returns the count."""
+        entries = self.entries()
+        total = sum(e[1] for e in entries)
+        removed = 0
+        for path, nbytes, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path in keep:
+                continue
+            with contextlib.suppress(OSError):
+                os.remove(path)
+                total -= nbytes
+                removed += 1
+        return removed
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            with contextlib.suppress(OSError):
+                os.remove(path)
+        self.hits = self.misses = 0
+
+
+_default = None
+
+
+def default_store():
+    global _default
+    if _default is None:
+        _default = FixtureStore()
+    return _default
+
+
+def configure(root=None, max_bytes=None):
+    """Replace the shared store (e.g. to point a suite at its own cache directory)."""
+    global _default
+    _default = FixtureStore(root, max_bytes)
+    return _default
+
@@ -1,27 +1,498 @@
 # matrix_keywords.py
+import contextlib
+import os
+import sys
+import hashlib
+import json
 import numpy as np
+import platform
+import shutil
+import tempfile
 import time
+import tracemalloc
 from robot.api import logger
 
-def setup_matrix_library():
-    # optional: set paths, env vars
+import fixture_store
+
+KEYWORDS_DIR = os.path.dirname(os.path.abspath(__file__))
+MATRIX_LIB_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "week-01-matrix-lib", "src"))
+
+def setup_matrix_library(workers=None):
+    # make ai_matrix importable from any week folder; optionally set the default worker count.
+    # This directory stays importable too (Robot drops it after the library import), so
+    # worker processes started with multiprocessing spawn can load these helpers.
+    for path in (MATRIX_LIB_SRC, KEYWORDS_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    if workers is not None:
+        from ai_matrix.linalg import set_num_workers
+        set_num_workers(int(workers))
     logger.info("Matrix library setup")
 
-def create_random_matrix(rows, cols, seed=None):
-    if seed is not None:
-        np.random.seed(int(seed))
-    mat = np.random.randn(int(rows), int(cols))
-    # save to disk or register in a simple object store for other keywords
-    return mat
+def configure_fixture_cache(root=None, max_size=None):
+    # point the shared fixture store at another directory / size cap (defaults:
+    # AI_FIXTURE_CACHE, AI_FIXTURE_CACHE_MAX)
+    store = fixture_store.configure(root, max_size)
+    logger.info(f"Fixture cache at {store.root}, cap {store.max_bytes} bytes")
+
+def create_random_matrix(rows, cols, seed=None, path=None, memory_budget=None, dtype="float64",
+                         generator="PCG64"):
+    # seeded matrices come from the machine-wide fixture store: generated once per
+    # (shape, dtype, seed, generator), then memory-mapped (copy-on-write) on every reuse
+    from ai_matrix import Matrix
+    if path is not None:
+        # out-of-core: streamed into a .npy file in budget-sized chunks, wrapped as a memmap
+        from ai_matrix.outofcore import random_npy
+        return Matrix.from_array(random_npy(path, int(rows), int(cols), seed=seed, dtype=dtype,
+                                            memory_budget=memory_budget))
+    if seed is None:
+        return Matrix.from_array(fixture_store.generate((int(rows), int(cols)), dtype, None, generator))
+    mat = fixture_store.default_store().get((int(rows), int(cols)), dtype, int(seed), generator)
+    # wrapped without copying; views taken from it by later keywords share this mapping
+    return Matrix.from_array(mat)
+
+def verify_fixture_cache(rows=2000, cols=2000, seed=0, workers=4):
+    # generates one fixture from `workers` processes at once, then checks that every
+    # process saw identical data, that a single file was published, and that reuse
+    # maps it instead of regenerating; returns first-use vs reuse timings
+    import multiprocessing
+    store = fixture_store.default_store()
+    shape, seed = (int(rows), int(cols)), int(seed)
+    path = store.path(store.key(shape, "float64", seed, "PCG64", "standard_normal"))
+    if os.path.exists(path):
+        os.remove(path)
+    start = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(int(workers)) as pool:
+        digests = pool.starmap(_fixture_digest, [(store.root, store.max_bytes, shape, seed)] * int(workers))
+    first_s = time.perf_counter() - start
+    if len(set(digests)) != 1:
+        raise AssertionError(f"Parallel workers saw different fixture data: {digests}")
+    start = time.perf_counter()
+    mat = create_random_matrix(rows, cols, seed=seed)
+    reuse_s = time.perf_counter() - start
+    backing = np.asarray(mat).base
+    while backing is not None and not isinstance(backing, np.memmap):
+        backing = getattr(backing, "base", None)
+    if not os.path.exists(path):
+        raise AssertionError("Fixture was not published to the cache")
+    if hashlib.sha1(np.ascontiguousarray(mat)).hexdigest() != digests[0]:
+        raise AssertionError("Cached fixture differs from the generated data")
+    expected = np.random.default_rng(seed).standard_normal(shape)
+    if not np.array_equal(np.asarray(mat), expected):
+        raise AssertionError("Fixture does not match np.random.default_rng(seed).standard_normal")
+    logger.info(f"Fixture {shape} seed={seed}: {workers} parallel first uses {first_s * 1000:.1f} ms, "
+                f"reuse {reuse_s * 1000:.2f} ms (memory-mapped: {backing is not None})")
+    return {"first_ms": first_s * 1000, "reuse_ms": reuse_s * 1000, "memory_mapped": backing is not None}
+
+def _fixture_digest(root, max_bytes, shape, seed):
+    # runs in a worker process
+    store = fixture_store.FixtureStore(root, max_bytes)
+    return hashlib.sha1(np.ascontiguousarray(store.get(shape, "float64", seed))).hexdigest()
 
-def matrix_multiply_and_verify_against_numpy(mat_a, mat_b, tolerance=1e-6):
+def matrix_multiply_and_verify_against_numpy(mat_a, mat_b, tolerance=1e-6, backend="auto"):
     # call your project implementation (import from ai_matrix)
     from ai_matrix.linalg import matrix_multiply as impl_mul
-    start = time.time()
-    res_impl = impl_mul(mat_a, mat_b)
-    elapsed = (time.time() - start) * 1000
+    start = time.perf_counter_ns()
+    res_impl = impl_mul(mat_a, mat_b, backend=backend)
+    elapsed = (time.perf_counter_ns() - start) / 1e6
     res_np = np.dot(mat_a, mat_b)
     if not np.allclose(res_impl, res_np, atol=float(tolerance)):
         raise AssertionError("Matrix multiply mismatch")
-    logger.info(f"Matrix multiply OK, elapsed_ms={elapsed}")
+    logger.info(f"Matrix multiply OK, backend={backend}, elapsed_ms={elapsed}")
+
+
+def _sample_ns(fn, warmup, repeats):
+    # warmup calls (pool start-up, page faults, BLAS init), then one perf_counter_ns sample per call
+    for _ in range(int(warmup)):
+        fn()
+    samples = np.empty(int(repeats), dtype=np.int64)
+    for r in range(int(repeats)):
+        start = time.perf_counter_ns()
+        fn()
+        samples[r] = time.perf_counter_ns() - start
+    return samples
+
+
+def benchmark_matmul(sizes="256,512,1024", dtypes="float32,float64", backend="auto", warmup=2, repeats=10,
+                     output=None, seed=0):
+    # Roofline-style sweep of matrix_multiply over square sizes and dtypes. Each entry has
+    # the median/p95 time, GFLOP/s (2n^3 flops), GB/s (3n^2 compulsory element moves),
+    # arithmetic intensity (flop/byte) and throughput relative to np.dot on the same inputs.
+    # Results are verified against np.dot and written as JSON to `output` when given.
+    from ai_matrix.linalg import matrix_multiply as impl_mul
+    rng = np.random.default_rng(int(seed))
+    results = []
+    for dtype in [np.dtype(d.strip()) for d in str(dtypes).split(",")]:
+        for n in [int(x) for x in str(sizes).split(",")]:
+            a = rng.standard_normal((n, n)).astype(dtype)
+            b = rng.standard_normal((n, n)).astype(dtype)
+            ours = _sample_ns(lambda: impl_mul(a, b, backend=backend), warmup, repeats)
+            ref = _sample_ns(lambda: np.dot(a, b), warmup, repeats)
+            tolerance = 1e-3 * n if dtype == np.float32 else 1e-8 * n
+            if not np.allclose(impl_mul(a, b, backend=backend), np.dot(a, b), atol=tolerance):
+                raise AssertionError(f"Matrix multiply mismatch at n={n}, dtype={dtype}")
+            flops = 2.0 * n ** 3
+            moved = 3.0 * n * n * dtype.itemsize
+            median_ns = float(np.median(ours))
+            entry = {
+                "backend": backend, "dtype": dtype.name, "size": n,
+                "median_ms": median_ns / 1e6, "p95_ms": float(np.percentile(ours, 95)) / 1e6,
+                "gflops": flops / median_ns, "gbps": moved / median_ns, "intensity": flops / moved,
+                "numpy_ratio": float(np.median(ref)) / median_ns,
+            }
+            logger.info(f"matmul {backend} {dtype.name} n={n}: median {entry['median_ms']:.3f} ms, "
+                        f"p95 {entry['p95_ms']:.3f} ms, {entry['gflops']:.2f} GFLOP/s, {entry['gbps']:.2f} GB/s, "
+                        f"{entry['numpy_ratio']:.2f}x np.dot")
+            results.append(entry)
+    if output:
+        save_benchmark_baseline(results, output)
+    return results
+
+
+def save_benchmark_baseline(results, path):
+    # JSON baseline: the entries plus enough context to tell which machine produced them
+    payload = {"machine": {"platform": platform.platform(), "processor": platform.processor(),
+                           "cpus": os.cpu_count(), "numpy": np.__version__},
+               "results": list(results)}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write("\n")
+    logger.info(f"Saved {len(payload['results'])} benchmark entries to {path}")
+
+
+def _host_key():
+    # baselines are only comparable on the machine that recorded them: hostname, CPU and core count
+    cpu = platform.processor() or platform.machine()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next((line.split(":", 1)[1] for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    raw = f"{platform.node()}-{cpu.strip()}-{os.cpu_count()}cpu"
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in raw)
+
+
+def baseline_path(baseline):
+    # a .json path is used as-is; a directory holds one matmul-<host>.json per machine
+    if str(baseline).endswith(".json"):
+        return str(baseline)
+    return os.path.join(str(baseline), f"matmul-{_host_key()}.json")
+
+
+def throughput_should_meet_baseline(results, baseline, min_fraction=0.8):
+    # fails when any (backend, dtype, size) entry reaches less than min_fraction of the
+    # baseline GFLOP/s; entries missing from the baseline are logged and skipped. With
+    # no baseline for this host yet, records `results` as its baseline and skips the test
+    from robot.libraries.BuiltIn import BuiltIn
+    path = baseline_path(baseline)
+    if not os.path.exists(path):
+        save_benchmark_baseline(results, path)
+        BuiltIn().skip(f"No matmul baseline for this host yet; recorded one at {path}")
+    with open(path) as f:
+        reference = {(e["backend"], e["dtype"], e["size"]): e for e in json.load(f)["results"]}
+    failures = []
+    for entry in results:
+        base = reference.get((entry["backend"], entry["dtype"], entry["size"]))
+        if base is None:
+            logger.warn(f"No baseline for {entry['backend']} {entry['dtype']} n={entry['size']}")
+            continue
+        fraction = entry["gflops"] / base["gflops"]
+        logger.info(f"{entry['backend']} {entry['dtype']} n={entry['size']}: {entry['gflops']:.2f} GFLOP/s, "
+                    f"{fraction:.2f}x baseline {base['gflops']:.2f}")
+        if fraction < float(min_fraction):
+            failures.append(f"{entry['dtype']} n={entry['size']}: {entry['gflops']:.2f} GFLOP/s is "
+                            f"{fraction:.2f}x baseline {base['gflops']:.2f}")
+    if failures:
+        raise AssertionError(f"Throughput below {float(min_fraction):.2f}x baseline ({path}): " + "; ".join(failures))
+
+
+def multiply_views_and_verify(mat_a, mat_b, rows=None, tolerance=1e-6):
+    # A[:rows].T @ B[:rows] through zero-copy views; fails if a view copied its parent
+    from ai_matrix import Matrix
+    from ai_matrix.linalg import matrix_multiply as impl_mul
+    mat_a, mat_b = Matrix.from_array(mat_a), Matrix.from_array(mat_b)
+    rows = int(rows) if rows is not None else min(len(mat_a), len(mat_b))
+    view_a, view_b = mat_a[:rows].T, mat_b[:rows]
+    if not (view_a.shares_memory(mat_a) and view_b.shares_memory(mat_b)):
+        raise AssertionError("Matrix view does not share memory with its parent")
+    res_impl = impl_mul(view_a, view_b)
+    res_np = np.dot(np.asarray(mat_a)[:rows].T, np.asarray(mat_b)[:rows])
+    if not np.allclose(res_impl, res_np, atol=float(tolerance)):
+        raise AssertionError("Matrix multiply mismatch on views")
+    logger.info(f"View multiply OK: {view_a.shape} x {view_b.shape}, strides {view_a.strides}")
+
+_BLAS_THREAD_VARS = ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS")
+
+def _single_threaded_blas():
+    # context capping BLAS to one thread (threadpoolctl, when installed), or None when
+    # BLAS may run its own threads and serial timings are already parallel
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        if any(os.environ.get(name) == "1" for name in _BLAS_THREAD_VARS):
+            return contextlib.nullcontext()
+        return None
+    return threadpool_limits(limits=1, user_api="blas")
+
+def measure_parallel_speedup(size=1024, workers=4, repeats=3, backend="auto", tolerance=1e-8):
+    # best-of-N serial vs parallel time for one size x size product; fails unless the
+    # parallel result equals the serial one, returns the speedup
+    from ai_matrix.linalg import matrix_multiply as impl_mul
+    size, workers, repeats = int(size), int(workers), int(repeats)
+    mat = np.random.default_rng(0).standard_normal((size, size))
+    blas_limit = _single_threaded_blas()
+    timings, results = {}, {}
+    with blas_limit if blas_limit is not None else contextlib.nullcontext():
+        for n in (1, workers):
+            results[n] = np.asarray(impl_mul(mat, mat, backend=backend, workers=n))  # also warms pool and caches
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                impl_mul(mat, mat, backend=backend, workers=n)
+                best = min(best, time.perf_counter() - start)
+            timings[n] = best
+    if not np.allclose(results[workers], results[1], rtol=float(tolerance), atol=float(tolerance)):
+        raise AssertionError(f"{workers}-worker multiply differs from the serial result")
+    speedup = timings[1] / timings[workers]
+    logger.info(f"Parallel matmul {size}x{size}: 1 worker {timings[1] * 1000:.1f} ms, "
+                f"{workers} workers {timings[workers] * 1000:.1f} ms, speedup {speedup:.2f}x "
+                f"({os.cpu_count()} CPUs, BLAS {'single-threaded' if blas_limit is not None else 'not capped'})")
+    return speedup
+
+def speedup_should_scale_with_cores(speedup, workers=4, min_efficiency=0.5):
+    # speedup >= min_efficiency * min(workers, CPUs); skipped on one CPU, or when BLAS
+    # threads are not capped (the serial baseline then already uses every core)
+    from robot.libraries.BuiltIn import BuiltIn
+    cores = min(int(workers), os.cpu_count() or 1)
+    if cores < 2:
+        BuiltIn().skip(f"Speedup needs at least 2 CPUs to mean anything ({os.cpu_count()} available)")
+    if _single_threaded_blas() is None:
+        BuiltIn().skip(f"BLAS threads not capped: install threadpoolctl or set one of {', '.join(_BLAS_THREAD_VARS)}=1")
+    floor = float(min_efficiency) * cores
+    if float(speedup) < floor:
+        raise AssertionError(f"Speedup {float(speedup):.2f}x with {workers} workers on {cores} usable cores is "
+                             f"below {floor:.2f}x ({float(min_efficiency):.0%} efficiency)")
+    logger.info(f"Speedup {float(speedup):.2f}x on {cores} cores (floor {floor:.2f}x)")
+
+def verify_sparse_against_dense(size=2000, densities="0.001,0.01,0.05", cols=64, fmt="csr", seed=0,
+                                tolerance=1e-6, dtype="float64"):
+    # SpMV and SpMM against np.dot on the dense equivalent at several densities (complex
+    # dtypes use complex matrices and operands); logs memory and time saved (negative
+    # when dense wins) and returns one dict per density
+    from ai_matrix import sparse
+    size, cols = int(size), int(cols)
+    rng = np.random.default_rng(int(seed))
+    dense_rhs = rng.standard_normal((size, cols))
+    vec = rng.standard_normal(size)
+    if np.dtype(dtype).kind == "c":
+        dense_rhs = dense_rhs + 1j * rng.standard_normal((size, cols))
+        vec = vec + 1j * rng.standard_normal(size)
+    report = []
+    for density in [float(d) for d in str(densities).split(",")]:
+        mat = sparse.random(size, size, density, seed=int(seed), fmt=fmt, dtype=dtype)
+        dense = mat.toarray()
+        start = time.perf_counter()
+        res_mv = sparse.spmv(mat, vec)
+        res_mm = sparse.spmm(mat, dense_rhs)
+        sparse_s = time.perf_counter() - start
+        start = time.perf_counter()
+        ref_mv = np.dot(dense, vec)
+        ref_mm = np.dot(dense, dense_rhs)
+        dense_s = time.perf_counter() - start
+        if not (np.allclose(res_mv, ref_mv, atol=float(tolerance)) and np.allclose(res_mm, ref_mm, atol=float(tolerance))):
+            raise AssertionError(f"Sparse product mismatch at density {density}")
+        row = {
+            "density": density,
+            "nnz": mat.nnz,
+            "memory_saved": 1 - mat.nbytes / mat.dense_nbytes(),
+            "time_saved": 1 - sparse_s / dense_s if dense_s else 0.0,
+            "sparse_ms": sparse_s * 1000,
+            "dense_ms": dense_s * 1000,
+        }
+        logger.info(f"{fmt} {mat.dtype} density={density}: nnz={row['nnz']}, memory saved {row['memory_saved']:.1%}, "
+                    f"sparse {row['sparse_ms']:.1f} ms vs dense {row['dense_ms']:.1f} ms "
+                    f"(time saved {row['time_saved']:.1%})")
+        report.append(row)
+    return report
+
+def benchmark_batched_matmul(batch_sizes="1,10,100,1000,10000", m=16, k=16, n=16, seed=0):
+    # per-matrix cost of one bmm call vs a Python loop of matrix_multiply calls;
+    # verifies both against np.matmul and returns one dict per batch size
+    from ai_matrix.linalg import bmm, matrix_multiply as impl_mul
+    rng = np.random.default_rng(int(seed))
+    warm = rng.standard_normal((2, int(m), int(k))), rng.standard_normal((2, int(k), int(n)))
+    impl_mul(warm[0][0], warm[1][0])
+    bmm(*warm)
+    report = []
+    for batch in [int(b) for b in str(batch_sizes).split(",")]:
+        a = rng.standard_normal((batch, int(m), int(k)))
+        b = rng.standard_normal((batch, int(k), int(n)))
+        start = time.perf_counter()
+        looped = [impl_mul(a[i], b[i]) for i in range(batch)]
+        loop_s = time.perf_counter() - start
+        start = time.perf_counter()
+        batched = bmm(a, b)
+        bmm_s = time.perf_counter() - start
+        ref = np.matmul(a, b)
+        if not (np.allclose(batched, ref) and np.allclose(np.stack(looped), ref)):
+            raise AssertionError(f"Batched matmul mismatch at B={batch}")
+        row = {"batch": batch, "loop_us_per_matrix": loop_s / batch * 1e6, "bmm_us_per_matrix": bmm_s / batch * 1e6}
+        logger.info(f"B={batch}: loop {row['loop_us_per_matrix']:.2f} us/matrix, "
+                    f"bmm {row['bmm_us_per_matrix']:.2f} us/matrix")
+        report.append(row)
+    return report
+
+def benchmark_factorizations(size=500, repeats=5, seed=0, tolerance=1e-6):
+    # LU/Cholesky/QR solves, cached re-solves, the condition estimate and the
+    # eigensolvers, each timed next to its NumPy/LAPACK counterpart and verified
+    # against it; returns {name: {"ours_ms", "numpy_ms", "ratio"}}
+    from ai_matrix import eigen, factorize
+    n = int(size)
+    rng = np.random.default_rng(int(seed))
+    a = rng.standard_normal((n, n))
+    spd = a @ a.T + n * np.eye(n)
+    sym = a + a.T
+    b = rng.standard_normal(n)
+
+    def best(fn):
+        result, elapsed = None, float("inf")
+        for _ in range(int(repeats)):
+            start = time.perf_counter()
+            result = fn()
+            elapsed = min(elapsed, time.perf_counter() - start)
+        return result, elapsed * 1e3
+
+    cache = factorize.FactorCache()
+    cases = {
+        "lu_solve": (lambda: factorize.solve(a, b, cache=False), lambda: np.linalg.solve(a, b)),
+        "cholesky_solve": (lambda: factorize.solve(spd, b, method="cholesky", cache=False),
+                           lambda: np.linalg.solve(spd, b)),
+        "qr_solve": (lambda: factorize.solve(a, b, method="qr", cache=False), lambda: np.linalg.solve(a, b)),
+        "cached_solve": (lambda: factorize.solve(a, b, cache=cache), lambda: np.linalg.solve(a, b)),
+        "cond_estimate": (lambda: factorize.cond_estimate(a, cache=cache), lambda: np.linalg.cond(a, 1)),
+        "power_iteration": (lambda: eigen.power_iteration(spd)[0], lambda: np.linalg.eigvalsh(spd)[-1]),
+        "lanczos_top4": (lambda: eigen.lanczos(sym, 4), lambda: np.linalg.eigvalsh(sym)[-4:]),
+    }
+    report = {}
+    for name, (ours_fn, numpy_fn) in cases.items():
+        ours, ours_ms = best(ours_fn)
+        ref, numpy_ms = best(numpy_fn)
+        if name == "cond_estimate":
+            # Hager/Higham gives a lower bound that is usually within a small factor
+            ok = ref / 10 <= ours <= ref * (1 + tolerance)
+        else:
+            ok = np.allclose(ours, ref, rtol=tolerance, atol=tolerance)
+        if not ok:
+            raise AssertionError(f"{name} does not match NumPy: {ours} vs {ref}")
+        report[name] = {"ours_ms": ours_ms, "numpy_ms": numpy_ms, "ratio": ours_ms / numpy_ms}
+        logger.info(f"{name}: {ours_ms:.2f} ms vs NumPy {numpy_ms:.2f} ms ({ours_ms / numpy_ms:.2f}x)")
+    logger.info(f"factor cache: {cache.hits} hits, {cache.misses} misses")
+    return report
+
+
+def verify_solves_after_out_writes(size=200, seed=0, tolerance=1e-8):
+    # solves with a cached factorization, overwrites the Matrix through each out= path
+    # (matrix_multiply, add, scale, bmm, tiled_multiply), and checks that every re-solve
+    # uses the new contents; returns {path: version after the write}
+    from ai_matrix import Matrix, factorize, linalg
+    from ai_matrix.outofcore import tiled_multiply
+    n = int(size)
+    rng = np.random.default_rng(int(seed))
+    m = Matrix.from_array(rng.standard_normal((n, n)) + n * np.eye(n))
+    b = rng.standard_normal(n)
+    cache = factorize.FactorCache()
+    writes = {
+        "matrix_multiply": lambda src: linalg.matrix_multiply(src, np.eye(n), out=m),
+        "add": lambda src: linalg.add(src, np.zeros((n, n)), out=m),
+        "scale": lambda src: linalg.scale(src, 1.0, out=m),
+        "bmm": lambda src: linalg.bmm(src, np.eye(n), out=m),
+        "tiled_multiply": lambda src: tiled_multiply(src, np.eye(n), out=m),
+    }
+    factorize.solve(m, b, cache=cache)
+    versions = {}
+    for name, write in writes.items():
+        before = m.version
+        write(rng.standard_normal((n, n)) + n * np.eye(n))
+        if m.version == before:
+            raise AssertionError(f"{name}(out=Matrix) did not bump Matrix.version")
+        x = factorize.solve(m, b, cache=cache)
+        expected = np.linalg.solve(np.asarray(m), b)
+        if not np.allclose(x, expected, rtol=float(tolerance), atol=float(tolerance)):
+            raise AssertionError(f"solve after {name}(out=...) reused the factors of the old contents")
+        versions[name] = m.version
+    logger.info(f"Re-solves after out= writes match NumPy; versions {versions}, "
+                f"cache {cache.hits} hits / {cache.misses} misses")
+    return versions
+
+def verify_solves_after_view_writes(size=200, seed=0, tolerance=1e-8):
+    # solves with a cached factorization, then writes through Matrix views of the
+    # operand (a slice, the transpose, a row, a column) and checks that each re-solve
+    # uses the new contents; returns {view: version after the write}
+    from ai_matrix import Matrix, factorize
+    n = int(size)
+    rng = np.random.default_rng(int(seed))
+    m = Matrix.from_array(rng.standard_normal((n, n)) + n * np.eye(n))
+    b = rng.standard_normal(n)
+    cache = factorize.FactorCache()
+    # view -> the element written through it
+    views = {"slice": (m[0:10, 0:10], (0, 0)), "transpose": (m.T, (1, 1)), "row": (m.row(2), (0, 3)),
+             "column": (m.col(4), (5, 0))}
+    factorize.solve(m, b, cache=cache)
+    versions = {}
+    for name, (view, index) in views.items():
+        before = m.version
+        view[index] = 1000.0 + rng.standard_normal()
+        if m.version == before:
+            raise AssertionError(f"writing through a {name} view did not bump Matrix.version")
+        x = factorize.solve(m, b, cache=cache)
+        expected = np.linalg.solve(np.asarray(m), b)
+        if not np.allclose(x, expected, rtol=float(tolerance), atol=float(tolerance)):
+            raise AssertionError(f"solve after a write through a {name} view reused the factors of the old contents")
+        versions[name] = m.version
+    logger.info(f"Re-solves after view writes match NumPy; versions {versions}, "
+                f"cache {cache.hits} hits / {cache.misses} misses")
+    return versions
+
+
+def multiply_out_of_core_and_verify(rows=1500, inner=1500, cols=1500, memory_budget="8M", samples=256, seed=0,
+                                    tolerance=1e-6):
+    # writes A and B to .npy files, multiplies them tile by tile into a memmapped C
+    # under `memory_budget`, checks that the operands exceed the budget and the
+    # traced peak stays within it, and verifies `samples` random entries of C
+    from ai_matrix.outofcore import open_npy, parse_bytes, tiled_multiply
+    budget = parse_bytes(memory_budget)
+    workdir = tempfile.mkdtemp(prefix="ai_matrix_ooc_")
+    try:
+        a = create_random_matrix(rows, inner, seed=int(seed), path=os.path.join(workdir, "a.npy"),
+                                 memory_budget=budget)
+        b = create_random_matrix(inner, cols, seed=int(seed) + 1, path=os.path.join(workdir, "b.npy"),
+                                 memory_budget=budget)
+        operand_bytes = a.size * a.dtype.itemsize, b.size * b.dtype.itemsize
+        if min(operand_bytes) <= budget:
+            raise AssertionError(f"operands ({operand_bytes} bytes) must exceed the {budget}-byte budget")
+        del a, b
+        tracemalloc.start()
+        start = time.perf_counter()
+        tiled_multiply(os.path.join(workdir, "a.npy"), os.path.join(workdir, "b.npy"),
+                       os.path.join(workdir, "c.npy"), memory_budget=budget)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if peak > budget:
+            raise AssertionError(f"tiled multiply peaked at {peak} bytes, budget {budget}")
 
+        a, b, c = (open_npy(os.path.join(workdir, name)) for name in ("a.npy", "b.npy", "c.npy"))
+        rng = np.random.default_rng(int(seed))
+        i = rng.integers(0, c.shape[0], int(samples))
+        j = rng.integers(0, c.shape[1], int(samples))
+        expected = np.array([a[r] @ b[:, col] for r, col in zip(i, j)])
+        if not np.allclose(c[i, j], expected, atol=float(tolerance)):
+            raise AssertionError("Out-of-core multiply mismatch on sampled entries")
+        report = {"seconds": elapsed, "peak_bytes": peak, "budget_bytes": budget, "operand_bytes": sum(operand_bytes)}
+        logger.info(f"Out-of-core {rows}x{inner} @ {inner}x{cols}: {elapsed:.2f}s, "
+                    f"peak {peak / 2**20:.1f} MiB of {budget / 2**20:.1f} MiB budget, "
+                    f"operands {sum(operand_bytes) / 2**20:.1f} MiB, {samples} entries verified")
+        return report
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,13 @@
+"""ai_matrix: matrix library for week 01."""
+
+from .eigen import lanczos, power_iteration
+from .factorize import FactorCache, cholesky, cond_estimate, lu, qr, solve
+from .linalg import (add, bmm, einsum, get_num_workers, hadamard, matrix_multiply, scale, set_num_workers,
+                     subtract)
+from .matrix import Matrix
+from .outofcore import set_memory_budget, tiled_multiply
+from .sparse import COOMatrix, CSCMatrix, CSRMatrix
+
+__all__ = ["COOMatrix", "CSCMatrix", "CSRMatrix", "FactorCache", "Matrix", "add", "bmm", "cholesky", "cond_estimate",
+           "einsum", "get_num_workers", "hadamard", "lanczos", "lu", "matrix_multiply", "power_iteration", "qr",
+           "scale", "set_memory_budget", "set_num_workers", "solve", "subtract", "tiled_multiply"]
@@ -0,0 +1,102 @@
+"""Iterative eigensolvers for the week 01 matrix library.
+
+- power_iteration(a): dominant eigenpair (largest |lambda|) of a square matrix
+- lanczos(a, k): k extreme eigenvalues of a symmetric matrix from a Krylov basis
+
+Both touch A only through matrix-vector products, so they accept dense arrays,
+Matrix objects and ai_matrix.sparse matrices alike, and cost O(nnz) per step
+instead of the O(n^3) of a full eigendecomposition.
+"""
+
+import numpy as np
+
+from .sparse import SparseMatrix, spmv
+
+LANCZOS_CHECK_EVERY = 10  # steps between Ritz convergence checks
+LANCZOS_INITIAL_ROWS = 32  # basis rows allocated up front; doubled as the iteration needs more
+
+
+def _matvec(a):
+    if isinstance(a, SparseMatrix):
+        if a.shape[0] != a.shape[1]:
+            raise ValueError(f"eigensolvers need a square matrix, got shape {a.shape}")
+        return a.shape[0], lambda x: spmv(a, x)
+    arr = np.asarray(a)
+    if arr.ndim != 2 or arr.shape[0] != arr.shape[1]:
+        raise ValueError(f"eigensolvers need a square matrix, got shape {arr.shape}")
+    return arr.shape[0], arr.__matmul__
+
+
+def power_iteration(a, tol=1e-10, max_iter=1000, seed=0):
+    """Dominant eigenvalue and unit eigenvector; returns (value, vector, iterations).
+
+    Converges at the rate |lambda_2 / lambda_1|; the eigenvalue is the Rayleigh quotient.
+    """
+    n, matvec = _matvec(a)
+    x = np.random.default_rng(seed).standard_normal(n)
+    x /= np.linalg.norm(x)
+    value = 0.0
+    for iteration in range(1, max_iter + 1):
+        y = matvec(x)
+        new_value = float(x @ y)
+        norm = np.linalg.norm(y)
+        if norm == 0:
+            return 0.0, x, iteration
+        y /= norm
+        # Sign-insensitive check so negative dominant eigenvalues converge too
+        if abs(new_value - value) <= tol * max(1.0, abs(new_value)) and min(
+                np.linalg.norm(y - x), np.linalg.norm(y + x)) <= np.sqrt(tol):
+            return new_value, y, iteration
+        x, value = y, new_value
+    return value, x, max_iter
+
+
+def lanczos(a, k=6, which="largest", tol=1e-8, max_steps=None, seed=0):
+    """k eigenvalues of symmetric A ("largest", "smallest" or "both" ends), ascending.
+
+    Grows a Krylov basis with full reorthogonalization until the wanted Ritz values
+    have residual |beta_j * s_j| <= tol * |theta| (or max_steps, default
+    min(n, max(20k, 300)), is reached), then returns them. The basis (steps x n floats)
+    grows by doubling, so memory follows the steps actually taken, not max_steps.
+    """
+    if which not in ("largest", "smallest", "both"):
+        raise ValueError(f"which must be 'largest', 'smallest' or 'both', got {which!r}")
+    n, matvec = _matvec(a)
+    max_steps = min(n, max_steps or max(20 * k, 300))
+    if not 0 < k <= max_steps:
+        raise ValueError(f"k must be between 1 and {max_steps}, got {k}")
+    basis = np.empty((min(max_steps, LANCZOS_INITIAL_ROWS), n))
+    alpha = np.empty(max_steps)
+    beta = np.empty(max_steps)
+    q = np.random.default_rng(seed).standard_normal(n)
+    basis[0] = q / np.linalg.norm(q)
+    for j in range(max_steps):
+        w = matvec(basis[j])
+        alpha[j] = basis[j] @ w
+        # Full reorthogonalization (twice is enough): keeps the Ritz values free of ghost copies
+        for _ in range(2):
+            w -= basis[:j + 1].T @ (basis[:j + 1] @ w)
+        beta[j] = np.linalg.norm(w)
+        m = j + 1
+        # beta ~ 0: invariant subspace found, the Ritz values are exact
+        done = m == max_steps or beta[j] <= 1e-12 * max(1.0, abs(alpha[j]))
+        if done or (m >= k and m % LANCZOS_CHECK_EVERY == 0):
+            ritz, vectors = np.linalg.eigh(np.diag(alpha[:m]) + np.diag(beta[:m - 1], 1)
+                                           + np.diag(beta[:m - 1], -1))
+            wanted = _wanted(min(k, m), m, which)
+            residual = np.abs(beta[j] * vectors[-1, wanted])
+            if done or np.all(residual <= tol * np.maximum(np.abs(ritz[wanted]), 1e-300)):
+                return ritz[wanted]
+        if m == len(basis):
+            grown = np.empty((min(max_steps, 2 * m), n))
+            grown[:m] = basis
+            basis = grown
+        basis[j + 1] = w / beta[j]
+
+
+def _wanted(k, m, which):
+    if which == "largest":
+        return np.arange(m - k, m)
+    if which == "smallest":
+        return np.arange(k)
+    return np.concatenate([np.arange(k // 2), np.arange(m - (k - k // 2), m)])
@@ -0,0 +1,366 @@
+"""Matrix factorizations, cached solvers and a condition-number estimate.
+
+- lu(a): blocked right-looking LU with partial pivoting (P A = L U)
+- cholesky(a): blocked Cholesky (A = L L^T) for symmetric positive definite A
+- qr(a): Householder QR (A = Q R), also used for least squares when A is tall
+- solve(a, b, method=...): factor once, then reuse the factors from a FactorCache
+- cond_estimate(a): 1-norm condition number via Hager/Higham's estimator, using
+  a handful of solves against the cached LU factors instead of an SVD
+
+The blocked kernels factor narrow panels column by column and do the bulk of the
+work, the trailing updates, as NumPy matrix products (BLAS-3). Triangular solves
+and the application of Q are blocked the same way.
+
+Cache keys combine the operand's identity (the object, its data pointer, shape,
+strides and dtype) with its version: Matrix.version is bumped by Matrix writes
+(through the Matrix or any Matrix view of its buffer: they share one counter), by
+ai_matrix functions writing into a Matrix passed as out=, and by Matrix.touch().
+Writes made directly through NumPy views are not seen; call invalidate(a) after
+them, or pass check="content" to add a CRC32 of the data to the key (an O(n^2)
+pass, still far cheaper than refactoring).
+"""
+
+import collections
+import threading
+import weakref
+import zlib
+
+import numpy as np
+
+LU_BLOCK = 64
+CHOLESKY_BLOCK = 64
+QR_BLOCK = 32
+TRIANGULAR_BLOCK = 64
+METHODS = ("lu", "cholesky", "qr")
+
+
+def _square(a, name):
+    a = np.asarray(a)
+    if a.ndim != 2 or a.shape[0] != a.shape[1]:
+        raise ValueError(f"{name} needs a square 2-D matrix, got shape {a.shape}")
+    return a
+
+
+def _float_copy(a):
+    dtype = np.result_type(a.dtype, np.float32)
+    return np.array(a, dtype=dtype, order="C")
+
+
+# -- triangular solves ----------------------------------------------------------
+
+def solve_triangular(t, b, lower=True, unit_diagonal=False):
+    """Solve T x = b for triangular T; b may be a vector or a matrix of right-hand sides."""
+    t = np.asarray(t)
+    b = np.asarray(b)
+    vector = b.ndim == 1
+    x = np.array(b.reshape(b.shape[0], -1), dtype=np.result_type(t, b, np.float32))
+    _trsm(t, x, lower, unit_diagonal)
+    return x.ravel() if vector else x
+
+
+def _trsm(t, x, lower, unit):
+    # In-place blocked substitution: solve one diagonal block, update the rest with a matmul
+    n = t.shape[0]
+    if n <= TRIANGULAR_BLOCK:
+        rows = range(n) if lower else range(n - 1, -1, -1)
+        for i in rows:
+            if lower:
+                if i:
+                    x[i] -= t[i, :i] @ x[:i]
+            elif i + 1 < n:
+                x[i] -= t[i, i + 1:] @ x[i + 1:]
+            if not unit:
+                x[i] /= t[i, i]
+        return
+    h = n // 2
+    if lower:
+        _trsm(t[:h, :h], x[:h], lower, unit)
+        x[h:] -= t[h:, :h] @ x[:h]
+        _trsm(t[h:, h:], x[h:], lower, unit)
+    else:
+        _trsm(t[h:, h:], x[h:], lower, unit)
+        x[:h] -= t[:h, h:] @ x[h:]
+        _trsm(t[:h, :h], x[:h], lower, unit)
+
+
+# -- factorizations -------------------------------------------------------------
+
+class LUFactorization:
+    """P A = L U stored compactly: unit-lower L below the diagonal, U on and above it."""
+    __slots__ = ("lu", "perm")
+
+    def __init__(self, lu, perm):
+        self.lu = lu
+        self.perm = perm
+
+    @property
+    def l(self):
+        return np.tril(self.lu, -1) + np.eye(self.lu.shape[0], dtype=self.lu.dtype)
+
+    @property
+    def u(self):
+        return np.triu(self.lu)
+
+    def solve(self, b):
+        b = np.asarray(b)
+        y = solve_triangular(self.lu, b[self.perm], lower=True, unit_diagonal=True)
+        return solve_triangular(self.lu, y, lower=False)
+
+    def solve_transpose(self, b):
+        # A^T x = b  ->  U^T L^T P x = b
+        b = np.asarray(b)
+        y = solve_triangular(self.lu.T, b, lower=True)
+        z = solve_triangular(self.lu.T, y, lower=False, unit_diagonal=True)
+        x = np.empty_like(z)
+        x[self.perm] = z
+        return x
+
+
+class CholeskyFactorization:
+    """A = L L^T with L lower triangular."""
+    __slots__ = ("l",)
+
+    def __init__(self, l):
+        self.l = l
+
+    def solve(self, b):
+        y = solve_triangular(self.l, b, lower=True)
+        return solve_triangular(self.l.T, y, lower=False)
+
+
+class QRFactorization:
+    """Householder QR: R on and above the diagonal, reflector vectors below it, plus tau."""
+    __slots__ = ("qr", "tau")
+
+    def __init__(self, qr, tau):
+        self.qr = qr
+        self.tau = tau
+
+    @property
+    def r(self):
+        n = self.qr.shape[1]
+        return np.triu(self.qr[:n])
+
+    def _blocks(self):
+        # (row offset, V, T) per panel: the panel's reflectors H_j0 ... H_j1-1 = I - V T V^T
+        for j0 in range(0, len(self.tau), QR_BLOCK):
+            j1 = min(j0 + QR_BLOCK, len(self.tau))
+            v, t = _block_reflector(self.qr[j0:, j0:j1], self.tau[j0:j1])
+            yield j0, v, t
+
+    def apply_qt(self, b):
+        """Q^T b for a vector or matrix b."""
+        b = np.array(b, dtype=np.result_type(self.qr, b))
+        x = b.reshape(b.shape[0], -1)
+        for j0, v, t in self._blocks():
+            x[j0:] -= v @ (t.T @ (v.T @ x[j0:]))
+        return b
+
+    def q(self):
+        """Thin Q (m x n)."""
+        m, n = self.qr.shape
+        q = np.eye(m, n, dtype=self.qr.dtype)
+        for j0, v, t in reversed(list(self._blocks())):
+            q[j0:] -= v @ (t @ (v.T @ q[j0:]))
+        return q
+
+    def solve(self, b):
+        """Least-squares solution of A x = b (exact when A is square and nonsingular)."""
+        n = self.qr.shape[1]
+        qtb = self.apply_qt(b)
+        return solve_triangular(self.qr[:n], qtb[:n], lower=False)
+
+
+def _block_reflector(panel, tau):
+    # Compact WY form (LAPACK dlarft): unit-lower V from the panel and upper-triangular T
+    k = len(tau)
+    v = np.tril(panel[:, :k], -1)
+    v[np.arange(k), np.arange(k)] = 1.0
+    t = np.zeros((k, k), dtype=panel.dtype)
+    for i in range(k):
+        t[i, i] = tau[i]
+        if i:
+            t[:i, i] = -tau[i] * (t[:i, :i] @ (v[:, :i].T @ v[:, i]))
+    return v, t
+
+
+def lu(a):
+    """Blocked LU with partial pivoting; raises np.linalg.LinAlgError if A is singular."""
+    a = _float_copy(_square(a, "lu"))
+    n = a.shape[0]
+    perm = np.arange(n)
+    for j0 in range(0, n, LU_BLOCK):
+        j1 = min(j0 + LU_BLOCK, n)
+        # Panel: unblocked LU of a[j0:, j0:j1] with row swaps applied across the whole matrix
+        for j in range(j0, j1):
+            p = j + int(np.argmax(np.abs(a[j:, j])))
+            if a[p, j] == 0:
+                raise np.linalg.LinAlgError("matrix is singular")
+            if p != j:
+                a[[j, p]] = a[[p, j]]
+                perm[[j, p]] = perm[[p, j]]
+            a[j + 1:, j] /= a[j, j]
+            a[j + 1:, j + 1:j1] -= np.outer(a[j + 1:, j], a[j, j + 1:j1])
+        if j1 < n:
+            # U12 = L11^-1 A12, then the trailing update as one matrix product
+            _trsm(a[j0:j1, j0:j1], a[j0:j1, j1:], lower=True, unit=True)
+            a[j1:, j1:] -= a[j1:, j0:j1] @ a[j0:j1, j1:]
+    return LUFactorization(a, perm)
+
+
+def cholesky(a):
+    """Blocked Cholesky; raises np.linalg.LinAlgError if A is not positive definite."""
+    a = _float_copy(_square(a, "cholesky"))
+    n = a.shape[0]
+    for j0 in range(0, n, CHOLESKY_BLOCK):
+        j1 = min(j0 + CHOLESKY_BLOCK, n)
+        for j in range(j0, j1):
+            d = a[j, j] - a[j, j0:j] @ a[j, j0:j]
+            if d <= 0:
+                raise np.linalg.LinAlgError("matrix is not positive definite")
+            a[j, j] = np.sqrt(d)
+            if j + 1 < j1:
+                a[j + 1:j1, j] = (a[j + 1:j1, j] - a[j + 1:j1, j0:j] @ a[j, j0:j]) / a[j, j]
+        if j1 < n:
+            # L21 = A21 L11^-T, then A22 -= L21 L21^T
+            l21 = solve_triangular(a[j0:j1, j0:j1], a[j1:, j0:j1].T, lower=True).T
+            a[j1:, j0:j1] = l21
+            a[j1:, j1:] -= l21 @ l21.T
+    return CholeskyFactorization(np.tril(a))
+
+
+def qr(a):
+    """Blocked Householder QR of an m x n matrix with m >= n."""
+    a = np.asarray(a)
+    if a.ndim != 2 or a.shape[0] < a.shape[1]:
+        raise ValueError(f"qr needs a 2-D matrix with rows >= columns, got shape {a.shape}")
+    a = _float_copy(a)
+    m, n = a.shape
+    tau = np.zeros(n, dtype=a.dtype)
+    for j0 in range(0, n, QR_BLOCK):
+        j1 = min(j0 + QR_BLOCK, n)
+        # Panel: one reflector per column, applied only inside the panel
+        for j in range(j0, min(j1, m - 1)):
+            x0 = a[j, j]
+            norm = np.linalg.norm(a[j:, j])
+            if norm == 0:
+                continue
+            beta = -np.copysign(norm, x0)
+            tau[j] = (beta - x0) / beta
+            a[j + 1:, j] /= x0 - beta
+            a[j, j] = beta
+            v = a[j:, j].copy()
+            v[0] = 1.0
+            a[j:, j + 1:j1] -= tau[j] * np.outer(v, v @ a[j:, j + 1:j1])
+        if j1 < n:
+            # Trailing columns: A2 -= V T^T V^T A2, two matrix products per panel
+            v, t = _block_reflector(a[j0:, j0:j1], tau[j0:j1])
+            a[j0:, j1:] -= v @ (t.T @ (v.T @ a[j0:, j1:]))
+    return QRFactorization(a, tau)
+
+
+FACTORIZERS = {"lu": lu, "cholesky": cholesky, "qr": qr}
+
+
+# -- cache ------------------------------------------------------------------------
+
+class FactorCache:
+    """LRU of factorizations keyed by operand identity and version."""
+
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(obj, method, check="identity"):
+        arr = np.asarray(obj)
+        key = (method, id(obj), arr.__array_interface__["data"][0], arr.shape, arr.strides, arr.dtype.str,
+               getattr(obj, "version", 0))
+        if check == "content":
+            key += (zlib.crc32(np.ascontiguousarray(arr)),)
+        elif check != "identity":
+            raise ValueError(f"check must be 'identity' or 'content', got {check!r}")
+        return key
+
+    def factor(self, obj, method="lu", check="identity"):
+        if method not in FACTORIZERS:
+            raise ValueError(f"unknown method {method!r}; expected one of {METHODS}")
+        try:
+            ref = weakref.ref(obj)
+        except TypeError:
+            # lists and other non-weakrefable operands: ids can be reused, so never cache
+            return FACTORIZERS[method](obj)
+        key = self.key(obj, method, check)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0]() is obj:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        factors = FACTORIZERS[method](obj)
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = (ref, factors)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return factors
+
+    def invalidate(self, obj):
+        with self.lock:
+            for key in [k for k in self.entries if k[1] == id(obj)]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+
+default_cache = FactorCache()
+
+
+def invalidate(a, cache=None):
+    """Forget cached factors of `a` (after editing it in place through NumPy)."""
+    (cache or default_cache).invalidate(a)
+
+
+def solve(a, b, method="lu", cache=None, check="identity"):
+    """Solve A x = b, factoring A once per cache entry (see FactorCache).
+
+    method: "lu" (general square), "cholesky" (symmetric positive definite) or
+    "qr" (square or tall; least squares). cache=False factors without caching.
+    """
+    if cache is False:
+        factors = FACTORIZERS[method](a)
+    else:
+        factors = (cache or default_cache).factor(a, method, check)
+    return factors.solve(b)
+
+
+def cond_estimate(a, cache=None, check="identity", max_iter=5):
+    """Estimate the 1-norm condition number ||A||_1 ||A^-1||_1 (Hager/Higham).
+
+    Uses the cached LU factors and a few solves, so it costs O(n^2) once A is factored.
+    """
+    arr = _square(a, "cond_estimate")
+    factors = lu(arr) if cache is False else (cache or default_cache).factor(a, "lu", check)
+    n = arr.shape[0]
+    norm_a = np.abs(arr).sum(axis=0).max()
+    x = np.full(n, 1.0 / n)
+    estimate = 0.0
+    for _ in range(max_iter):
+        y = factors.solve(x)
+        new_estimate = np.abs(y).sum()
+        if new_estimate <= estimate:
+            break
+        estimate = new_estimate
+        z = factors.solve_transpose(np.where(y >= 0, 1.0, -1.0))
+        j = int(np.argmax(np.abs(z)))
+        if np.abs(z[j]) <= z @ x:
+            break
+        x = np.zeros(n)
+        x[j] = 1.0
+    return float(norm_a * estimate)
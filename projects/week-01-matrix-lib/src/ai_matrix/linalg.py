@@ -0,0 +1,437 @@
+"""Dense matrix multiply engine for the week 01 matrix library.
+
+matrix_multiply() picks a backend from the operand shapes:
+
+- "numpy": one np.dot call, for small or skinny products where tiling only adds overhead
+- "blocked": cache-blocked kernel; C is computed tile by tile, tiles sized from the L2
+  cache, each tile product running in a vectorized NumPy kernel that blocks for L1
+- "strassen": Strassen recursion for large square-ish products, bottoming out in the
+  blocked kernel once blocks fall below STRASSEN_CUTOFF
+
+Every backend returns a C-contiguous result equal (to rounding) to np.dot(a, b): an
+ndarray, or a Matrix sharing its memory when either operand is an ai_matrix.Matrix.
+Operands are read through zero-copy views, and out= writes the result into an existing
+array or Matrix (including strided views) instead of allocating one.
+
+Parallel mode: with workers > 1 (per call, or set_num_workers() / AI_MATRIX_WORKERS
+for the default) row/tile blocks of the output are dispatched to a shared thread pool.
+Each task runs a NumPy kernel, which releases the GIL, and writes its block in place
+into one preallocated output. When using workers, cap the BLAS library's own threads
+(e.g. OPENBLAS_NUM_THREADS=1) so the two do not oversubscribe the cores.
+"""
+
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .matrix import Matrix
+from .sparse import SparseMatrix
+from .sparse import multiply as sparse_multiply
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("auto", "numpy", "blocked", "strassen")
+DEFAULT_L1_BYTES = 32 * 1024
+DEFAULT_L2_BYTES = 1024 * 1024
+BLOCKED_MIN_DIM = 512  # below this a single np.dot call beats any tiling
+STRASSEN_CUTOFF = 2048  # blocks at or below this size use the blocked kernel
+STRASSEN_MAX_ASPECT = 2.0  # Strassen only pays off on square-ish operands
+ELEMENTWISE_CHUNK = 1 << 16  # elements per task for elementwise ops
+
+_num_workers = int(os.environ.get("AI_MATRIX_WORKERS", "1"))
+
+
+@functools.lru_cache(maxsize=None)
+def cache_sizes():
+    # (L1 data, L2) cache sizes in bytes, from sysfs on Linux or the defaults elsewhere
+    sizes = {}
+    root = "/sys/devices/system/cpu/cpu0/cache"
+    try:
+        for entry in os.listdir(root):
+            if not entry.startswith("index"):
+                continue
+            path = os.path.join(root, entry)
+            with open(os.path.join(path, "level")) as f:
+                level = int(f.read())
+            with open(os.path.join(path, "type")) as f:
+                kind = f.read().strip()
+            with open(os.path.join(path, "size")) as f:
+                size = f.read().strip()
+            if kind == "Instruction":
+                continue
+            scale = {"K": 1024, "M": 1024 * 1024}.get(size[-1:], 1)
+            sizes[level] = int(size.rstrip("KM")) * scale
+    except (OSError, ValueError):
+        pass
+    return sizes.get(1, DEFAULT_L1_BYTES), sizes.get(2, DEFAULT_L2_BYTES)
+
+
+@functools.lru_cache(maxsize=None)
+def tile_size(itemsize):
+    # Edge of a C tile that fills L2. The NumPy (BLAS) kernel run on each tile pair
+    # does its own register/L1 blocking, so larger tiles only cut per-call overhead.
+    _, l2 = cache_sizes()
+    return max(64, int((l2 / itemsize) ** 0.5) // 64 * 64)
+
+
+def set_num_workers(workers):
+    """Default worker count for calls that do not pass `workers` (1 = serial)."""
+    global _num_workers
+    if int(workers) < 1:
+        raise ValueError("workers must be >= 1")
+    _num_workers = int(workers)
+
+
+def get_num_workers():
+    return _num_workers
+
+
+@functools.lru_cache(maxsize=None)
+def _pool(workers):
+    # One long-lived pool per worker count, shared by every call
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ai_matrix")
+
+
+def _resolve_workers(workers):
+    workers = _num_workers if workers is None else int(workers)
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    return workers
+
+
+def _run(tasks, workers):
+    # Runs zero-argument callables, in parallel when workers > 1; re-raises the first error
+    if workers == 1 or len(tasks) == 1:
+        for task in tasks:
+            task()
+        return
+    for future in [_pool(workers).submit(task) for task in tasks]:
+        future.result()
+
+
+def _row_chunks(rows, parts):
+    step = -(-rows // parts)
+    return [(r, min(r + step, rows)) for r in range(0, rows, step)]
+
+
+def _wrap(result, *operands):
+    # Results mirror the operand type: Matrix in, Matrix out (same memory, no copy)
+    if any(isinstance(op, Matrix) for op in operands):
+        return Matrix.from_array(result)
+    return result
+
+
+def _output(out, shape, dtype):
+    # (ndarray to compute into, value to return) for an optional out= argument
+    if out is None:
+        return np.empty(shape, dtype=dtype), None
+    target = np.asarray(out)
+    if target.shape != tuple(shape):
+        raise ValueError(f"out has shape {target.shape}, expected {tuple(shape)}")
+    if not np.can_cast(dtype, target.dtype, casting="same_kind"):
+        raise TypeError(f"cannot write {dtype} results into {target.dtype} out")
+    return target, out
+
+
+def _written(out):
+    # Writes through out= bypass Matrix.__setitem__: bump the version so cached factors
+    # of the old contents (ai_matrix.factorize) are not reused
+    if isinstance(out, Matrix):
+        out.touch()
+    return out
+
+
+def _as_operands(a, b):
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.ndim != 2 or b.ndim != 2:
+        raise ValueError(f"matrix_multiply expects 2-D operands, got {a.ndim}-D and {b.ndim}-D")
+    if a.shape[1] != b.shape[0]:
+        raise ValueError(f"shape mismatch: {a.shape} x {b.shape}")
+    dtype = np.result_type(a, b)
+    return a.astype(dtype, copy=False), b.astype(dtype, copy=False)
+
+
+def select_backend(m, k, n):
+    """Backend "auto" resolves to for an (m x k) @ (k x n) product."""
+    small = min(m, k, n)
+    if small < BLOCKED_MIN_DIM:
+        return "numpy"
+    if small > STRASSEN_CUTOFF and max(m, k, n) <= STRASSEN_MAX_ASPECT * small:
+        return "strassen"
+    return "blocked"
+
+
+def parallel_dot(a, b, workers=None, out=None):
+    """Product split into row panels of A, one task per worker, written into `out`."""
+    workers = _resolve_workers(workers)
+    if out is None:
+        out = np.empty((a.shape[0], b.shape[1]), dtype=np.result_type(a, b))
+    # np.matmul rather than np.dot: it accepts strided (view) outputs
+    if workers == 1 or a.shape[0] < 2 * workers:
+        np.matmul(a, b, out=out)
+        return out
+
+    def task(r0, r1):
+        return lambda: np.matmul(a[r0:r1], b, out=out[r0:r1])
+
+    _run([task(r0, r1) for r0, r1 in _row_chunks(a.shape[0], workers)], workers)
+    return out
+
+
+def blocked_multiply(a, b, out=None, workers=None):
+    """Cache-blocked product; writes into `out` (m x n) when given.
+
+    Each C tile is independent, so with workers > 1 tiles are computed concurrently.
+    """
+    workers = _resolve_workers(workers)
+    m, k = a.shape
+    n = b.shape[1]
+    if out is None:
+        out = np.empty((m, n), dtype=np.result_type(a, b))
+    tile = tile_size(out.itemsize)
+
+    def tile_task(i, j):
+        def run():
+            c = out[i:i + tile, j:j + tile]
+            c[...] = 0
+            buf = np.empty(c.shape, dtype=out.dtype)
+            for p in range(0, k, tile):
+                # Vectorized inner kernel: one NumPy product per tile pair, accumulated in place
+                np.matmul(a[i:i + tile, p:p + tile], b[p:p + tile, j:j + tile], out=buf)
+                c += buf
+        return run
+
+    _run([tile_task(i, j) for i in range(0, m, tile) for j in range(0, n, tile)], workers)
+    return out
+
+
+def _strassen(a, b, cutoff, workers):
+    m, k = a.shape
+    n = b.shape[1]
+    if min(m, k, n) <= cutoff or m % 2 or k % 2 or n % 2:
+        return blocked_multiply(a, b, workers=workers)
+    hm, hk, hn = m // 2, k // 2, n // 2
+    a11, a12, a21, a22 = a[:hm, :hk], a[:hm, hk:], a[hm:, :hk], a[hm:, hk:]
+    b11, b12, b21, b22 = b[:hk, :hn], b[:hk, hn:], b[hk:, :hn], b[hk:, hn:]
+
+    m1 = _strassen(a11 + a22, b11 + b22, cutoff, workers)
+    m2 = _strassen(a21 + a22, b11, cutoff, workers)
+    m3 = _strassen(a11, b12 - b22, cutoff, workers)
+    m4 = _strassen(a22, b21 - b11, cutoff, workers)
+    m5 = _strassen(a11 + a12, b22, cutoff, workers)
+    m6 = _strassen(a21 - a11, b11 + b12, cutoff, workers)
+    m7 = _strassen(a12 - a22, b21 + b22, cutoff, workers)
+
+    c = np.empty((m, n), dtype=m1.dtype)
+    np.add(m1, m4, out=c[:hm, :hn])
+    c[:hm, :hn] -= m5
+    c[:hm, :hn] += m7
+    np.add(m3, m5, out=c[:hm, hn:])
+    np.add(m2, m4, out=c[hm:, :hn])
+    np.subtract(m1, m2, out=c[hm:, hn:])
+    c[hm:, hn:] += m3
+    c[hm:, hn:] += m6
+    return c
+
+
+def strassen_multiply(a, b, cutoff=STRASSEN_CUTOFF, workers=None, out=None):
+    """Strassen product; each dimension is zero-padded so it stays even for every halving above `cutoff`."""
+    m, k = a.shape
+    n = b.shape[1]
+    levels = 0
+    while min(m, k, n) > cutoff * (1 << levels):
+        levels += 1
+    step = 1 << levels
+    pm, pk, pn = (-(-d // step) * step for d in (m, k, n))
+    if (pm, pk, pn) != (m, k, n):
+        a_p = np.zeros((pm, pk), dtype=a.dtype)
+        b_p = np.zeros((pk, pn), dtype=b.dtype)
+        a_p[:m, :k] = a
+        b_p[:k, :n] = b
+        a, b = a_p, b_p
+    c = _strassen(a, b, cutoff, _resolve_workers(workers))
+    if out is not None:
+        out[...] = c[:m, :n]
+        return out
+    return np.ascontiguousarray(c[:m, :n])
+
+
+def matrix_multiply(a, b, backend="auto", workers=None, out=None):
+    """Return a @ b for 2-D operands (ndarrays, Matrix objects or nested lists).
+
+    If either operand is an ai_matrix.sparse matrix the product is sparse-aware
+    (see ai_matrix.sparse.multiply) and backend/workers are ignored.
+
+    backend is one of BACKENDS; "auto" chooses by shape (see select_backend).
+    workers: threads to spread the product over (default: get_num_workers()).
+    out: array or Matrix to write the result into; it must not overlap a or b.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}; expected one of {BACKENDS}")
+    if isinstance(a, SparseMatrix) or isinstance(b, SparseMatrix):
+        if out is not None:
+            raise ValueError("out= is not supported for sparse operands")
+        return sparse_multiply(a, b)
+    operands = (a, b)
+    a, b = _as_operands(a, b)
+    workers = _resolve_workers(workers)
+    target, returned = _output(out, (a.shape[0], b.shape[1]), a.dtype)
+    if backend == "auto":
+        backend = select_backend(a.shape[0], a.shape[1], b.shape[1])
+    logger.debug("matrix_multiply %s x %s via %s, %d worker(s)", a.shape, b.shape, backend, workers)
+    if backend == "numpy":
+        parallel_dot(a, b, workers, out=target)
+    elif backend == "blocked":
+        blocked_multiply(a, b, out=target, workers=workers)
+    else:
+        strassen_multiply(a, b, workers=workers, out=target)
+    return _written(returned) if returned is not None else _wrap(target, *operands)
+
+
+def bmm(a, b, workers=None, out=None):
+    """Batched matmul: stacks (..., M, K) x (..., K, N) -> (..., M, N) in one call.
+
+    Leading (batch) dimensions broadcast NumPy-style, so a 2-D operand is shared by
+    every matrix in the other stack. With workers > 1 the batch is split into chunks.
+    """
+    operands = (a, b)
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.ndim < 2 or b.ndim < 2:
+        raise ValueError(f"bmm expects operands with at least 2 dimensions, got {a.ndim}-D and {b.ndim}-D")
+    if a.shape[-1] != b.shape[-2]:
+        raise ValueError(f"shape mismatch: {a.shape} x {b.shape}")
+    batch = np.broadcast_shapes(a.shape[:-2], b.shape[:-2])
+    shape = batch + (a.shape[-2], b.shape[-1])
+    target, returned = _output(out, shape, np.result_type(a, b))
+    workers = _resolve_workers(workers)
+    if workers == 1 or not batch or batch[0] < 2 * workers:
+        np.matmul(a, b, out=target)
+    else:
+        a_b = np.broadcast_to(a, batch + a.shape[-2:])
+        b_b = np.broadcast_to(b, batch + b.shape[-2:])
+
+        def task(i0, i1):
+            return lambda: np.matmul(a_b[i0:i1], b_b[i0:i1], out=target[i0:i1])
+
+        _run([task(i0, i1) for i0, i1 in _row_chunks(batch[0], workers)], workers)
+    if returned is not None:
+        return _written(returned)
+    return _wrap(target, *operands) if target.ndim == 2 else target
+
+
+@functools.lru_cache(maxsize=256)
+def _contraction_plan(spec, a_ndim, b_ndim):
+    # Lowers "ab..,cd..->.." for two operands to one batched matmul:
+    # (batch, a_free, contracted) x (batch, contracted, b_free)
+    spec = spec.replace(" ", "")
+    if "->" not in spec:
+        raise ValueError(f"einsum spec needs an explicit output: {spec!r}")
+    inputs, output = spec.split("->")
+    terms = inputs.split(",")
+    if len(terms) != 2:
+        raise ValueError(f"einsum supports exactly two operands: {spec!r}")
+    a_idx, b_idx = terms
+    for term in (a_idx, b_idx, output):
+        if (term and not term.isalpha()) or len(set(term)) != len(term):
+            raise ValueError(f"einsum indices must be distinct letters per term (no ellipsis, traces or "
+                             f"diagonals): {spec!r}")
+    if (len(a_idx), len(b_idx)) != (a_ndim, b_ndim):
+        raise ValueError(f"spec {spec!r} does not match operand dimensions {a_ndim} and {b_ndim}")
+    if set(output) - set(a_idx) - set(b_idx):
+        raise ValueError(f"output index not found in inputs: {spec!r}")
+
+    batch = [i for i in output if i in a_idx and i in b_idx]
+    a_free = [i for i in output if i in a_idx and i not in b_idx]
+    b_free = [i for i in output if i in b_idx and i not in a_idx]
+    contracted = [i for i in a_idx if i in b_idx and i not in output]
+    # indices in one operand only and not in the output are summed out first
+    a_sum = tuple(a_idx.index(i) for i in a_idx if i not in b_idx and i not in output)
+    b_sum = tuple(b_idx.index(i) for i in b_idx if i not in a_idx and i not in output)
+    a_kept = [i for i in a_idx if i in b_idx or i in output]
+    b_kept = [i for i in b_idx if i in a_idx or i in output]
+    a_perm = tuple(a_kept.index(i) for i in batch + a_free + contracted)
+    b_perm = tuple(b_kept.index(i) for i in batch + contracted + b_free)
+    produced = batch + a_free + b_free
+    out_perm = tuple(produced.index(i) for i in output)
+    return a_sum, b_sum, a_perm, b_perm, len(batch), len(a_free), len(b_free), out_perm
+
+
+def einsum(spec, a, b):
+    """Restricted einsum for two operands, executed as a single batched matmul.
+
+    spec: explicit form such as "bhqd,bhkd->bhqk" or "ij,jk->ik". Each term uses
+    distinct letters (no "...", traces or diagonals). Indices shared by both operands
+    and the output are batch dimensions, shared indices missing from the output are
+    contracted, and indices found in one operand only are either kept or summed out.
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    a_sum, b_sum, a_perm, b_perm, n_batch, n_a, n_b, out_perm = _contraction_plan(spec, a.ndim, b.ndim)
+    if a_sum:
+        a = a.sum(axis=a_sum)
+    if b_sum:
+        b = b.sum(axis=b_sum)
+    a = a.transpose(a_perm)
+    b = b.transpose(b_perm)
+    batch_shape = np.broadcast_shapes(a.shape[:n_batch], b.shape[:n_batch])
+    a_free_shape = a.shape[n_batch:n_batch + n_a]
+    b_free_shape = b.shape[n_batch + (b.ndim - n_batch - n_b):]
+    k_shape = a.shape[n_batch + n_a:]
+    if k_shape != b.shape[n_batch:n_batch + len(k_shape)]:
+        raise ValueError(f"contracted dimensions differ: {k_shape} vs {b.shape[n_batch:n_batch + len(k_shape)]}")
+    k = int(np.prod(k_shape, dtype=np.int64))
+    a3 = a.reshape(a.shape[:n_batch] + (int(np.prod(a_free_shape, dtype=np.int64)), k))
+    b3 = b.reshape(b.shape[:n_batch] + (k, int(np.prod(b_free_shape, dtype=np.int64))))
+    result = np.matmul(a3, b3)
+    return result.reshape(batch_shape + a_free_shape + b_free_shape).transpose(out_perm)
+
+
+def _elementwise(ufunc, a, b, workers, out):
+    operands = (a, b)
+    a = np.asarray(a)
+    b = np.asarray(b)
+    shape = np.broadcast_shapes(a.shape, b.shape)
+    target, returned = _output(out, shape, np.result_type(a, b))
+    workers = _resolve_workers(workers)
+    if workers == 1 or target.size < 2 * ELEMENTWISE_CHUNK or not shape:
+        ufunc(a, b, out=target)
+    else:
+        # Split along the first axis; broadcast operands are sliced only where they vary
+        rows = shape[0]
+        parts = min(rows, max(workers, target.size // ELEMENTWISE_CHUNK))
+        a_b = np.broadcast_to(a, shape)
+        b_b = np.broadcast_to(b, shape)
+
+        def task(r0, r1):
+            return lambda: ufunc(a_b[r0:r1], b_b[r0:r1], out=target[r0:r1])
+
+        _run([task(r0, r1) for r0, r1 in _row_chunks(rows, parts)], workers)
+    return _written(returned) if returned is not None else _wrap(target, *operands)
+
+
+def add(a, b, workers=None, out=None):
+    """Elementwise a + b (broadcasting), parallel over row blocks."""
+    return _elementwise(np.add, a, b, workers, out)
+
+
+def subtract(a, b, workers=None, out=None):
+    """Elementwise a - b (broadcasting), parallel over row blocks."""
+    return _elementwise(np.subtract, a, b, workers, out)
+
+
+def hadamard(a, b, workers=None, out=None):
+    """Elementwise a * b (broadcasting), parallel over row blocks."""
+    return _elementwise(np.multiply, a, b, workers, out)
+
+
+def scale(a, alpha, workers=None, out=None):
+    """alpha * a, parallel over row blocks. A Python-number alpha keeps a's dtype (like alpha * a)."""
+    if isinstance(alpha, (int, float, complex)):
+        dtype = np.asarray(a).dtype
+        alpha = np.asarray(alpha, dtype=np.result_type(dtype, alpha))
+    return _elementwise(np.multiply, a, alpha, workers, out)
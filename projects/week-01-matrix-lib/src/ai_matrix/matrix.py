@@ -0,0 +1,197 @@
+"""Strided 2-D Matrix type for the week 01 matrix library.
+
+A Matrix is a (buffer, dtype, shape, strides, offset) record over one flat,
+contiguous byte buffer. Transpose, row/column selection and slicing only compute
+new strides and an offset, so they are O(1) and share the buffer with the parent:
+writes through a view are visible everywhere.
+
+NumPy sees a Matrix through __array__, which builds an ndarray directly on the
+buffer (buffer protocol, no copy), so np.asarray(m), np.dot(m, x) and every
+ai_matrix.linalg function work on Matrix operands without copying them. linalg
+results come back as Matrix objects when an operand is a Matrix, and ops accept
+out= so chained expressions can reuse one result buffer.
+"""
+
+import numpy as np
+
+
+class Matrix:
+    __slots__ = ("buffer", "dtype", "shape", "strides", "offset", "_versions", "__weakref__")
+
+    def __init__(self, buffer, shape, dtype=np.float64, strides=None, offset=0, versions=None):
+        # buffer: any writable contiguous buffer (bytearray, memoryview, ndarray, mmap)
+        self.buffer = memoryview(buffer).cast("B")
+        self.dtype = np.dtype(dtype)
+        self.shape = (int(shape[0]), int(shape[1]))
+        itemsize = self.dtype.itemsize
+        self.strides = tuple(strides) if strides is not None else (self.shape[1] * itemsize, itemsize)
+        self.offset = int(offset)
+        # Write counter shared by every view of the buffer (T, slices, rows, columns), so a
+        # write through any of them changes the version of all; see the version property
+        self._versions = versions if versions is not None else [0]
+
+    # -- construction ------------------------------------------------------
+
+    @classmethod
+    def zeros(cls, rows, cols, dtype=np.float64):
+        dtype = np.dtype(dtype)
+        return cls(bytearray(int(rows) * int(cols) * dtype.itemsize), (rows, cols), dtype)
+
+    @classmethod
+    def empty(cls, rows, cols, dtype=np.float64):
+        return cls(np.empty(int(rows) * int(cols), dtype=dtype), (rows, cols), dtype)
+
+    @classmethod
+    def from_array(cls, array, copy=False):
+        """Wrap a 2-D array-like; C- or F-contiguous ndarrays are wrapped without copying."""
+        if isinstance(array, Matrix):
+            return array.copy() if copy else array
+        array = np.asarray(array)
+        if array.ndim == 1:
+            array = array.reshape(1, -1)
+        if array.ndim != 2:
+            raise ValueError(f"Matrix needs a 2-D array, got {array.ndim}-D")
+        if copy or not (array.flags.c_contiguous or array.flags.f_contiguous):
+            array = np.array(array, order="C")
+        if not array.flags.writeable:
+            array = array.copy()
+        if array.flags.c_contiguous:
+            return cls(array, array.shape, array.dtype)
+        # F-contiguous: its transpose is C-contiguous over the same memory
+        return cls(array.T, array.T.shape, array.dtype).T
+
+    def copy(self):
+        """A contiguous copy with its own buffer."""
+        return Matrix.from_array(np.array(self.numpy(), order="C"))
+
+    # -- NumPy interop -----------------------------------------------------
+
+    def numpy(self):
+        """ndarray view of this Matrix (shares memory)."""
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=self.buffer, offset=self.offset,
+                          strides=self.strides)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.numpy(), dtype=dtype, copy=True)
+        view = self.numpy()
+        return view if dtype is None or np.dtype(dtype) == self.dtype else view.astype(dtype)
+
+    # -- views ---------------------------------------------------------------
+
+    @property
+    def T(self):
+        return Matrix(self.buffer, self.shape[::-1], self.dtype, self.strides[::-1], self.offset, self._versions)
+
+    def transpose(self):
+        return self.T
+
+    def _view(self, rows, cols):
+        # rows/cols: (start, step, length) along each axis
+        (r0, rstep, rlen), (c0, cstep, clen) = rows, cols
+        offset = self.offset + r0 * self.strides[0] + c0 * self.strides[1]
+        strides = (self.strides[0] * rstep, self.strides[1] * cstep)
+        return Matrix(self.buffer, (rlen, clen), self.dtype, strides, offset, self._versions)
+
+    @staticmethod
+    def _axis(key, size):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(size)
+            return start, step, len(range(start, stop, step))
+        index = int(key)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(f"index {key} out of range for size {size}")
+        return index, 1, None
+
+    def __getitem__(self, key):
+        # m[i, j] -> scalar; m[i] / m[i, :] -> 1 x n row view; m[:, j] -> m x 1 column view
+        if not isinstance(key, tuple):
+            key = (key, slice(None))
+        rows = self._axis(key[0], self.shape[0])
+        cols = self._axis(key[1], self.shape[1])
+        if rows[2] is None and cols[2] is None:
+            return self.numpy()[rows[0], cols[0]]
+        rows = rows if rows[2] is not None else (rows[0], 1, 1)
+        cols = cols if cols[2] is not None else (cols[0], 1, 1)
+        return self._view(rows, cols)
+
+    def __setitem__(self, key, value):
+        # Same indexing as __getitem__: rows and columns are 1 x n / m x 1 views
+        target = self[key]
+        if isinstance(target, Matrix):
+            target.numpy()[...] = np.asarray(value)
+        else:
+            self.numpy()[key] = value
+        self.touch()
+
+    @property
+    def version(self):
+        """Write count of the buffer; part of ai_matrix.factorize cache keys."""
+        return self._versions[0]
+
+    def touch(self):
+        """Mark this Matrix and its views as modified (after writing to it through a NumPy view)."""
+        self._versions[0] += 1
+
+    def row(self, i):
+        return self[i, :]
+
+    def col(self, j):
+        return self[:, j]
+
+    def submatrix(self, r0, r1, c0, c1):
+        return self[r0:r1, c0:c1]
+
+    # -- properties ----------------------------------------------------------
+
+    @property
+    def size(self):
+        return self.shape[0] * self.shape[1]
+
+    @property
+    def is_contiguous(self):
+        return self.strides == (self.shape[1] * self.dtype.itemsize, self.dtype.itemsize)
+
+    def shares_memory(self, other):
+        return np.shares_memory(self.numpy(), np.asarray(other))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return f"Matrix(shape={self.shape}, dtype={self.dtype}, strides={self.strides}, offset={self.offset})"
+
+    def tolist(self):
+        return self.numpy().tolist()
+
+    # -- arithmetic (delegates to ai_matrix.linalg) ------------------------------
+
+    def __matmul__(self, other):
+        from .linalg import matrix_multiply
+        return matrix_multiply(self, other)
+
+    def __rmatmul__(self, other):
+        from .linalg import matrix_multiply
+        return matrix_multiply(other, self)
+
+    def __add__(self, other):
+        from .linalg import add
+        return add(self, other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        from .linalg import subtract
+        return subtract(self, other)
+
+    def __rsub__(self, other):
+        from .linalg import subtract
+        return subtract(other, self)
+
+    def __mul__(self, other):
+        from .linalg import hadamard
+        return hadamard(self, other)
+
+    __rmul__ = __mul__
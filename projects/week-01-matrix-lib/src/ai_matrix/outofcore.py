@@ -0,0 +1,160 @@
+"""Out-of-core (memory-mapped) matrices for the week 01 matrix library.
+
+Matrices too large for RAM live in .npy files and are opened as np.memmap arrays,
+so only the pages that are touched are read. Everything here works in tiles
+whose total size stays under a memory budget:
+
+- create_npy / open_npy: make or open a .npy-backed memmap
+- random_npy: fill a new .npy file with random values in row chunks
+- tiled_multiply(a, b, out): blocked A @ B that streams tiles of A and B from
+  disk, accumulates each C tile in RAM and writes it to `out` (a memmap or a
+  .npy path) before moving on
+
+The budget is per call (memory_budget=) with a default from set_memory_budget()
+or AI_MATRIX_MEMORY_BUDGET (bytes, or with a K/M/G suffix). It covers the arrays
+this module allocates; pages of the mapped files themselves belong to the OS
+page cache, which the kernel can reclaim.
+"""
+
+import logging
+import os
+
+import numpy as np
+
+from .matrix import Matrix
+
+logger = logging.getLogger(__name__)
+
+TILE_ALIGN = 64  # tile edges are rounded down to a multiple of this when large enough
+
+
+def parse_bytes(value):
+    """256, "256K", "64M" or "2G" -> bytes."""
+    text = str(value).strip().upper().removesuffix("B")
+    scale = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}.get(text[-1:], 1)
+    return int(float(text.rstrip("KMG")) * scale)
+
+
+_memory_budget = parse_bytes(os.environ.get("AI_MATRIX_MEMORY_BUDGET", "256M"))
+
+
+def set_memory_budget(budget):
+    """Default memory budget (bytes or "64M"-style) for calls that do not pass one."""
+    global _memory_budget
+    budget = parse_bytes(budget)
+    if budget <= 0:
+        raise ValueError("memory budget must be positive")
+    _memory_budget = budget
+
+
+def get_memory_budget():
+    return _memory_budget
+
+
+def _resolve_budget(memory_budget):
+    return _memory_budget if memory_budget is None else parse_bytes(memory_budget)
+
+
+def create_npy(path, shape, dtype=np.float64):
+    """New .npy file of the given shape, opened read-write as a memmap (contents unset)."""
+    return np.lib.format.open_memmap(os.fspath(path), mode="w+", dtype=np.dtype(dtype),
+                                     shape=tuple(int(s) for s in shape))
+
+
+def open_npy(path, mode="r"):
+    """Existing .npy file as a memmap ("r" read-only, "r+" read-write, "c" copy-on-write)."""
+    return np.load(os.fspath(path), mmap_mode=mode)
+
+
+def _operand(x):
+    # Paths open as read-only memmaps; Matrix and ndarray operands are used as-is
+    if isinstance(x, (str, os.PathLike)):
+        return open_npy(x)
+    if isinstance(x, Matrix):
+        return x.numpy()
+    return np.asarray(x)
+
+
+def random_npy(path, rows, cols, seed=None, dtype=np.float64, memory_budget=None):
+    """Standard-normal matrix written to `path` in row chunks that fit the budget.
+
+    The values match np.random.default_rng(seed).standard_normal((rows, cols)) for
+    float64, whatever the chunk size.
+    """
+    out = create_npy(path, (rows, cols), dtype)
+    rng = np.random.default_rng(seed)
+    rows, cols = out.shape
+    # float64 draws plus the cast copy when dtype is narrower
+    chunk = max(1, _resolve_budget(memory_budget) // max(1, cols * (8 + out.itemsize)))
+    for r0 in range(0, rows, chunk):
+        r1 = min(r0 + chunk, rows)
+        out[r0:r1] = rng.standard_normal((r1 - r0, cols))
+    out.flush()
+    return out
+
+
+def tile_shape(m, k, n, itemsize, memory_budget=None):
+    """(tm, tk, tn) for tiled_multiply under the budget.
+
+    A tile pass holds an A tile (tm x tk), a B tile (tk x tn), the C accumulator and
+    one product buffer (tm x tn each): itemsize * (tm*tk + tk*tn + 2*tm*tn) bytes.
+    """
+    budget = _resolve_budget(memory_budget)
+    edge = int((budget / (5 * itemsize)) ** 0.5)
+    if edge < 1:
+        raise ValueError(f"memory budget of {budget} bytes is too small for a single tile")
+    if edge >= 2 * TILE_ALIGN:
+        edge = edge // TILE_ALIGN * TILE_ALIGN
+    return min(edge, m), min(edge, k), min(edge, n)
+
+
+def tiled_multiply(a, b, out=None, memory_budget=None):
+    """A @ B streaming tiles from memmapped (or in-memory) operands.
+
+    a, b: .npy paths, memmaps, ndarrays or Matrix objects. out: a .npy path (created),
+    or an existing m x n array/memmap to write into; None allocates the result in RAM.
+    Returns the output array (a memmap when out is a path or a memmap).
+    """
+    a = _operand(a)
+    b = _operand(b)
+    if a.ndim != 2 or b.ndim != 2:
+        raise ValueError(f"tiled_multiply expects 2-D operands, got {a.ndim}-D and {b.ndim}-D")
+    if a.shape[1] != b.shape[0]:
+        raise ValueError(f"shape mismatch: {a.shape} x {b.shape}")
+    m, k = a.shape
+    n = b.shape[1]
+    dtype = np.result_type(a, b)
+    returned = out
+    if isinstance(out, (str, os.PathLike)):
+        out = returned = create_npy(out, (m, n), dtype)
+    elif out is None:
+        out = returned = np.empty((m, n), dtype=dtype)
+    elif out.shape != (m, n):
+        raise ValueError(f"out has shape {out.shape}, expected {(m, n)}")
+    elif isinstance(out, Matrix):
+        out = out.numpy()
+    tm, tk, tn = tile_shape(m, k, n, dtype.itemsize, memory_budget)
+    logger.info("Tiled multiply %s x %s with %dx%dx%d tiles", a.shape, b.shape, tm, tk, tn)
+
+    acc = np.empty((tm, tn), dtype=dtype)
+    product = np.empty((tm, tn), dtype=dtype)
+    for i0 in range(0, m, tm):
+        i1 = min(i0 + tm, m)
+        for j0 in range(0, n, tn):
+            j1 = min(j0 + tn, n)
+            c = acc[:i1 - i0, :j1 - j0]
+            c[...] = 0
+            for k0 in range(0, k, tk):
+                k1 = min(k0 + tk, k)
+                # Explicit copies keep the resident working set to one tile of each operand
+                a_tile = np.array(a[i0:i1, k0:k1], dtype=dtype)
+                b_tile = np.array(b[k0:k1, j0:j1], dtype=dtype)
+                np.matmul(a_tile, b_tile, out=product[:i1 - i0, :j1 - j0])
+                c += product[:i1 - i0, :j1 - j0]
+                del a_tile, b_tile
+            out[i0:i1, j0:j1] = c
+    if isinstance(out, np.memmap):
+        out.flush()
+    if isinstance(returned, Matrix):
+        returned.touch()  # drop factorizations cached for the old contents
+    return returned
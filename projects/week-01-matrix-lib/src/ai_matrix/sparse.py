@@ -0,0 +1,304 @@
+"""Sparse matrices (COO, CSR, CSC) for the week 01 matrix library.
+
+All three formats are built and converted with vectorized NumPy operations on the
+index arrays; there are no per-element Python loops.
+
+- COOMatrix(data, row, col, shape): triplets; duplicates are summed on conversion
+- CSRMatrix(data, indices, indptr, shape): row-compressed; fast SpMV / SpMM
+- CSCMatrix(data, indices, indptr, shape): column-compressed; the transpose of a
+  CSR matrix is the CSC matrix over the same three arrays (and vice versa), so .T
+  never copies
+
+Products (also reachable through ai_matrix.linalg.matrix_multiply and @):
+sparse x vector, sparse x dense and sparse x sparse; dense x sparse is computed as
+(sparse.T x dense.T).T.
+"""
+
+import numpy as np
+
+from .matrix import Matrix
+
+
+def _index_dtype(*sizes):
+    return np.int32 if max(sizes, default=0) < np.iinfo(np.int32).max else np.int64
+
+
+class SparseMatrix:
+    """Common interface of the three formats."""
+    __slots__ = ("data", "shape")
+    format = None
+
+    @property
+    def nnz(self):
+        return int(self.data.size)
+
+    @property
+    def density(self):
+        cells = self.shape[0] * self.shape[1]
+        return self.nnz / cells if cells else 0.0
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def dense_nbytes(self):
+        return self.shape[0] * self.shape[1] * self.data.itemsize
+
+    def toarray(self):
+        coo = self.tocoo()
+        out = np.zeros(self.shape, dtype=self.dtype)
+        np.add.at(out, (coo.row, coo.col), coo.data)
+        return out
+
+    def todense(self):
+        return Matrix.from_array(self.toarray())
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.toarray()
+        return dense if dtype is None else dense.astype(dtype)
+
+    def __matmul__(self, other):
+        return multiply(self, other)
+
+    def __rmatmul__(self, other):
+        return multiply(other, self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(shape={self.shape}, nnz={self.nnz}, dtype={self.dtype})"
+
+
+class COOMatrix(SparseMatrix):
+    __slots__ = ("row", "col")
+    format = "coo"
+
+    def __init__(self, data, row, col, shape):
+        self.data = np.asarray(data)
+        itype = _index_dtype(*shape)
+        self.row = np.asarray(row, dtype=itype)
+        self.col = np.asarray(col, dtype=itype)
+        self.shape = (int(shape[0]), int(shape[1]))
+        if not (self.data.shape == self.row.shape == self.col.shape):
+            raise ValueError("data, row and col must have the same length")
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.row.nbytes + self.col.nbytes
+
+    @property
+    def T(self):
+        return COOMatrix(self.data, self.col, self.row, self.shape[::-1])
+
+    def tocoo(self):
+        return self
+
+    def tocsr(self):
+        return CSRMatrix(*_compress(self.row, self.col, self.data, self.shape[0], self.shape[1]), self.shape)
+
+    def tocsc(self):
+        data, indices, indptr = _compress(self.col, self.row, self.data, self.shape[1], self.shape[0])
+        return CSCMatrix(data, indices, indptr, self.shape)
+
+
+class _Compressed(SparseMatrix):
+    # CSR and CSC share storage: compressed "major" axis (indptr), "minor" indices
+    __slots__ = ("indices", "indptr")
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data)
+        itype = _index_dtype(*shape, len(self.data))
+        self.indices = np.asarray(indices, dtype=itype)
+        self.indptr = np.asarray(indptr, dtype=itype)
+        self.shape = (int(shape[0]), int(shape[1]))
+        if self.indptr.size != self._major_size() + 1 or self.indptr[-1] != self.data.size:
+            raise ValueError("indptr does not match shape / nnz")
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.indices.nbytes + self.indptr.nbytes
+
+    def _major_index(self):
+        # Major-axis coordinate of every stored entry
+        return np.repeat(np.arange(self._major_size(), dtype=self.indices.dtype), np.diff(self.indptr))
+
+
+class CSRMatrix(_Compressed):
+    __slots__ = ()
+    format = "csr"
+
+    def _major_size(self):
+        return self.shape[0]
+
+    @property
+    def T(self):
+        return CSCMatrix(self.data, self.indices, self.indptr, self.shape[::-1])
+
+    def tocoo(self):
+        return COOMatrix(self.data, self._major_index(), self.indices, self.shape)
+
+    def tocsr(self):
+        return self
+
+    def tocsc(self):
+        return self.tocoo().tocsc()
+
+
+class CSCMatrix(_Compressed):
+    __slots__ = ()
+    format = "csc"
+
+    def _major_size(self):
+        return self.shape[1]
+
+    @property
+    def T(self):
+        return CSRMatrix(self.data, self.indices, self.indptr, self.shape[::-1])
+
+    def tocoo(self):
+        return COOMatrix(self.data, self.indices, self._major_index(), self.shape)
+
+    def tocsr(self):
+        return self.tocoo().tocsr()
+
+    def tocsc(self):
+        return self
+
+
+def _compress(major, minor, data, n_major, n_minor):
+    # Sorts triplets by (major, minor), sums duplicates and builds indptr
+    itype = _index_dtype(n_major, n_minor, len(data))
+    order = np.lexsort((minor, major))
+    major, minor, data = major[order], minor[order], data[order]
+    if major.size:
+        keep = np.empty(major.size, dtype=bool)
+        keep[0] = True
+        np.logical_or(major[1:] != major[:-1], minor[1:] != minor[:-1], out=keep[1:])
+        if not keep.all():
+            starts = np.flatnonzero(keep)
+            data = np.add.reduceat(data, starts)
+            major, minor = major[starts], minor[starts]
+    indptr = np.zeros(n_major + 1, dtype=itype)
+    np.cumsum(np.bincount(major, minlength=n_major), out=indptr[1:])
+    return data, minor.astype(itype, copy=False), indptr
+
+
+# -- construction ---------------------------------------------------------------
+
+def coo_matrix(data, row, col, shape):
+    return COOMatrix(data, row, col, shape)
+
+
+def csr_matrix(data, row, col, shape):
+    """CSR from (data, row, col) index arrays; duplicate entries are summed."""
+    return COOMatrix(data, row, col, shape).tocsr()
+
+
+def csc_matrix(data, row, col, shape):
+    """CSC from (data, row, col) index arrays; duplicate entries are summed."""
+    return COOMatrix(data, row, col, shape).tocsc()
+
+
+def from_dense(array, fmt="csr"):
+    array = np.asarray(array)
+    row, col = np.nonzero(array)
+    return convert(COOMatrix(array[row, col], row, col, array.shape), fmt)
+
+
+def convert(matrix, fmt):
+    return {"coo": matrix.tocoo, "csr": matrix.tocsr, "csc": matrix.tocsc}[fmt]()
+
+
+def random(rows, cols, density, seed=None, fmt="csr", dtype=np.float64):
+    """Random sparse matrix with round(density * rows * cols) distinct standard-normal entries
+    (for complex dtypes, real and imaginary parts are both standard normal)."""
+    rng = np.random.default_rng(seed)
+    cells = int(rows) * int(cols)
+    nnz = int(round(density * cells))
+    flat = rng.choice(cells, size=nnz, replace=False) if nnz else np.empty(0, dtype=np.int64)
+    row, col = np.divmod(flat, int(cols))
+    data = rng.standard_normal(nnz)
+    if np.dtype(dtype).kind == "c":
+        data = data + 1j * rng.standard_normal(nnz)
+    data = data.astype(dtype, copy=False)
+    return convert(COOMatrix(data, row, col, (rows, cols)), fmt)
+
+
+# -- products -------------------------------------------------------------------
+
+def _scatter_sum(index, weights, size):
+    # out[i] = sum of weights[index == i]; bincount only takes real weights, so complex
+    # products are summed as real and imaginary parts
+    if np.iscomplexobj(weights):
+        return (np.bincount(index, weights=weights.real, minlength=size)
+                + 1j * np.bincount(index, weights=weights.imag, minlength=size))
+    return np.bincount(index, weights=weights, minlength=size)
+
+
+def spmv(matrix, x):
+    """Sparse matrix-vector product; returns a 1-D ndarray."""
+    x = np.asarray(x).ravel()
+    if x.size != matrix.shape[1]:
+        raise ValueError(f"shape mismatch: {matrix.shape} x ({x.size},)")
+    dtype = np.result_type(matrix.data, x)
+    if isinstance(matrix, CSCMatrix):
+        return _scatter_sum(matrix.indices, matrix.data * x[matrix._major_index()],
+                            matrix.shape[0]).astype(dtype, copy=False)
+    csr = matrix.tocsr()
+    products = csr.data * x[csr.indices]
+    return _scatter_sum(csr._major_index(), products, csr.shape[0]).astype(dtype, copy=False)
+
+
+def spmm(matrix, dense):
+    """Sparse x dense (2-D) product; returns a C-contiguous ndarray."""
+    dense = np.asarray(dense)
+    if dense.ndim == 1:
+        return spmv(matrix, dense)
+    if dense.shape[0] != matrix.shape[1]:
+        raise ValueError(f"shape mismatch: {matrix.shape} x {dense.shape}")
+    csr = matrix.tocsr()
+    m, n = csr.shape[0], dense.shape[1]
+    rows = csr._major_index()
+    columns = np.ascontiguousarray(dense.T)
+    out = np.empty((n, m), dtype=np.result_type(csr.data, dense))
+    # One SpMV per column of `dense`: O(nnz) scratch, where gathering whole rows
+    # of `dense` would need nnz x n and a slow 2-D reduceat
+    for j in range(n):
+        out[j] = _scatter_sum(rows, csr.data * columns[j][csr.indices], m)
+    return np.ascontiguousarray(out.T)
+
+
+def spgemm(a, b):
+    """Sparse x sparse product; returns CSR."""
+    a, b = a.tocsr(), b.tocsr()
+    if a.shape[1] != b.shape[0]:
+        raise ValueError(f"shape mismatch: {a.shape} x {b.shape}")
+    # Expand every (i, k) entry of A against row k of B, then coalesce (i, j)
+    a_rows = a._major_index()
+    counts = (b.indptr[1:] - b.indptr[:-1])[a.indices]
+    total = int(counts.sum())
+    if total == 0:
+        return COOMatrix(np.zeros(0, dtype=np.result_type(a.data, b.data)), [], [],
+                         (a.shape[0], b.shape[1])).tocsr()
+    entry = np.repeat(np.arange(a.nnz), counts)
+    # position of each expanded product inside its row of B
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    b_pos = b.indptr[a.indices[entry]] + (np.arange(total) - first)
+    data = a.data[entry] * b.data[b_pos]
+    return COOMatrix(data, a_rows[entry], b.indices[b_pos], (a.shape[0], b.shape[1])).tocsr()
+
+
+def multiply(a, b):
+    """a @ b where either side may be sparse; sparse x sparse stays sparse (CSR)."""
+    a_sparse = isinstance(a, SparseMatrix)
+    b_sparse = isinstance(b, SparseMatrix)
+    if a_sparse and b_sparse:
+        return spgemm(a, b)
+    if a_sparse:
+        result = spmm(a, b)
+        return Matrix.from_array(result) if isinstance(b, Matrix) and result.ndim == 2 else result
+    if b_sparse:
+        dense = np.asarray(a)
+        if dense.ndim == 1:
+            return spmv(b.T, dense)
+        result = np.ascontiguousarray(spmm(b.T, dense.T).T)
+        return Matrix.from_array(result) if isinstance(a, Matrix) else result
+    raise TypeError("multiply() needs at least one sparse operand")
@@ -1,3 +1,3 @@
 #!/usr/bin/env bash
-# Simple runner placeholder for the weekly project demo
-python -c "print('Run demo for this weekly project (replace with project script)')"
+# Demo: Monty Hall win rate by batched Monte Carlo (pass --help for options)
+cd "$(dirname "$0")/src" && python -m app.main "$@"
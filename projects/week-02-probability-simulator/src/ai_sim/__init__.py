@@ -0,0 +1,9 @@
+"""ai_sim: probability simulator for week 02."""
+
+from .models import beta_posterior, coin_posterior, monty_hall
+from .montecarlo import SimulationResult, simulate
+from .parallel import scaling_benchmark, simulate_parallel
+from .stats import OnlineSummary, PoissonBootstrap, Reservoir, RunningMoments, TDigest
+
+__all__ = ["OnlineSummary", "PoissonBootstrap", "Reservoir", "RunningMoments", "SimulationResult", "TDigest",
+           "beta_posterior", "coin_posterior", "monty_hall", "scaling_benchmark", "simulate", "simulate_parallel"]
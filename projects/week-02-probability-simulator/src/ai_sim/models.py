@@ -0,0 +1,57 @@
+"""Vectorized trial generators for the Monte Carlo engine.
+
+Each model is a function (rng, n) -> array of n trial outcomes: booleans for
+events (win / lose), floats for estimates. They draw everything for the batch
+in a few NumPy calls, never looping per trial.
+"""
+
+import functools
+
+import numpy as np
+
+
+def monty_hall(rng, n, switch=True):
+    """n games of Monty Hall; True where the player wins the car."""
+    car = rng.integers(0, 3, n, dtype=np.int8)
+    pick = rng.integers(0, 3, n, dtype=np.int8)
+    # The host opens a goat door the player did not pick: the one remaining door when
+    # pick != car, otherwise one of the two other doors at random
+    coin = rng.integers(1, 3, n, dtype=np.int8)
+    host = np.where(pick == car, (pick + coin) % 3, 3 - pick - car)
+    if switch:
+        return (3 - pick - host) == car
+    return pick == car
+
+
+def beta_posterior(rng, n, alpha, beta):
+    """n draws from the Beta(alpha, beta) posterior; their mean estimates the posterior mean."""
+    return rng.beta(alpha, beta, n)
+
+
+def coin_posterior(heads, tails, prior_alpha=1.0, prior_beta=1.0, rng=None):
+    """Sequential Beta-Bernoulli updates over a shuffled sequence of observed flips.
+
+    Returns (alpha, beta, trajectory) where trajectory[i] is the posterior mean after
+    i + 1 flips. Conjugacy makes every step a count update, so the whole trajectory is
+    two cumulative sums.
+    """
+    heads, tails = int(heads), int(tails)
+    flips = np.concatenate([np.ones(heads, dtype=np.int64), np.zeros(tails, dtype=np.int64)])
+    if rng is not None:
+        rng.shuffle(flips)
+    seen_heads = np.cumsum(flips)
+    seen = np.arange(1, flips.size + 1)
+    trajectory = (prior_alpha + seen_heads) / (prior_alpha + prior_beta + seen)
+    return prior_alpha + heads, prior_beta + tails, trajectory
+
+
+def normal(rng, n, loc=0.0, scale=1.0):
+    """n normal draws; a continuous-outcome model for exercising the summaries."""
+    return rng.normal(loc, scale, n)
+
+
+MODELS = {
+    "normal": normal,
+    "monty_hall": monty_hall,
+    "monty_hall_stay": functools.partial(monty_hall, switch=False),
+}
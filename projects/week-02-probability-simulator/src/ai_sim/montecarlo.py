@@ -0,0 +1,107 @@
+"""Batched Monte Carlo engine for the week 02 probability simulator.
+
+simulate(model, ...) draws trials in vectorized batches of `batch_size` and folds
+each batch into streaming moments (ai_sim.stats.RunningMoments), so no per-trial
+Python work is done and memory is one batch regardless of the trial count.
+
+With `tolerance`, the run stops at the first batch boundary where the normal
+confidence interval half-width z * s / sqrt(n) is within `tolerance` (after at
+least `min_trials`). Otherwise, or if that never happens, it runs `max_trials`.
+"""
+
+import logging
+import math
+import statistics
+import time
+
+import numpy as np
+
+from .stats import RunningMoments
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH = 1 << 20
+DEFAULT_MAX_TRIALS = 10 ** 8
+
+
+class SimulationResult:
+    __slots__ = ("mean", "variance", "stderr", "ci", "confidence", "trials", "batches", "elapsed",
+                 "converged", "summary")
+
+    def __init__(self, moments, confidence, batches, elapsed, converged, summary=None):
+        z = z_score(confidence)
+        self.mean = moments.mean
+        self.variance = moments.variance
+        self.stderr = moments.stderr
+        self.ci = (self.mean - z * self.stderr, self.mean + z * self.stderr)
+        self.confidence = confidence
+        self.trials = moments.count
+        self.batches = batches
+        self.elapsed = elapsed
+        self.converged = converged
+        self.summary = summary  # ai_sim.stats.OnlineSummary of the outcomes, when requested
+
+    @property
+    def half_width(self):
+        return (self.ci[1] - self.ci[0]) / 2
+
+    @property
+    def trials_per_sec(self):
+        return self.trials / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def as_dict(self):
+        data = {name: getattr(self, name) for name in self.__slots__ if name != "summary"}
+        if self.summary is not None:
+            data["summary"] = self.summary.as_dict(confidence=self.confidence)
+        data.update(half_width=self.half_width, trials_per_sec=self.trials_per_sec)
+        return data
+
+    def __repr__(self):
+        return (f"SimulationResult(mean={self.mean:.6g}, ci=({self.ci[0]:.6g}, {self.ci[1]:.6g}), "
+                f"trials={self.trials}, converged={self.converged}, {self.trials_per_sec:.3g} trials/s)")
+
+
+def z_score(confidence):
+    """Two-sided normal critical value, e.g. 1.96 for 0.95."""
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be in (0, 1), got {confidence}")
+    return statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def simulate(model, tolerance=None, confidence=0.95, max_trials=DEFAULT_MAX_TRIALS, batch_size=DEFAULT_BATCH,
+             min_trials=None, seed=None, rng=None, summary=None):
+    """Estimate E[model outcome] by batched Monte Carlo; returns a SimulationResult.
+
+    model: (rng, n) -> array of n outcomes (see ai_sim.models). rng defaults to
+    np.random.default_rng(seed). min_trials (default one batch) guards the
+    early-stopping rule against tiny-sample variance estimates. summary: an
+    ai_sim.stats.OnlineSummary (or anything with update(batch)) that also sees every
+    batch, for quantiles and bootstrap intervals of the outcomes.
+    """
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    max_trials = int(max_trials)
+    batch_size = max(1, min(int(batch_size), max_trials))
+    min_trials = batch_size if min_trials is None else int(min_trials)
+    z = z_score(confidence)
+    moments = RunningMoments()
+    batches = 0
+    converged = False
+    start = time.perf_counter()
+    while moments.count < max_trials:
+        n = min(batch_size, max_trials - moments.count)
+        outcomes = model(rng, n)
+        moments.update(outcomes)
+        if summary is not None:
+            summary.update(outcomes)
+        batches += 1
+        if tolerance is not None and moments.count >= min_trials and moments.count > 1:
+            # Zero variance (all outcomes equal) converges at once
+            if z * math.sqrt(moments.variance / moments.count) <= tolerance:
+                converged = True
+                break
+    elapsed = time.perf_counter() - start
+    result = SimulationResult(moments, confidence, batches, elapsed, converged, summary)
+    logger.info("Simulated %d trials in %d batches (%.3gs, %.3g trials/s): mean %.6g +/- %.3g",
+                result.trials, batches, elapsed, result.trials_per_sec, result.mean, result.half_width)
+    return result
@@ -0,0 +1,154 @@
+"""Multi-process Monte Carlo for the week 02 probability simulator.
+
+simulate_parallel() splits the trials into fixed-size shards, each with its own
+random stream spawned from one np.random.SeedSequence, and runs the shards on a
+process pool. Partial moments are merged strictly in shard order, so for a given
+seed the result is bit-for-bit the same whatever the worker count (1 worker runs
+the shards in-process). Early stopping is checked after each merged shard, so it
+stops at the same shard every time too.
+
+The shard layout depends only on (trials, shard_trials), never on `workers`:
+changing shard_trials changes the streams, changing workers does not.
+
+Models run in worker processes, so they must be picklable: a module-level
+function such as ai_sim.models.monty_hall, a functools.partial of one, or a name
+from ai_sim.models.MODELS.
+"""
+
+import collections
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .models import MODELS
+from .montecarlo import DEFAULT_BATCH, DEFAULT_MAX_TRIALS, SimulationResult, z_score
+from .stats import RunningMoments
+
+logger = logging.getLogger(__name__)
+
+SHARD_TRIALS = 1 << 23  # trials per shard (one task, one spawned stream)
+
+
+def _resolve_model(model):
+    if isinstance(model, str):
+        try:
+            return MODELS[model]
+        except KeyError:
+            raise ValueError(f"unknown model {model!r}; expected one of {sorted(MODELS)}") from None
+    return model
+
+
+def run_shard(model, seed_seq, trials, batch_size=DEFAULT_BATCH, summary_factory=None):
+    """(moments, summary or None) of `trials` outcomes from the shard's own stream (runs in a worker)."""
+    rng = np.random.default_rng(seed_seq)
+    moments = RunningMoments()
+    summary = summary_factory(seed=seed_seq.spawn(1)[0]) if summary_factory else None
+    for start in range(0, trials, batch_size):
+        outcomes = model(rng, min(batch_size, trials - start))
+        moments.update(outcomes)
+        if summary is not None:
+            summary.update(outcomes)
+    return moments, summary
+
+
+def shard_sizes(trials, shard_trials=SHARD_TRIALS):
+    full, rest = divmod(int(trials), int(shard_trials))
+    return [int(shard_trials)] * full + ([rest] if rest else [])
+
+
+def simulate_parallel(model, trials=DEFAULT_MAX_TRIALS, workers=None, seed=None, tolerance=None, confidence=0.95,
+                      shard_trials=SHARD_TRIALS, batch_size=DEFAULT_BATCH, summary_factory=None):
+    """Batched Monte Carlo over a process pool; returns a SimulationResult.
+
+    workers defaults to os.cpu_count(). seed may be an int or a SeedSequence; with
+    seed=None fresh entropy is drawn and logged so the run can be repeated.
+    summary_factory: picklable callable(seed=...) -> OnlineSummary (e.g.
+    functools.partial(OnlineSummary, replicates=100)); each shard builds one and they
+    are merged in shard order into result.summary.
+    """
+    model = _resolve_model(model)
+    workers = int(workers or os.cpu_count() or 1)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    sizes = shard_sizes(trials, shard_trials)
+    streams = root.spawn(len(sizes))
+    z = z_score(confidence)
+    batch_size = max(1, min(int(batch_size), int(shard_trials)))
+    logger.info("Parallel simulation: %d trials in %d shards on %d workers (entropy %d)",
+                sum(sizes), len(sizes), workers, root.entropy)
+
+    moments = RunningMoments()
+    summary = None
+    merged = 0
+    converged = False
+    start = time.perf_counter()
+
+    def absorb(shard):
+        # Merge in shard order; True once the interval fits the tolerance
+        nonlocal merged, summary
+        shard_moments, shard_summary = shard
+        moments.merge(shard_moments)
+        if shard_summary is not None:
+            summary = shard_summary if summary is None else summary.merge(shard_summary)
+        merged += 1
+        return (tolerance is not None and moments.count > 1
+                and z * math.sqrt(moments.variance / moments.count) <= tolerance)
+
+    if workers == 1:
+        for size, stream in zip(sizes, streams):
+            if absorb(run_shard(model, stream, size, batch_size, summary_factory)):
+                converged = True
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Sliding window of in-flight shards, consumed in order, so early stopping
+            # wastes at most one window of work
+            tasks = iter(zip(sizes, streams))
+            pending = collections.deque()
+
+            def submit_next():
+                task = next(tasks, None)
+                if task is not None:
+                    pending.append(pool.submit(run_shard, model, task[1], task[0], batch_size, summary_factory))
+
+            for _ in range(2 * workers):
+                submit_next()
+            while pending:
+                shard = pending.popleft().result()
+                submit_next()
+                if absorb(shard):
+                    converged = True
+                    pool.shutdown(cancel_futures=True)
+                    break
+    elapsed = time.perf_counter() - start
+    result = SimulationResult(moments, confidence, merged, elapsed, converged, summary)
+    logger.info("Merged %d shards: %d trials in %.3gs (%.3g trials/s), mean %.6g +/- %.3g",
+                merged, result.trials, elapsed, result.trials_per_sec, result.mean, result.half_width)
+    return result
+
+
+def scaling_benchmark(model, trials=DEFAULT_MAX_TRIALS, max_workers=None, seed=0, shard_trials=SHARD_TRIALS):
+    """Runs the same seeded simulation on 1, 2, 4, ... max_workers processes.
+
+    Returns one dict per worker count with seconds, trials/sec, speedup and
+    parallel efficiency; raises AssertionError if any run's moments differ from the
+    1-worker run (they must be identical).
+    """
+    max_workers = int(max_workers or os.cpu_count() or 1)
+    counts = sorted({1, max_workers} | {2 ** i for i in range(1, max_workers.bit_length()) if 2 ** i <= max_workers})
+    report = []
+    reference = None
+    for workers in counts:
+        result = simulate_parallel(model, trials, workers=workers, seed=seed, shard_trials=shard_trials)
+        state = (result.trials, result.mean, result.variance)
+        if reference is None:
+            reference = (state, result.elapsed)
+        elif state != reference[0]:
+            raise AssertionError(f"{workers} workers gave {state}, 1 worker gave {reference[0]}")
+        speedup = reference[1] / result.elapsed
+        report.append({"workers": workers, "seconds": result.elapsed, "trials_per_sec": result.trials_per_sec,
+                       "speedup": speedup, "efficiency": speedup / workers, "mean": result.mean})
+    return report
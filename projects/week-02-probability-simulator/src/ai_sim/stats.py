@@ -0,0 +1,345 @@
+"""Streaming summary statistics for the week 02 probability simulator.
+
+Every summary here takes samples in NumPy batches (or one at a time), uses memory
+independent of the stream length, and merges with another partial state of the
+same kind, so workers can each summarize a shard and the results can be combined.
+
+- RunningMoments: count, mean and variance (Welford per sample, Chan et al.'s
+  pairwise update per batch or merge)
+- TDigest: approximate quantiles from O(compression) weighted centroids; accurate
+  in the tails, and mergeable (P^2 markers cannot be merged, so P^2 is not used)
+- Reservoir: uniform random sample of fixed size k (Algorithm R, vectorized)
+- PoissonBootstrap: confidence intervals for the mean from B bootstrap replicates
+  kept as running weighted sums, each sample getting a Poisson(1) weight per replicate
+- OnlineSummary: all of the above behind one update()/merge()
+
+Use these instead of collecting samples into a list and summarizing at the end.
+"""
+
+import math
+
+import numpy as np
+
+
+class RunningMoments:
+    """Count, mean and variance of a stream, updated one batch at a time."""
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = int(count)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+
+    @classmethod
+    def from_batch(cls, batch):
+        batch = np.asarray(batch)
+        n = batch.size
+        if n == 0:
+            return cls()
+        if batch.dtype == np.bool_:
+            # Bernoulli outcomes: the sum is the whole story, no float copy needed
+            p = np.count_nonzero(batch) / n
+            return cls(n, p, n * p * (1.0 - p))
+        mean = float(np.mean(batch, dtype=np.float64))
+        deviations = batch - mean
+        return cls(n, mean, float(np.dot(deviations.ravel(), deviations.ravel())))
+
+    def merge(self, other):
+        """Combine another partial state into this one (in place); returns self."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        return self
+
+    def update(self, batch):
+        """Fold a batch (any shape) of samples into the running state; returns self."""
+        return self.merge(RunningMoments.from_batch(batch))
+
+    def add(self, x):
+        """Welford's single-sample update."""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        return self
+
+    @property
+    def variance(self):
+        # Sample (n - 1) variance
+        return self.m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self):
+        return math.sqrt(self.variance / self.count) if self.count > 1 else float("inf")
+
+    def __repr__(self):
+        return f"RunningMoments(count={self.count}, mean={self.mean:.6g}, variance={self.variance:.6g})"
+
+
+class TDigest:
+    """Merging t-digest (Dunning) with the arcsine scale function k1.
+
+    Incoming samples are buffered; when the buffer fills they are sorted together
+    with the centroids and regrouped by the unit interval of
+    k(q) = compression / (2 pi) * asin(2q - 1) that each one's centre falls in. That
+    bounds the digest to about compression / 2 centroids, with small ones near q = 0
+    and q = 1. The regrouping is one vectorized pass (sort + reduceat) rather than
+    the sequential greedy merge.
+    """
+    __slots__ = ("compression", "buffer_size", "means", "weights", "buffer", "buffered", "min", "max")
+
+    def __init__(self, compression=200, buffer_size=None):
+        self.compression = float(compression)
+        self.buffer_size = int(buffer_size or 10 * compression)
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.buffer = np.empty(self.buffer_size)
+        self.buffered = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum()) + self.buffered
+
+    def update(self, batch):
+        batch = np.asarray(batch, dtype=np.float64).ravel()
+        if batch.size == 0:
+            return self
+        self.min = min(self.min, float(batch.min()))
+        self.max = max(self.max, float(batch.max()))
+        if batch.size >= self.buffer_size:
+            # Large batches skip the buffer and are compressed in one pass
+            self._compress(batch, np.ones(batch.size))
+            return self
+        start = 0
+        while start < batch.size:
+            take = min(self.buffer_size - self.buffered, batch.size - start)
+            self.buffer[self.buffered:self.buffered + take] = batch[start:start + take]
+            self.buffered += take
+            start += take
+            if self.buffered == self.buffer_size:
+                self._flush()
+        return self
+
+    def add(self, x):
+        return self.update(np.array([x]))
+
+    def _flush(self):
+        if self.buffered:
+            values = self.buffer[:self.buffered].copy()
+            self.buffered = 0
+            self._compress(values, np.ones(values.size))
+
+    def _compress(self, means, weights):
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        # k-scale position of each item's centre: items sharing floor(k) merge
+        centre = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * centre - 1)
+        group = np.floor(k).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        merged_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / merged_weights
+        self.weights = merged_weights
+
+    def merge(self, other):
+        """Fold another digest into this one (in place); returns self."""
+        other._flush()
+        self._flush()
+        if other.weights.size:
+            self._compress(other.means, other.weights)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Estimated q-quantile(s), q in [0, 1]; NaN while empty."""
+        self._flush()
+        q = np.asarray(q, dtype=np.float64)
+        if self.weights.size == 0:
+            return np.full(q.shape, np.nan)[()]
+        total = self.weights.sum()
+        # Interpolate between centroid centres, anchored at the observed min and max
+        centres = np.cumsum(self.weights) - self.weights / 2
+        xs = np.concatenate([[0.0], centres, [total]])
+        ys = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(q * total, xs, ys)[()]
+
+    def __len__(self):
+        self._flush()
+        return int(self.weights.size)
+
+
+class Reservoir:
+    """Uniform sample of up to k items from a stream (Algorithm R, batch-vectorized)."""
+    __slots__ = ("k", "count", "sample", "rng")
+
+    def __init__(self, k=1000, seed=None):
+        self.k = int(k)
+        self.count = 0
+        self.sample = np.empty(0)
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, batch):
+        batch = np.asarray(batch, dtype=np.float64).ravel()
+        # Fill phase: the first k items are all kept
+        room = max(0, self.k - self.sample.size)
+        if room:
+            self.sample = np.concatenate([self.sample, batch[:room]])
+            self.count += min(room, batch.size)
+            batch = batch[room:]
+        if batch.size == 0:
+            return self
+        # Item number i (0-based) replaces slot j ~ U{0..i} when j < k. Later items win
+        # a slot over earlier ones in the same batch, as in the sequential algorithm.
+        index = self.count + np.arange(batch.size)
+        slots = self.rng.integers(0, index + 1)
+        hit = np.flatnonzero(slots < self.k)
+        if hit.size:
+            last = hit.size - 1 - np.unique(slots[hit][::-1], return_index=True)[1]
+            self.sample[slots[hit][last]] = batch[hit][last]
+        self.count += batch.size
+        return self
+
+    def add(self, x):
+        return self.update(np.array([x]))
+
+    def merge(self, other):
+        """Combine with another reservoir: a uniform sample of the union of both streams."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.sample = other.count, other.sample.copy()
+            return self
+        total = self.count + other.count
+        size = min(self.k, self.sample.size + other.sample.size)
+        # How many of the merged sample come from each side: hypergeometric over the streams
+        take = int(self.rng.hypergeometric(self.count, other.count, size))
+        take = min(max(take, size - other.sample.size), self.sample.size)
+        mine = self.rng.choice(self.sample, take, replace=False)
+        theirs = self.rng.choice(other.sample, size - take, replace=False)
+        self.sample = np.concatenate([mine, theirs])
+        self.count = total
+        return self
+
+
+def _poisson1_table(bits=16):
+    # Poisson(1) inverse CDF sampled at the 2^bits uniform levels: indexing it with
+    # random uint16s gives Poisson(1) weights (probabilities rounded to 2^-16) several
+    # times faster than Generator.poisson
+    levels = (np.arange(1 << bits) + 0.5) / (1 << bits)
+    k = np.arange(20)
+    cdf = np.cumsum(np.exp(-1.0) / np.cumprod(np.r_[1.0, k[1:]]))
+    return np.searchsorted(cdf, levels).astype(np.float64)
+
+
+class PoissonBootstrap:
+    """Streaming bootstrap of the mean with B replicates.
+
+    Each replicate keeps (sum of weights, sum of weighted samples), where every
+    sample gets an independent Poisson(1) weight per replicate: the online
+    equivalent of resampling with replacement, using O(B) memory.
+    """
+    __slots__ = ("replicates", "weight_sums", "value_sums", "rng")
+
+    CHUNK = 1 << 20  # weights generated at once (replicates x samples)
+    WEIGHTS = _poisson1_table()
+
+    def __init__(self, replicates=200, seed=None):
+        self.replicates = int(replicates)
+        self.weight_sums = np.zeros(self.replicates)
+        self.value_sums = np.zeros(self.replicates)
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, batch):
+        batch = np.asarray(batch, dtype=np.float64).ravel()
+        step = max(1, self.CHUNK // self.replicates)
+        for start in range(0, batch.size, step):
+            values = batch[start:start + step]
+            levels = self.rng.integers(0, self.WEIGHTS.size, (self.replicates, values.size), dtype=np.uint16)
+            weights = self.WEIGHTS[levels]
+            self.weight_sums += weights.sum(axis=1)
+            self.value_sums += weights @ values
+        return self
+
+    def add(self, x):
+        return self.update(np.array([x]))
+
+    def merge(self, other):
+        if other.replicates != self.replicates:
+            raise ValueError(f"cannot merge {other.replicates} replicates into {self.replicates}")
+        self.weight_sums += other.weight_sums
+        self.value_sums += other.value_sums
+        return self
+
+    def means(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.value_sums / self.weight_sums
+
+    def confidence_interval(self, confidence=0.95):
+        """Percentile interval of the replicate means."""
+        means = self.means()
+        means = means[np.isfinite(means)]
+        if means.size == 0:
+            return float("nan"), float("nan")
+        tail = (1 - confidence) / 2 * 100
+        low, high = np.percentile(means, [tail, 100 - tail])
+        return float(low), float(high)
+
+
+class OnlineSummary:
+    """Moments, quantiles, a reservoir sample and bootstrap CIs of one stream."""
+    __slots__ = ("moments", "digest", "reservoir", "bootstrap")
+
+    def __init__(self, compression=200, reservoir_size=1000, replicates=200, seed=None):
+        # Separate child streams so reservoir and bootstrap draws never overlap
+        root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        reservoir_seed, bootstrap_seed = root.spawn(2)
+        self.moments = RunningMoments()
+        self.digest = TDigest(compression)
+        self.reservoir = Reservoir(reservoir_size, reservoir_seed)
+        self.bootstrap = PoissonBootstrap(replicates, bootstrap_seed) if replicates else None
+
+    def update(self, batch):
+        batch = np.asarray(batch)
+        self.moments.update(batch)
+        self.digest.update(batch)
+        self.reservoir.update(batch)
+        if self.bootstrap is not None:
+            self.bootstrap.update(batch)
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+        self.reservoir.merge(other.reservoir)
+        if self.bootstrap is not None and other.bootstrap is not None:
+            self.bootstrap.merge(other.bootstrap)
+        return self
+
+    def quantile(self, q):
+        return self.digest.quantile(q)
+
+    def as_dict(self, quantiles=(0.01, 0.25, 0.5, 0.75, 0.99), confidence=0.95):
+        data = {"count": self.moments.count, "mean": self.moments.mean, "variance": self.moments.variance,
+                "min": self.digest.min, "max": self.digest.max}
+        for q in quantiles:
+            data[f"q{q:g}"] = float(self.digest.quantile(q))
+        if self.bootstrap is not None:
+            data["bootstrap_ci"] = self.bootstrap.confidence_interval(confidence)
+        return data
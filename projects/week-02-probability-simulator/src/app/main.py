@@ -1,6 +1,44 @@
-"""Minimal demo entrypoint for week 02"""
-def main():
-    print("Demo placeholder for week 02")
+"""Demo entrypoint for week 02: Monty Hall by batched Monte Carlo."""
+import argparse
+import logging
+
+from ai_sim import monty_hall, simulate
+from ai_sim.parallel import scaling_benchmark, simulate_parallel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate the Monty Hall switching win rate.")
+    parser.add_argument("--trials", type=float, default=1e8, help="maximum number of games (default: 1e8)")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="stop once the confidence interval half-width is below this")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--stay", action="store_true", help="never switch doors")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="shard trials over this many processes (results do not depend on it)")
+    parser.add_argument("--scaling", type=int, metavar="N", default=None,
+                        help="benchmark 1, 2, 4, ... N worker processes and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    model = "monty_hall_stay" if args.stay else "monty_hall"
+    if args.scaling:
+        print(f"{'workers':>7} {'seconds':>8} {'trials/s':>12} {'speedup':>8} {'efficiency':>10}")
+        for row in scaling_benchmark(model, int(args.trials), max_workers=args.scaling, seed=args.seed or 0):
+            print(f"{row['workers']:>7} {row['seconds']:>8.2f} {row['trials_per_sec']:>12,.0f} "
+                  f"{row['speedup']:>7.2f}x {row['efficiency']:>10.0%}")
+        return
+    if args.workers:
+        result = simulate_parallel(model, int(args.trials), workers=args.workers, seed=args.seed,
+                                   tolerance=args.tolerance, confidence=args.confidence)
+    else:
+        result = simulate(lambda rng, n: monty_hall(rng, n, switch=not args.stay), tolerance=args.tolerance,
+                          confidence=args.confidence, max_trials=int(args.trials), seed=args.seed)
+    low, high = result.ci
+    print(f"win rate {result.mean:.6f}  {args.confidence:.0%} CI [{low:.6f}, {high:.6f}]")
+    print(f"{result.trials} trials in {result.elapsed:.2f}s ({result.trials_per_sec:,.0f} trials/s)"
+          f"{', stopped early' if result.converged else ''}")
+
 
 if __name__ == "__main__":
     main()
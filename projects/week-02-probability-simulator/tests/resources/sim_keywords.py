@@ -0,0 +1,117 @@
+# sim_keywords.py
+import os
+import sys
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn
+
+SIM_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+_last = {}  # results shared between keywords of one test
+
+def setup_simulation_env():
+    # make ai_sim importable for the keywords below
+    if SIM_SRC not in sys.path:
+        sys.path.insert(0, SIM_SRC)
+    logger.info("Simulation env setup")
+
+def _publish(**values):
+    # keyword results are handed to the suite as test variables (${win_rate}, ...)
+    builtin = BuiltIn()
+    for name, value in values.items():
+        builtin.set_test_variable("${%s}" % name, value)
+    _last.update(values)
+
+def run_monty_hall_experiment(runs, switch=True, tolerance=None, confidence=0.95, seed=0, batch_size=None):
+    # vectorized Monty Hall games; sets ${win_rate}, ${trials_used}, ${trials_per_sec}
+    # and ${converged}. With `tolerance` the run stops once the CI half-width fits it.
+    from ai_sim import monty_hall, simulate
+    from ai_sim.montecarlo import DEFAULT_BATCH
+    switch = str(switch).lower() not in ("false", "0", "no")
+    result = simulate(lambda rng, n: monty_hall(rng, n, switch=switch),
+                      tolerance=None if tolerance is None else float(tolerance), confidence=float(confidence),
+                      max_trials=int(runs), batch_size=int(batch_size or DEFAULT_BATCH), seed=int(seed))
+    _publish(win_rate=result.mean, trials_used=result.trials, trials_per_sec=result.trials_per_sec,
+             converged=result.converged)
+    logger.info(f"Monty Hall ({'switch' if switch else 'stay'}): win rate {result.mean:.5f} "
+                f"+/- {result.half_width:.5f} from {result.trials} trials ({result.trials_per_sec:.3g} trials/s, "
+                f"converged={result.converged})")
+    return result.as_dict()
+
+def run_bayesian_update_simulation(heads, tails, prior_alpha=1, prior_beta=1, tolerance=1e-3, seed=0):
+    # Beta-Bernoulli updates over the observed flips, then a Monte Carlo estimate of the
+    # posterior mean from posterior draws (stopping at `tolerance`); sets
+    # ${posterior_mean}, ${analytic_posterior_mean}, ${posterior_alpha}, ${posterior_beta}
+    import numpy as np
+    from ai_sim import beta_posterior, coin_posterior, simulate
+    rng = np.random.default_rng(int(seed))
+    alpha, beta, trajectory = coin_posterior(heads, tails, float(prior_alpha), float(prior_beta), rng=rng)
+    result = simulate(lambda r, n: beta_posterior(r, n, alpha, beta), tolerance=float(tolerance),
+                      batch_size=1 << 16, rng=rng)
+    _publish(posterior_mean=result.mean, analytic_posterior_mean=float(trajectory[-1]), posterior_alpha=alpha,
+             posterior_beta=beta)
+    logger.info(f"Posterior Beta({alpha:g}, {beta:g}): Monte Carlo mean {result.mean:.5f} +/- "
+                f"{result.half_width:.5f} ({result.trials} draws), analytic {trajectory[-1]:.5f}")
+    return result.as_dict()
+
+def posterior_mean_should_be_near(expected, tolerance=0.01):
+    mean = _last.get("posterior_mean")
+    if mean is None:
+        raise AssertionError("Run Bayesian Update Simulation first")
+    if abs(mean - float(expected)) > float(tolerance):
+        raise AssertionError(f"Posterior mean {mean:.5f} is not within {tolerance} of {expected}")
+
+def run_parallel_monty_hall(runs, workers=None, seed=0, tolerance=None):
+    # Monty Hall sharded over a process pool with SeedSequence-spawned streams; the
+    # result for a given seed does not depend on `workers`. Sets ${win_rate},
+    # ${trials_used}, ${trials_per_sec} and ${converged}
+    from ai_sim.parallel import simulate_parallel
+    result = simulate_parallel("monty_hall", int(runs), workers=None if workers is None else int(workers),
+                               seed=int(seed), tolerance=None if tolerance is None else float(tolerance))
+    _publish(win_rate=result.mean, trials_used=result.trials, trials_per_sec=result.trials_per_sec,
+             converged=result.converged)
+    logger.info(f"Parallel Monty Hall on {workers or os.cpu_count()} workers: win rate {result.mean!r} from "
+                f"{result.trials} trials ({result.trials_per_sec:.3g} trials/s)")
+    return result.as_dict()
+
+def measure_simulation_scaling(runs=50000000, max_workers=None, seed=0):
+    # the same seeded Monty Hall run on 1, 2, 4, ... max_workers processes; fails if
+    # any worker count changes the result, returns one row per worker count
+    from ai_sim.parallel import scaling_benchmark
+    report = scaling_benchmark("monty_hall", int(runs), max_workers=None if max_workers is None else int(max_workers),
+                               seed=int(seed))
+    for row in report:
+        logger.info(f"{row['workers']:>3} workers: {row['seconds']:.2f}s, {row['trials_per_sec']:.3g} trials/s, "
+                    f"speedup {row['speedup']:.2f}x, efficiency {row['efficiency']:.0%} ({os.cpu_count()} CPUs)")
+    return report
+
+def scaling_efficiency_should_be_at_least(report, min_efficiency=0.6):
+    # parallel efficiency (speedup / workers) of the largest worker count in a
+    # Measure Simulation Scaling report; skipped when there are fewer CPUs than workers
+    workers = max(row["workers"] for row in report)
+    if (os.cpu_count() or 1) < workers or workers < 2:
+        BuiltIn().skip(f"Efficiency with {workers} workers needs {max(workers, 2)} CPUs ({os.cpu_count()} available)")
+    row = next(r for r in report if r["workers"] == workers)
+    if row["efficiency"] < float(min_efficiency):
+        raise AssertionError(f"{workers} workers ran at {row['efficiency']:.0%} efficiency ({row['speedup']:.2f}x), "
+                             f"below {float(min_efficiency):.0%}")
+    logger.info(f"{workers} workers: {row['speedup']:.2f}x, {row['efficiency']:.0%} efficiency")
+
+def summarize_normal_stream(samples=1000000, workers=1, seed=0, replicates=50):
+    # streams standard-normal samples through ai_sim.stats.OnlineSummary (moments,
+    # t-digest quantiles, reservoir, Poisson bootstrap) in batches, merging shard
+    # summaries; returns the summary plus the traced peak memory of the run
+    import functools
+    import tracemalloc
+    from ai_sim.parallel import simulate_parallel
+    from ai_sim.stats import OnlineSummary
+    factory = functools.partial(OnlineSummary, replicates=int(replicates))
+    tracemalloc.start()
+    result = simulate_parallel("normal", int(samples), workers=int(workers), seed=int(seed), summary_factory=factory)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    report = result.summary.as_dict()
+    report.update(peak_bytes=peak, seconds=result.elapsed, reservoir_size=result.summary.reservoir.sample.size)
+    logger.info(f"{report['count']} samples in {result.elapsed:.2f}s, peak {peak / 2**20:.1f} MiB: mean "
+                f"{report['mean']:.5f}, var {report['variance']:.5f}, median {report['q0.5']:.4f}, "
+                f"q0.99 {report['q0.99']:.4f}, bootstrap CI {report['bootstrap_ci']}")
+    return report
@@ -0,0 +1,11 @@
+"""ai_symdiff: symbolic differentiation engine for week 03."""
+
+from .codegen import CompileCache, CompiledExpression, compile_expression, lambdify
+from .expr import (Node, add, const, cos, dag_size, diff, evaluate, exp, log, mul, power, sin, sqrt, stats, tan,
+                   tanh, to_string, tree_size, var)
+from .parser import parse
+from .tape import Tape, TapeVar, expression_gradient, gradient_check
+
+__all__ = ["CompileCache", "CompiledExpression", "Node", "Tape", "TapeVar", "add", "compile_expression", "const",
+           "cos", "dag_size", "diff", "evaluate", "exp", "expression_gradient", "gradient_check", "lambdify", "log",
+           "mul", "parse", "power", "sin", "sqrt", "stats", "tan", "tanh", "to_string", "tree_size", "var"]
@@ -0,0 +1,485 @@
+"""Hash-consed expression DAG and memoized differentiation for week 03.
+
+Every expression node is interned: building the same (op, value, children) twice
+returns the same Node object, so identical subexpressions exist once, structural
+equality is identity (`is` / ==), and a node's id is a stable key for caches.
+
+Constructors canonicalize as they build:
+- sums and products are flattened
+- constants are folded
+- like terms are collected (x + x -> 2*x, x * x**2 -> x**3)
+- operands are ordered by node id, so a + b and b + a are the same node
+
+Derivatives are memoized per (node, variable) on the node itself. Differentiating
+an n-th derivative only does work for the nodes that are new at that order, and
+the results share the rest of the DAG. Repeated differentiation therefore grows
+the DAG roughly linearly with the order, where a tree representation grows
+exponentially. dag_size / tree_size / depth (or stats()) show the difference.
+"""
+
+import itertools
+import math
+import weakref
+
+FUNCTIONS = {
+    "sin": math.sin, "cos": math.cos, "tan": math.tan, "exp": math.exp, "log": math.log, "tanh": math.tanh,
+}
+
+_ids = itertools.count()
+_table = weakref.WeakValueDictionary()  # (op, value, child ids) -> Node
+
+
+class Node:
+    __slots__ = ("op", "value", "args", "id", "depth", "free", "derivatives", "__weakref__")
+
+    # op: "const" (value: float), "var" (value: name), "add", "mul", "pow" (args: base, exponent)
+    # or a FUNCTIONS name (args: (argument,))
+
+    def __repr__(self):
+        return f"Node({to_string(self)!r})"
+
+    def __str__(self):
+        return to_string(self)
+
+    def __hash__(self):
+        return self.id
+
+    # -- operators ---------------------------------------------------------------
+
+    def __add__(self, other):
+        return add(self, as_node(other))
+
+    def __radd__(self, other):
+        return add(as_node(other), self)
+
+    def __sub__(self, other):
+        return add(self, neg(as_node(other)))
+
+    def __rsub__(self, other):
+        return add(as_node(other), neg(self))
+
+    def __mul__(self, other):
+        return mul(self, as_node(other))
+
+    def __rmul__(self, other):
+        return mul(as_node(other), self)
+
+    def __truediv__(self, other):
+        return mul(self, power(as_node(other), const(-1)))
+
+    def __rtruediv__(self, other):
+        return mul(as_node(other), power(self, const(-1)))
+
+    def __pow__(self, other):
+        return power(self, as_node(other))
+
+    def __rpow__(self, other):
+        return power(as_node(other), self)
+
+    def __neg__(self):
+        return neg(self)
+
+    def diff(self, var, order=1):
+        return diff(self, var, order)
+
+
+def _intern(op, value, args=()):
+    key = (op, value, tuple(a.id for a in args))
+    node = _table.get(key)
+    if node is not None:
+        return node
+    node = Node()
+    node.op = op
+    node.value = value
+    node.args = args
+    node.id = next(_ids)
+    node.depth = 1 + max((a.depth for a in args), default=0)
+    if op == "var":
+        node.free = frozenset((value,))
+    elif args:
+        node.free = frozenset().union(*(a.free for a in args))
+    else:
+        node.free = frozenset()
+    node.derivatives = {}
+    _table[key] = node
+    return node
+
+
+def interned_count():
+    """Number of live interned nodes."""
+    return len(_table)
+
+
+# -- constructors -------------------------------------------------------------------
+
+def const(value):
+    value = float(value)
+    return _intern("const", 0.0 if value == 0 else value)
+
+
+def var(name):
+    return _intern("var", str(name))
+
+
+ZERO = const(0)
+ONE = const(1)
+
+
+def as_node(x):
+    if isinstance(x, Node):
+        return x
+    if isinstance(x, (int, float)):
+        return const(x)
+    if isinstance(x, str):
+        return var(x)
+    raise TypeError(f"cannot make an expression from {type(x).__name__}")
+
+
+def _coefficient(node):
+    # node == c * rest: (c, rest)
+    if node.op == "mul" and node.args[0].op == "const":
+        rest = node.args[1:]
+        return node.args[0].value, rest[0] if len(rest) == 1 else _intern("mul", None, rest)
+    return 1.0, node
+
+
+def add(*terms):
+    constant = 0.0
+    coefficients = {}  # base -> coefficient, in first-seen order
+    stack = list(reversed(terms))
+    while stack:
+        term = stack.pop()
+        if term.op == "add":
+            stack.extend(reversed(term.args))
+        elif term.op == "const":
+            constant += term.value
+        else:
+            c, base = _coefficient(term)
+            coefficients[base] = coefficients.get(base, 0.0) + c
+    items = sorted((scale(c, base) for base, c in coefficients.items() if c != 0), key=lambda n: n.id)
+    if constant != 0:
+        items.insert(0, const(constant))
+    if not items:
+        return ZERO
+    if len(items) == 1:
+        return items[0]
+    return _intern("add", None, tuple(items))
+
+
+def scale(c, node):
+    if c == 0:
+        return ZERO
+    if c == 1:
+        return node
+    return mul(const(c), node)
+
+
+def mul(*factors):
+    constant = 1.0
+    exponents = {}  # base -> [exponent nodes], in first-seen order
+    stack = list(reversed(factors))
+    while stack:
+        factor = stack.pop()
+        if factor.op == "mul":
+            stack.extend(reversed(factor.args))
+        elif factor.op == "const":
+            constant *= factor.value
+        elif factor.op == "pow":
+            exponents.setdefault(factor.args[0], []).append(factor.args[1])
+        else:
+            exponents.setdefault(factor, []).append(ONE)
+    if constant == 0:
+        return ZERO
+    items = []
+    for base, exps in exponents.items():
+        factor = power(base, exps[0] if len(exps) == 1 else add(*exps))
+        if factor.op == "const":
+            constant *= factor.value
+        elif factor.op == "mul":
+            # e.g. (2*x)**1 after collection: keep the product flat
+            head, rest = _coefficient(factor)
+            constant *= head
+            items.extend(rest.args if rest.op == "mul" else (rest,))
+        else:
+            items.append(factor)
+    items.sort(key=lambda n: n.id)
+    if constant == 0:
+        return ZERO
+    if not items:
+        return const(constant)
+    if constant != 1:
+        items.insert(0, const(constant))
+    if len(items) == 1:
+        return items[0]
+    return _intern("mul", None, tuple(items))
+
+
+def neg(node):
+    return mul(const(-1), node)
+
+
+def _is_integer(node):
+    return node.op == "const" and float(node.value).is_integer()
+
+
+def power(base, exponent):
+    if exponent.op == "const":
+        if exponent.value == 0:
+            return ONE
+        if exponent.value == 1:
+            return base
+        if base.op == "const":
+            try:
+                value = base.value ** exponent.value
+            except (OverflowError, ZeroDivisionError):
+                value = None
+            if isinstance(value, float) and math.isfinite(value):
+                return const(value)
+        if base.op == "pow" and _is_integer(exponent):
+            return power(base.args[0], mul(base.args[1], exponent))
+    if base.op == "const" and base.value in (0.0, 1.0) and exponent.op == "const" and exponent.value > 0:
+        return base
+    return _intern("pow", None, (base, exponent))
+
+
+def func(name, arg):
+    if name == "sqrt":
+        return power(arg, const(0.5))
+    if name not in FUNCTIONS:
+        raise ValueError(f"unknown function {name!r}; expected one of {sorted(FUNCTIONS) + ['sqrt']}")
+    if arg.op == "const":
+        try:
+            return const(FUNCTIONS[name](arg.value))
+        except (ValueError, OverflowError):
+            pass
+    if name == "log" and arg.op == "exp":
+        return arg.args[0]
+    return _intern(name, None, (arg,))
+
+
+def sin(x):
+    return func("sin", as_node(x))
+
+
+def cos(x):
+    return func("cos", as_node(x))
+
+
+def tan(x):
+    return func("tan", as_node(x))
+
+
+def exp(x):
+    return func("exp", as_node(x))
+
+
+def log(x):
+    return func("log", as_node(x))
+
+
+def tanh(x):
+    return func("tanh", as_node(x))
+
+
+def sqrt(x):
+    return func("sqrt", as_node(x))
+
+
+# -- differentiation -----------------------------------------------------------------
+
+def _derivative(node, name):
+    # d(node)/d(name), memoized per (node, variable) on the node
+    if name not in node.free:
+        return ZERO
+    cached = node.derivatives.get(name)
+    if cached is not None:
+        return cached
+    op, args = node.op, node.args
+    if op == "var":
+        result = ONE
+    elif op == "add":
+        result = add(*(_derivative(a, name) for a in args))
+    elif op == "mul":
+        # n-ary product rule: one term per factor that depends on the variable
+        terms = []
+        for i, a in enumerate(args):
+            da = _derivative(a, name)
+            if da is not ZERO:
+                terms.append(mul(*args[:i], da, *args[i + 1:]))
+        result = add(*terms)
+    elif op == "pow":
+        base, exponent = args
+        if name not in exponent.free:
+            result = mul(exponent, power(base, add(exponent, const(-1))), _derivative(base, name))
+        else:
+            # d(b**e) = b**e * (e' log b + e b' / b)
+            result = mul(node, add(mul(_derivative(exponent, name), func("log", base)),
+                                   mul(exponent, _derivative(base, name), power(base, const(-1)))))
+    else:
+        u = args[0]
+        du = _derivative(u, name)
+        if op == "sin":
+            outer = func("cos", u)
+        elif op == "cos":
+            outer = neg(func("sin", u))
+        elif op == "tan":
+            outer = add(ONE, power(node, const(2)))
+        elif op == "exp":
+            outer = node
+        elif op == "log":
+            outer = power(u, const(-1))
+        elif op == "tanh":
+            outer = add(ONE, neg(power(node, const(2))))
+        else:
+            raise ValueError(f"no derivative rule for {op!r}")
+        result = mul(outer, du)
+    node.derivatives[name] = result
+    return result
+
+
+def diff(node, var, order=1):
+    """order-th derivative of node with respect to var (a name or a var node)."""
+    name = var.value if isinstance(var, Node) else str(var)
+    for _ in range(int(order)):
+        node = _derivative(node, name)
+    return node
+
+
+# -- size and shape ------------------------------------------------------------------
+
+def nodes(root):
+    """Distinct nodes reachable from root, children before parents."""
+    order, seen, stack = [], set(), [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if node.id in seen:
+            continue
+        seen.add(node.id)
+        stack.append((node, True))
+        stack.extend((a, False) for a in reversed(node.args) if a.id not in seen)
+    return order
+
+
+def dag_size(root):
+    """Number of distinct nodes (what the DAG actually stores)."""
+    return len(nodes(root))
+
+
+def tree_size(root):
+    """Number of nodes the same expression would need as a plain tree."""
+    sizes = {}
+    for node in nodes(root):
+        sizes[node.id] = 1 + sum(sizes[a.id] for a in node.args)
+    return sizes[root.id]
+
+
+def stats(root):
+    return {"dag_nodes": dag_size(root), "tree_nodes": tree_size(root), "depth": root.depth,
+            "free": sorted(root.free), "interned": interned_count()}
+
+
+# -- printing ------------------------------------------------------------------------
+
+_PRECEDENCE = {"add": 1, "mul": 2, "neg": 2, "pow": 3}
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() and abs(value) < 1e15 else repr(value)
+
+
+def to_string(node):
+    """Infix form (x**2*sin(x) + ...) that parse() reads back."""
+    memo = {}
+    for n in nodes(node):
+        memo[n.id] = _format(n, memo)
+    return memo[node.id][0]
+
+
+def _format(node, memo):
+    # (text, precedence) of one node, given its children's
+    def wrap(child, level):
+        text, prec = memo[child.id]
+        return f"({text})" if prec < level else text
+
+    op = node.op
+    if op == "const":
+        text = _number(node.value)
+        return text, (_PRECEDENCE["neg"] if node.value < 0 else 4)
+    if op == "var":
+        return node.value, 4
+    if op == "add":
+        parts = []
+        for i, a in enumerate(node.args):
+            text = wrap(a, _PRECEDENCE["add"])
+            if i and text.startswith("-"):
+                parts.append(" - " + text[1:])
+            else:
+                parts.append((" + " if i else "") + text)
+        return "".join(parts), _PRECEDENCE["add"]
+    if op == "mul":
+        args = node.args
+        sign = ""
+        if args[0].op == "const" and args[0].value == -1:
+            sign, args = "-", args[1:]
+        numerator = [a for a in args if not (a.op == "pow" and a.args[1].op == "const" and a.args[1].value < 0)]
+        denominator = [a for a in args if a not in numerator]
+        text = "*".join(wrap(a, _PRECEDENCE["mul"]) for a in numerator) or "1"
+        for d in denominator:
+            base, exponent = d.args
+            inverse = power(base, const(-exponent.value))
+            if inverse.id not in memo:
+                memo[inverse.id] = (to_string(inverse), _PRECEDENCE["pow"] if inverse.op == "pow" else 4)
+            text += "/" + wrap(inverse, _PRECEDENCE["pow"])
+        if sign and len(numerator) == 1 and not denominator:
+            return sign + text, _PRECEDENCE["neg"]
+        return sign + text, _PRECEDENCE["mul"]
+    if op == "pow":
+        base, exponent = node.args
+        if exponent.op == "const" and exponent.value == -1:
+            return "1/" + wrap(base, _PRECEDENCE["pow"]), _PRECEDENCE["mul"]
+        if exponent.op == "const" and exponent.value == 0.5:
+            return f"sqrt({memo[base.id][0]})", 4
+        return wrap(base, _PRECEDENCE["pow"] + 1) + "**" + wrap(exponent, _PRECEDENCE["pow"] + 1), _PRECEDENCE["pow"]
+    return f"{op}({memo[node.args[0].id][0]})", 4
+
+
+# -- evaluation ----------------------------------------------------------------------
+
+def evaluate(root, values=None, **kwargs):
+    """Value of root for variable values (scalars or NumPy arrays), one pass over the DAG."""
+    values = dict(values or {}, **kwargs)
+    results = {}
+    for node in nodes(root):
+        op = node.op
+        if op == "const":
+            result = node.value
+        elif op == "var":
+            try:
+                result = values[node.value]
+            except KeyError:
+                raise NameError(f"no value for variable {node.value!r}") from None
+        else:
+            args = [results[a.id] for a in node.args]
+            if op == "add":
+                result = sum(args[1:], args[0])
+            elif op == "mul":
+                result = args[0]
+                for a in args[1:]:
+                    result = result * a
+            elif op == "pow":
+                result = args[0] ** args[1]
+            else:
+                result = _apply(op, args[0])
+        results[node.id] = result
+    return results[root.id]
+
+
+def _apply(op, x):
+    # math for scalars, NumPy for arrays
+    if isinstance(x, (int, float)):
+        return FUNCTIONS[op](x)
+    import numpy as np
+    return getattr(np, op)(x)
@@ -0,0 +1,146 @@
+"""Infix parser for ai_symdiff expressions.
+
+Grammar (Python operators, plus `^` for powers and a `.diff` suffix):
+
+    expr    := sum ('.diff' '(' NAME [',' INT] ')')*
+    sum     := product (('+' | '-') product)*
+    product := unary (('*' | '/') unary)*
+    unary   := ('-' | '+') unary | power
+    power   := atom (('**' | '^') unary)?
+    atom    := NUMBER | NAME | NAME '(' expr [',' NAME [',' INT]] ')' | '(' expr ')'
+
+Unlike a Python/sympy method call, `.diff(x)` differentiates the whole expression to
+its left, so `x*sin(x).diff(x)` means d/dx (x*sin(x)), not x*cos(x). Parenthesize
+to differentiate a factor: `x*(sin(x).diff(x))`. `diff(f, x[, n])` is the function
+form. Functions: sin, cos, tan, exp, log, tanh, sqrt.
+"""
+
+import re
+
+from . import expr as E
+
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)|([A-Za-z_]\w*)|(\*\*|[-+*/^(),.]))")
+
+
+def tokenize(text):
+    tokens, pos, text = [], 0, text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise SyntaxError(f"unexpected character {text[pos:].lstrip()[:1]!r} at {pos} in {text!r}")
+        number, name, symbol = match.groups()
+        if number is not None:
+            tokens.append(("num", number))
+        elif name is not None:
+            tokens.append(("name", name))
+        else:
+            tokens.append(("op", "**" if symbol == "^" else symbol))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    __slots__ = ("text", "tokens", "pos")
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, value=None):
+        token = self.peek()
+        if token[0] is None or (kind and token[0] != kind) or (value and token[1] != value):
+            expected = value or kind or "more input"
+            raise SyntaxError(f"expected {expected!r} but found {token[1] or 'end of input'!r} in {self.text!r}")
+        self.pos += 1
+        return token[1]
+
+    def accept(self, value):
+        if self.peek() == ("op", value):
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self):
+        node = self.expr()
+        if self.pos != len(self.tokens):
+            raise SyntaxError(f"unexpected {self.peek()[1]!r} in {self.text!r}")
+        return node
+
+    def expr(self):
+        node = self.sum()
+        while self.accept("."):
+            method = self.take("name")
+            if method != "diff":
+                raise SyntaxError(f"unknown method {method!r} in {self.text!r} (only .diff)")
+            self.take("op", "(")
+            node = E.diff(node, *self.diff_args())
+        return node
+
+    def diff_args(self):
+        # NAME [',' INT] ')'
+        name = self.take("name")
+        order = int(self.take("num")) if self.accept(",") else 1
+        self.take("op", ")")
+        return name, order
+
+    def sum(self):
+        node = self.product()
+        while True:
+            if self.accept("+"):
+                node = E.add(node, self.product())
+            elif self.accept("-"):
+                node = E.add(node, E.neg(self.product()))
+            else:
+                return node
+
+    def product(self):
+        node = self.unary()
+        while True:
+            if self.accept("*"):
+                node = E.mul(node, self.unary())
+            elif self.accept("/"):
+                node = E.mul(node, E.power(self.unary(), E.const(-1)))
+            else:
+                return node
+
+    def unary(self):
+        if self.accept("-"):
+            return E.neg(self.unary())
+        if self.accept("+"):
+            return self.unary()
+        return self.power()
+
+    def power(self):
+        base = self.atom()
+        if self.accept("**"):
+            return E.power(base, self.unary())
+        return base
+
+    def atom(self):
+        kind, value = self.peek()
+        if kind == "num":
+            self.pos += 1
+            return E.const(float(value))
+        if kind == "name":
+            self.pos += 1
+            if not self.accept("("):
+                return E.var(value)
+            argument = self.expr()
+            if value == "diff":
+                self.take("op", ",")
+                return E.diff(argument, *self.diff_args())
+            self.take("op", ")")
+            return E.func(value, argument)
+        self.take("op", "(")
+        node = self.expr()
+        self.take("op", ")")
+        return node
+
+
+def parse(text):
+    """Parse infix text into an interned expression node; raises SyntaxError."""
+    return _Parser(str(text)).parse()
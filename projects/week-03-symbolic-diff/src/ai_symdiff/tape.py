@@ -0,0 +1,452 @@
+"""Reverse-mode automatic differentiation over NumPy arrays.
+
+A Tape records every operation on its TapeVar values (define by run): the output
+array, the parent entries, and a vector-Jacobian product that maps the output's
+adjoint to the parents' adjoints. tape.gradient(loss, wrt) then makes one reverse
+sweep over the entries and returns the adjoints of every requested input. An
+n-parameter gradient costs about one extra forward pass, where symbolic
+differentiation needs one derivative per variable.
+
+Adjoints live in buffers indexed by tape position. They are allocated by the first
+backward pass and reused by later ones whenever the shape matches. A training loop
+that does reset() -> forward -> gradient() therefore stops allocating adjoints after
+its first step. The returned gradients are views of those buffers: pass copy=True (or
+copy them) if they must outlive the next gradient() call on the same tape.
+
+Operands that are not TapeVars (arrays, scalars) are constants: they are not
+recorded and get no adjoint. expression_gradient() runs an ai_symdiff expression DAG
+on a tape, and gradient_check() compares the result with the symbolic derivatives.
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from .expr import diff, nodes
+
+logger = logging.getLogger(__name__)
+
+
+class TapeVar:
+    __slots__ = ("tape", "index", "value")
+
+    __array_ufunc__ = None  # make ndarray <op> TapeVar defer to the reflected operators below
+
+    def __init__(self, tape, index, value):
+        self.tape = tape
+        self.index = index
+        self.value = value
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    def __repr__(self):
+        return f"TapeVar(#{self.index}, shape={self.value.shape})"
+
+    # -- arithmetic (with NumPy broadcasting) -------------------------------------------
+
+    def __add__(self, other):
+        return self.tape.binary(self, other, np.add(_value(self), _value(other)), _add_vjp)
+
+    def __radd__(self, other):
+        return self.tape.binary(other, self, np.add(_value(other), _value(self)), _add_vjp)
+
+    def __sub__(self, other):
+        return self.tape.binary(self, other, np.subtract(_value(self), _value(other)), _sub_vjp)
+
+    def __rsub__(self, other):
+        return self.tape.binary(other, self, np.subtract(_value(other), _value(self)), _sub_vjp)
+
+    def __mul__(self, other):
+        return self.tape.binary(self, other, np.multiply(_value(self), _value(other)), _mul_vjp)
+
+    def __rmul__(self, other):
+        return self.tape.binary(other, self, np.multiply(_value(other), _value(self)), _mul_vjp)
+
+    def __truediv__(self, other):
+        return self.tape.binary(self, other, np.divide(_value(self), _value(other)), _div_vjp)
+
+    def __rtruediv__(self, other):
+        return self.tape.binary(other, self, np.divide(_value(other), _value(self)), _div_vjp)
+
+    def __pow__(self, other):
+        return self.tape.binary(self, other, np.power(_value(self), _value(other)), _pow_vjp)
+
+    def __rpow__(self, other):
+        return self.tape.binary(other, self, np.power(_value(other), _value(self)), _pow_vjp)
+
+    def __matmul__(self, other):
+        return self.tape.binary(self, other, np.matmul(_value(self), _value(other)), _matmul_vjp)
+
+    def __rmatmul__(self, other):
+        return self.tape.binary(other, self, np.matmul(_value(other), _value(self)), _matmul_vjp)
+
+    def __neg__(self):
+        return self.tape.unary(self, np.negative(self.value), lambda g, a, out: -g)
+
+    # -- elementwise functions ------------------------------------------------------------
+
+    def sin(self):
+        return self.tape.unary(self, np.sin(self.value), lambda g, a, out: g * np.cos(a))
+
+    def cos(self):
+        return self.tape.unary(self, np.cos(self.value), lambda g, a, out: -g * np.sin(a))
+
+    def tan(self):
+        return self.tape.unary(self, np.tan(self.value), lambda g, a, out: g * (1 + out * out))
+
+    def exp(self):
+        return self.tape.unary(self, np.exp(self.value), lambda g, a, out: g * out)
+
+    def log(self):
+        return self.tape.unary(self, np.log(self.value), lambda g, a, out: g / a)
+
+    def sqrt(self):
+        return self.tape.unary(self, np.sqrt(self.value), lambda g, a, out: g * 0.5 / out)
+
+    def tanh(self):
+        return self.tape.unary(self, np.tanh(self.value), lambda g, a, out: g * (1 - out * out))
+
+    def sigmoid(self):
+        out = 0.5 * (np.tanh(0.5 * self.value) + 1)  # overflow-free logistic
+        return self.tape.unary(self, out, lambda g, a, out: g * out * (1 - out))
+
+    def relu(self):
+        return self.tape.unary(self, np.maximum(self.value, 0), lambda g, a, out: g * (a > 0))
+
+    # -- shape and reductions ---------------------------------------------------------------
+
+    @property
+    def T(self):
+        return self.tape.unary(self, self.value.T, lambda g, a, out: g.T)
+
+    def reshape(self, *shape):
+        return self.tape.unary(self, self.value.reshape(*shape), lambda g, a, out: g.reshape(a.shape))
+
+    def sum(self, axis=None, keepdims=False):
+        return self.tape.unary(self, self.value.sum(axis=axis, keepdims=keepdims),
+                               lambda g, a, out: _expand(g, a.shape, axis, keepdims))
+
+    def mean(self, axis=None, keepdims=False):
+        count = self.value.size // max(1, np.size(self.value.sum(axis=axis)))
+        return self.tape.unary(self, self.value.mean(axis=axis, keepdims=keepdims),
+                               lambda g, a, out: _expand(g / count, a.shape, axis, keepdims))
+
+    def softmax_cross_entropy(self, labels):
+        """Mean cross-entropy of rows of logits against integer class labels (fused and stable)."""
+        labels = np.asarray(labels)
+        shifted = self.value - self.value.max(axis=1, keepdims=True)
+        log_norm = np.log(np.exp(shifted).sum(axis=1, keepdims=True))
+        rows = np.arange(shifted.shape[0])
+        loss = np.mean(log_norm[:, 0] - shifted[rows, labels])
+
+        def vjp(g, a, out):
+            probs = np.exp(shifted - log_norm)
+            probs[rows, labels] -= 1
+            probs *= g / shifted.shape[0]
+            return probs
+
+        return self.tape.unary(self, np.asarray(loss), vjp)
+
+
+def _value(x):
+    return x.value if isinstance(x, TapeVar) else x
+
+
+def _expand(g, shape, axis, keepdims):
+    # adjoint of a reduction: put the reduced axes back and broadcast
+    if axis is not None and not keepdims:
+        g = np.expand_dims(g, axis)
+    return np.broadcast_to(g, shape)
+
+
+# Binary vector-Jacobian products: (g, a, b, out, need) -> (adjoint of a, adjoint of b),
+# skipping (None) the operands with need[i] False, i.e. constants
+
+def _add_vjp(g, a, b, out, need):
+    return g, g
+
+
+def _sub_vjp(g, a, b, out, need):
+    return g, (-g if need[1] else None)
+
+
+def _mul_vjp(g, a, b, out, need):
+    return (g * b if need[0] else None), (g * a if need[1] else None)
+
+
+def _div_vjp(g, a, b, out, need):
+    ga = g / b
+    return ga, (-ga * out if need[1] else None)
+
+
+def _pow_vjp(g, a, b, out, need):
+    ga = g * b * np.power(a, b - 1) if need[0] else None
+    gb = g * out * np.log(np.where(a > 0, a, 1)) if need[1] else None
+    return ga, gb
+
+
+def _matmul_vjp(g, a, b, out, need):
+    a, b = np.asarray(a), np.asarray(b)
+    if b.ndim == 1:
+        ga = np.multiply.outer(g, b) if need[0] else None
+    elif a.ndim == 1:
+        ga = b @ g if need[0] else None
+    else:
+        ga = g @ np.swapaxes(b, -1, -2) if need[0] else None
+    if not need[1]:
+        return ga, None
+    if a.ndim == 1:
+        return ga, np.multiply.outer(a, g)
+    return ga, np.swapaxes(a, -1, -2) @ g
+
+
+def _unbroadcast(g, shape):
+    # sum the adjoint of a broadcast result back down to an operand's shape
+    if g.shape == shape:
+        return g
+    g = g.sum(axis=tuple(range(g.ndim - len(shape)))) if g.ndim > len(shape) else g
+    axes = tuple(i for i, n in enumerate(shape) if n == 1 and g.shape[i] != 1)
+    return g.sum(axis=axes, keepdims=True) if axes else g
+
+
+class Tape:
+    """Records TapeVar operations; gradient() replays them backwards once."""
+
+    def __init__(self):
+        self.values = []     # forward value of each entry
+        self.parents = []    # parent entry indices (None for constant operands)
+        self.vjps = []       # vector-Jacobian product of each entry (None for inputs)
+        self.adjoints = []   # adjoint buffers by entry index, kept across reset()
+        self.backward_passes = 0
+        self.allocations = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def reset(self):
+        """Forget the recorded operations (keeping the adjoint buffers) for the next forward pass."""
+        self.values.clear()
+        self.parents.clear()
+        self.vjps.clear()
+
+    def _record(self, value, parents, vjp):
+        self.values.append(value)
+        self.parents.append(parents)
+        self.vjps.append(vjp)
+        return TapeVar(self, len(self.values) - 1, value)
+
+    def variable(self, value, dtype=np.float64):
+        """An input to differentiate with respect to (not copied when already an array of dtype)."""
+        return self._record(np.asarray(value, dtype=dtype), (), None)
+
+    def unary(self, a, out, vjp):
+        return self._record(np.asarray(out), (a.index,), lambda g, args, out: (vjp(g, args[0], out),))
+
+    def binary(self, a, b, out, vjp):
+        for x in (a, b):
+            if isinstance(x, TapeVar) and x.tape is not self:
+                raise ValueError("operands were recorded on different tapes")
+        parents = (a.index if isinstance(a, TapeVar) else None, b.index if isinstance(b, TapeVar) else None)
+        ca, cb = _value(a), _value(b)
+        need = (parents[0] is not None, parents[1] is not None)
+        return self._record(np.asarray(out), parents, lambda g, args, out: vjp(g, ca, cb, out, need))
+
+    def _buffer(self, i):
+        # adjoint buffer for entry i, reused from earlier passes when the shape matches
+        value = self.values[i]
+        # adjoints of integer or boolean values are float64
+        dtype = value.dtype if value.dtype.kind in "fc" else np.dtype(np.float64)
+        if i >= len(self.adjoints):
+            self.adjoints.extend([None] * (i + 1 - len(self.adjoints)))
+        buffer = self.adjoints[i]
+        if buffer is not None and buffer.shape == value.shape and buffer.dtype == dtype:
+            return buffer
+        buffer = np.empty(value.shape, dtype=dtype)
+        self.adjoints[i] = buffer
+        self.allocations += 1
+        return buffer
+
+    def gradient(self, output, wrt, copy=False):
+        """Adjoints d output / d x for every x in wrt (a TapeVar or a list of them), in one
+        reverse sweep. output must be a scalar TapeVar.
+
+        The results are views of the tape's adjoint buffers, which the next gradient() call
+        overwrites; pass copy=True to keep them (e.g. an optimizer holding past gradients)."""
+        single = isinstance(wrt, TapeVar)
+        wrt = [wrt] if single else list(wrt)
+        if output.tape is not self or output.value.size != 1:
+            raise ValueError("gradient() needs a scalar output recorded on this tape")
+        touched = np.zeros(output.index + 1, dtype=bool)
+        seed = self._buffer(output.index)
+        seed.fill(1)
+        touched[output.index] = True
+        for i in range(output.index, -1, -1):
+            vjp = self.vjps[i]
+            if not touched[i] or vjp is None:
+                continue
+            parents = self.parents[i]
+            grads = vjp(self.adjoints[i], [self.values[p] if p is not None else None for p in parents], self.values[i])
+            for p, g in zip(parents, grads):
+                if p is None or g is None:
+                    continue
+                g = _unbroadcast(np.asarray(g), self.values[p].shape)
+                buffer = self._buffer(p)
+                if touched[p]:
+                    buffer += g
+                else:
+                    np.copyto(buffer, g)
+                    touched[p] = True
+        self.backward_passes += 1
+        grads = []
+        for x in wrt:
+            if x.index <= output.index and touched[x.index]:
+                grads.append(self.adjoints[x.index].copy() if copy else self.adjoints[x.index])
+            else:
+                grads.append(np.zeros_like(x.value, dtype=np.float64))
+        return grads[0] if single else grads
+
+
+def _unary_method(op):
+    return {"sin": TapeVar.sin, "cos": TapeVar.cos, "tan": TapeVar.tan, "exp": TapeVar.exp, "log": TapeVar.log,
+            "tanh": TapeVar.tanh}[op]
+
+
+def run_expression(root, values, tape=None):
+    """Evaluate an expression DAG on a tape; returns (tape, output TapeVar, inputs by name)."""
+    tape = Tape() if tape is None else tape
+    inputs = {name: tape.variable(values[name]) for name in sorted(root.free)}
+    results = {}
+    for node in nodes(root):
+        op = node.op
+        if op == "const":
+            result = node.value
+        elif op == "var":
+            result = inputs[node.value]
+        else:
+            args = [results[a.id] for a in node.args]
+            if op == "add":
+                result = args[0]
+                for a in args[1:]:
+                    result = result + a
+            elif op == "mul":
+                result = args[0]
+                for a in args[1:]:
+                    result = result * a
+            elif op == "pow":
+                result = args[0] ** args[1]
+            elif isinstance(args[0], TapeVar):
+                result = _unary_method(op)(args[0])
+            else:
+                result = getattr(np, op)(args[0])
+        results[node.id] = result
+    output = results[root.id]
+    if not isinstance(output, TapeVar):
+        output = tape.variable(output)
+    return tape, output, inputs
+
+
+def expression_gradient(root, values):
+    """Gradient of root with respect to all of its variables in one backward pass.
+
+    values maps names to scalars or equally shaped arrays. With arrays the output is
+    summed, so each partial comes back elementwise (the derivative at every point)."""
+    tape, output, inputs = run_expression(root, values)
+    if output.value.size != 1:
+        output = output.sum()
+    names = sorted(inputs)
+    return dict(zip(names, tape.gradient(output, [inputs[name] for name in names])))
+
+
+def gradient_check(root, values, tolerance=1e-10):
+    """Compare expression_gradient with the compiled symbolic derivatives; returns the worst
+    relative error per variable and raises AssertionError past `tolerance`."""
+    from .codegen import lambdify
+    names = tuple(sorted(root.free))
+    got = expression_gradient(root, values)
+    errors = {}
+    for name in names:
+        expected = np.broadcast_to(lambdify(diff(root, name), names)(*(values[n] for n in names)),
+                                   np.shape(got[name]))
+        scale = np.maximum(1.0, np.abs(expected))
+        errors[name] = float(np.max(np.abs(got[name] - expected) / scale)) if np.size(expected) else 0.0
+        if not errors[name] <= tolerance:
+            raise AssertionError(f"tape gradient d/d{name} of {root} is off by {errors[name]:.3g} (> {tolerance})")
+    return errors
+
+
+def mlp_loss(tape, x, labels, params):
+    """Softmax cross-entropy of a tanh MLP, params = [(W, b), ...] as TapeVars."""
+    h = x
+    for i, (w, b) in enumerate(params):
+        h = h @ w + b
+        if i < len(params) - 1:
+            h = h.tanh()
+    return h.softmax_cross_entropy(labels)
+
+
+def _mlp_manual(x, labels, weights):
+    # the same loss and gradient with hand-written backpropagation, for reference
+    activations, h = [x], x
+    for i, (w, b) in enumerate(weights):
+        h = h @ w + b
+        if i < len(weights) - 1:
+            h = np.tanh(h)
+        activations.append(h)
+    shifted = h - h.max(axis=1, keepdims=True)
+    probs = np.exp(shifted)
+    probs /= probs.sum(axis=1, keepdims=True)
+    rows = np.arange(len(labels))
+    loss = -np.mean(np.log(probs[rows, labels]))
+    delta = probs
+    delta[rows, labels] -= 1
+    delta /= len(labels)
+    grads = []
+    for i in range(len(weights) - 1, -1, -1):
+        w, _ = weights[i]
+        grads.append((activations[i].T @ delta, delta.sum(axis=0)))
+        if i:
+            delta = (delta @ w.T) * (1 - activations[i] ** 2)
+    return loss, grads[::-1]
+
+
+def benchmark_mlp(sizes=(784, 128, 10), batch=64, steps=20, seed=0):
+    """Time forward + backward of an MLP on one reused tape against hand-written NumPy
+    backprop; returns seconds per step, overhead ratio, parameter count and the largest
+    gradient difference."""
+    rng = np.random.default_rng(seed)
+    weights = [(rng.normal(0, 1 / np.sqrt(m), (m, n)), np.zeros(n)) for m, n in zip(sizes[:-1], sizes[1:])]
+    x = rng.normal(size=(batch, sizes[0]))
+    labels = rng.integers(0, sizes[-1], batch)
+    tape = Tape()
+
+    def taped():
+        tape.reset()
+        params = [(tape.variable(w), tape.variable(b)) for w, b in weights]
+        loss = mlp_loss(tape, x, labels, params)
+        return loss.value, tape.gradient(loss, [p for pair in params for p in pair])
+
+    def best(fn):
+        fn()  # warm up (and allocate the adjoint buffers)
+        times = []
+        for _ in range(int(steps)):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    tape_s = best(taped)
+    manual_s = best(lambda: _mlp_manual(x, labels, weights))
+    allocations = tape.allocations
+    loss, grads = taped()
+    manual_loss, manual_grads = _mlp_manual(x, labels, weights)
+    flat = [g for pair in manual_grads for g in pair]
+    error = max(float(np.max(np.abs(g - m))) for g, m in zip(grads, flat))
+    result = {"parameters": sum(w.size + b.size for w, b in weights), "tape_s": tape_s, "manual_s": manual_s,
+              "overhead": tape_s / manual_s, "max_grad_error": error, "loss_error": abs(float(loss) - manual_loss),
+              "tape_entries": len(tape), "new_allocations": tape.allocations - allocations}
+    logger.info("MLP %s batch %d: tape %.3gms/step, manual %.3gms/step (%.2fx), grad error %.2g", sizes, batch,
+                tape_s * 1e3, manual_s * 1e3, result["overhead"], error)
+    return result
@@ -1,6 +1,34 @@
-"""Minimal demo entrypoint for week 03"""
-def main():
-    print("Demo placeholder for week 03")
+"""Demo entrypoint for week 03: symbolic derivatives on a hash-consed expression DAG."""
+import argparse
+
+from ai_symdiff import diff, parse, stats
+from ai_symdiff.codegen import benchmark
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Differentiate an expression and report the DAG size per order.")
+    parser.add_argument("expression", nargs="?", default="x**2*sin(x)")
+    parser.add_argument("--var", default="x")
+    parser.add_argument("--order", type=int, default=3, help="highest derivative order (default: 3)")
+    parser.add_argument("--quiet", action="store_true", help="only print sizes, not the derivatives")
+    parser.add_argument("--benchmark", type=float, metavar="N", default=None,
+                        help="time interpreted vs compiled evaluation of the last derivative on N points")
+    args = parser.parse_args(argv)
+
+    node = parse(args.expression)
+    print(f"f = {node}")
+    print(f"{'order':>5} {'dag':>6} {'tree':>8} {'depth':>5}")
+    for order in range(1, args.order + 1):
+        node = diff(node, args.var)
+        info = stats(node)
+        print(f"{order:>5} {info['dag_nodes']:>6} {info['tree_nodes']:>8} {info['depth']:>5}"
+              + ("" if args.quiet else f"  {node}"))
+
+    if args.benchmark:
+        result = benchmark(node, size=int(args.benchmark))
+        print(f"{result['size']:,} points: interpreted {result['interpreted_per_sec']:,.0f}/s, "
+              f"compiled {result['compiled_per_sec']:,.0f}/s ({result['speedup']:.2f}x)")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,217 @@
+# sympymin_keywords.py
+import os
+import sys
+import time
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn
+
+SYMDIFF_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+_state = {}  # current expression and results shared between keywords of one test
+
+def setup_symbolic_env():
+    # make ai_symdiff importable for the keywords below
+    if SYMDIFF_SRC not in sys.path:
+        sys.path.insert(0, SYMDIFF_SRC)
+    logger.info("Symbolic env setup")
+
+def _publish(**values):
+    # keyword results are handed to the suite as test variables (${expression}, ...)
+    builtin = BuiltIn()
+    for name, value in values.items():
+        builtin.set_test_variable("${%s}" % name, value)
+    _state.update(values)
+
+def _current():
+    node = _state.get("node")
+    if node is None:
+        raise AssertionError("Parse Expression first")
+    return node
+
+def parse_expression(text):
+    # parse infix text (x * sin(x), x**2, x^2, f.diff(x)) as the current expression
+    from ai_symdiff import parse
+    node = parse(text)
+    _state.update(node=node, source=node)
+    _publish(expression=str(node))
+    logger.info(f"Parsed {text!r} as {node}")
+    return str(node)
+
+def differentiate_expression(var="x", order=1):
+    # replace the current expression by its order-th derivative; sets ${expression}
+    from ai_symdiff import diff, stats
+    node = diff(_current(), var, int(order))
+    _state["node"] = node
+    _publish(expression=str(node))
+    logger.info(f"d^{order}/d{var}^{order}: {node}  {stats(node)}")
+    return str(node)
+
+def _free_names(*nodes):
+    return sorted(set().union(*(n.free for n in nodes))) or ["x"]
+
+def expression_should_equal(expected, samples=8, tolerance=1e-9, seed=0):
+    # the current expression equals `expected`: the same interned node, or (for forms
+    # the canonicalizer does not unify, e.g. sin(x)**2 + cos(x)**2 vs 1) the same value
+    # at `samples` random points, like sympy's equals()
+    import numpy as np
+    from ai_symdiff import evaluate, parse
+    actual, want = _current(), parse(expected)
+    if actual is want:
+        logger.info(f"{actual} is {expected}")
+        return
+    names = _free_names(actual, want)
+    points = np.random.default_rng(int(seed)).uniform(0.1, 2.0, (len(names), int(samples)))
+    values = dict(zip(names, points))
+    got, ref = evaluate(actual, values), evaluate(want, values)
+    if not np.allclose(got, ref, rtol=float(tolerance), atol=float(tolerance)):
+        raise AssertionError(f"{actual} != {want} (e.g. {got.flat[0]!r} vs {ref.flat[0]!r} at "
+                             f"{ {n: float(values[n][0]) for n in names} })")
+    logger.info(f"{actual} == {want} at {samples} random points")
+
+def evaluate_symbolic_derivative_numeric_check(at, tolerance=1e-6, var="x", step=1e-5):
+    # d/d`var` of the current expression at `at` against a central difference, both
+    # through compiled NumPy functions; sets ${symbolic_value}, ${numeric_value}
+    import numpy as np
+    from ai_symdiff import diff, lambdify
+    node = _current()
+    at, step = float(at), float(step)
+    names = tuple(sorted(node.free | {var}))
+    point = {name: at for name in names}
+    symbolic = float(lambdify(diff(node, var), names)(**point))
+    f = lambdify(node, names)
+    shifted = {name: np.array([at + step, at - step]) if name == var else at for name in names}
+    upper, lower = f(**shifted)
+    numeric = float((upper - lower) / (2 * step))
+    _publish(symbolic_value=symbolic, numeric_value=numeric)
+    error = abs(symbolic - numeric)
+    logger.info(f"d/d{var} {node} at {at}: symbolic {symbolic!r}, central difference {numeric!r} (|diff| {error:.3g})")
+    if not error <= float(tolerance) * max(1.0, abs(symbolic)):
+        raise AssertionError(f"symbolic {symbolic!r} vs numeric {numeric!r} differ by {error:.3g} > {tolerance}")
+    return symbolic
+
+def benchmark_compiled_evaluation(text=None, order=0, var="x", size=1000000, repeat=5):
+    # the DAG interpreter vs the compiled NumPy function on `size` points, for `text`
+    # (default: the current expression) differentiated `order` times; sets ${speedup},
+    # ${compiled_per_sec}, ${interpreted_per_sec}, ${max_error}, ${cache_hits}
+    from ai_symdiff import diff, parse
+    from ai_symdiff.codegen import benchmark, default_cache, lambdify
+    node = diff(_current() if text is None else parse(text), var, int(order))
+    result = benchmark(node, size=int(float(size)), repeat=int(repeat))
+    hits = default_cache.hits
+    lambdify(node)  # compiled once: asking again is a cache hit
+    result["relative_error"] = result["max_error"] / max(1.0, result["max_abs"])
+    _publish(speedup=result["speedup"], compiled_per_sec=result["compiled_per_sec"],
+             interpreted_per_sec=result["interpreted_per_sec"], max_error=result["relative_error"],
+             cache_hits=default_cache.hits - hits)
+    logger.info(f"{result['size']} points, {result['dag_nodes']} DAG nodes, {result['temporaries']} temporaries: "
+                f"interpreted {result['interpreted_per_sec']:.3g}/s, compiled {result['compiled_per_sec']:.3g}/s "
+                f"({result['speedup']:.2f}x), relative error {result['relative_error']:.2g}")
+    return result
+
+def compiled_should_match_interpreted(text, at="0.5,2.0"):
+    # the compiled function of `text` equals the DAG interpreter at the points `at`
+    # (every variable set to each point), including inf/nan from constant folding
+    import numpy as np
+    from ai_symdiff import evaluate, lambdify, parse
+    node = parse(text)
+    points = np.array([float(p) for p in str(at).split(",")])
+    values = {name: points for name in sorted(node.free)}
+    with np.errstate(all="ignore"):
+        got = lambdify(node)(**values)
+        expected = np.broadcast_to(evaluate(node, values), points.shape)
+    if not np.allclose(got, expected, equal_nan=True):
+        raise AssertionError(f"compiled {node} gave {got.tolist()}, interpreter {expected.tolist()}")
+    logger.info(f"compiled {node} at {points.tolist()}: {got.tolist()}")
+    return got.tolist()
+
+def measure_derivative_growth(text, orders="10,20,40", var="x"):
+    # DAG size of successive high-order derivatives of `text`; sets ${dag_sizes},
+    # ${tree_sizes} (order -> nodes) and ${growth_per_order}: how much faster the DAG
+    # grew than the order from the first to the last order (<= 1 is linear or better)
+    from ai_symdiff import diff, parse, stats
+    orders = sorted(int(o) for o in str(orders).split(","))
+    node, done, dag_sizes, tree_sizes = parse(text), 0, {}, {}
+    start = time.perf_counter()
+    for order in orders:
+        node = diff(node, var, order - done)
+        done = order
+        info = stats(node)
+        dag_sizes[order], tree_sizes[order] = info["dag_nodes"], info["tree_nodes"]
+        logger.info(f"order {order}: {info['dag_nodes']} DAG nodes, {info['tree_nodes']} as a tree, "
+                    f"depth {info['depth']} ({time.perf_counter() - start:.3f}s)")
+    first, last = orders[0], orders[-1]
+    growth = (dag_sizes[last] / dag_sizes[first]) / (last / first) if last > first else 1.0
+    _publish(dag_sizes=dag_sizes, tree_sizes=tree_sizes, growth_per_order=growth)
+    return dag_sizes
+
+def derivative_growth_should_be_linear(slack=1.5):
+    growth = _state.get("growth_per_order")
+    if growth is None:
+        raise AssertionError("Measure Derivative Growth first")
+    if growth > float(slack):
+        raise AssertionError(f"DAG grew {growth:.2f}x faster than the derivative order: {_state['dag_sizes']}")
+    logger.info(f"DAG growth {growth:.2f}x the order growth: {_state['dag_sizes']}")
+
+def tape_gradient_should_match_symbolic(text=None, points=1000, tolerance=1e-10, seed=0):
+    # reverse-mode gradient of `text` (default: the current expression) over `points`
+    # random points, all variables in one backward pass, against the compiled symbolic
+    # derivatives; sets ${gradient_errors} (variable -> worst relative error)
+    import numpy as np
+    from ai_symdiff import gradient_check, parse
+    node = _current() if text is None else parse(text)
+    rng = np.random.default_rng(int(seed))
+    values = {name: rng.uniform(0.1, 2.0, int(points)) for name in sorted(node.free)}
+    errors = gradient_check(node, values, tolerance=float(tolerance))
+    _publish(gradient_errors=errors)
+    logger.info(f"tape gradient of {node} at {points} points matches d/d{', d/d'.join(errors)}: {errors}")
+    return errors
+
+def tape_gradient_of_sum_of_squares_should_match(values="1,2,3", dtype="int64"):
+    # gradient of sum(x * x) for `values` recorded as `dtype` must be 2 x in float64,
+    # also when the input is integer (adjoints are always floating point)
+    import numpy as np
+    from ai_symdiff import Tape
+    x = np.array([float(v) for v in str(values).split(",")]).astype(dtype)
+    tape = Tape()
+    var = tape.variable(x, dtype=dtype)
+    grad = tape.gradient((var * var).sum(), var)
+    if grad.dtype.kind not in "fc" or not np.allclose(grad, 2 * x):
+        raise AssertionError(f"d/dx sum(x*x) at {x.tolist()} ({dtype}) gave {grad.tolist()} ({grad.dtype})")
+    logger.info(f"d/dx sum(x*x) at {x.tolist()} ({dtype}): {grad.tolist()}")
+    return grad.tolist()
+
+def tape_gradients_should_survive_reuse(values="0.5,1,2"):
+    # two gradient() calls on one tape: with copy=True the first result keeps its values,
+    # by default it is a view of the adjoint buffer the second call overwrites
+    import numpy as np
+    from ai_symdiff import Tape
+    x = np.array([float(v) for v in str(values).split(",")])
+    results = {}
+    for copy in (True, False):
+        tape = Tape()
+        var = tape.variable(x)
+        first = tape.gradient((var + var).sum(), var, copy=copy)
+        second = tape.gradient((2 / var).sum(), var, copy=copy)
+        results[copy] = (first, second)
+    first, second = results[True]
+    if not (np.allclose(first, 2.0) and np.allclose(second, -2 / x ** 2)):
+        raise AssertionError(f"copy=True gradients changed: {first.tolist()}, {second.tolist()}")
+    shared, second = results[False]
+    if not np.shares_memory(shared, second):
+        raise AssertionError("default gradients are expected to be views of the reused adjoint buffer")
+    logger.info(f"copied gradients kept {first.tolist()}; views now read {shared.tolist()}")
+    return first.tolist()
+
+def benchmark_tape_backprop(sizes="784,128,10", batch=64, steps=20):
+    # forward + backward of a tanh MLP on one reused tape vs hand-written NumPy backprop;
+    # sets ${tape_overhead} (tape time / manual time), ${grad_error}, ${parameters} and
+    # ${new_allocations} (adjoint buffers allocated after the first step)
+    from ai_symdiff.tape import benchmark_mlp
+    sizes = tuple(int(n) for n in str(sizes).split(","))
+    result = benchmark_mlp(sizes=sizes, batch=int(batch), steps=int(steps))
+    _publish(tape_overhead=result["overhead"], grad_error=result["max_grad_error"], parameters=result["parameters"],
+             new_allocations=result["new_allocations"])
+    logger.info(f"MLP {sizes}, {result['parameters']} parameters, batch {batch}: tape {result['tape_s'] * 1e3:.3g} ms, "
+                f"manual {result['manual_s'] * 1e3:.3g} ms ({result['overhead']:.2f}x), "
+                f"gradient error {result['max_grad_error']:.2g}")
+    return result
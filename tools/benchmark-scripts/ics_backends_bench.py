@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+ics_backends_bench.py
+
+Benchmarks the two ICS backends in ics_serializers.py: the raw writer
+(write_ics, escaped/folded byte strings) and the icalendar-library writer
+(write_icalendar, Event.to_ical()), over 1, 10 and 100 plan-years.
+
+For every (backend, years) pair it records:
+- schedule_s: time to compile the records (shared by both backends)
+- serialize_s: best-of-N time to write them to a byte-counting sink
+- events_per_s: events / serialize_s
+- bytes: output size
+- peak_bytes: tracemalloc peak during one extra serialization pass
+  (measured separately so tracing does not skew the timings)
+
+Results are saved as JSON. With --baseline, a run that is slower (events/s) or
+heavier (peak memory) than the baseline by more than --threshold is reported
+as a regression and the script exits with status 1.
+
+Usage:
+    python tools/benchmark-scripts/ics_backends_bench.py -o bench.json
+    python tools/benchmark-scripts/ics_backends_bench.py --years 1,10 --baseline bench.json
+"""
+
+import argparse
+import datetime as dt
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from ics_schedule import START_DATE, TOTAL_WEEKS, TZID, iter_records  # noqa: E402
+from ics_serializers import write_ics, write_icalendar  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+BACKENDS = {
+    "raw": write_ics,
+    "icalendar": write_icalendar,
+}
+MONTHS_PER_YEAR = 12
+DEFAULT_THRESHOLD = 0.20  # 20% slower / heavier than the baseline counts as a regression
+MEMORY_SLACK = 64 * 1024  # streaming peaks are a few KiB; ignore growth below this
+
+
+class CountingSink:
+    # Binary stream that only counts what is written, so disk speed is not measured
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def plan_years(years):
+    # One plan-year is the 48-week plan; later years start 52 weeks later and
+    # carry month numbers 13, 14, ... so their UIDs stay distinct
+    for year in range(years):
+        start = START_DATE + dt.timedelta(weeks=52 * year)
+        for rec in iter_records(start, TOTAL_WEEKS):
+            if rec.slot == "reflect" and year:
+                continue  # the weekly RRULE already covers later years
+            rec.month += MONTHS_PER_YEAR * year if rec.month else 0
+            yield rec
+
+def serialize(backend, records):
+    sink = CountingSink()
+    events = BACKENDS[backend](records, sink, tzid=TZID)
+    return events, sink.bytes
+
+def run_case(backend, years, records, schedule_s, repeat):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        events, size = serialize(backend, records)
+        timings.append(time.perf_counter() - t0)
+    serialize_s = min(timings)
+
+    tracemalloc.start()
+    serialize(backend, records)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "backend": backend,
+        "years": years,
+        "events": events,
+        "schedule_s": round(schedule_s, 4),
+        "serialize_s": round(serialize_s, 4),
+        "events_per_s": round(events / serialize_s, 1) if serialize_s else None,
+        "bytes": size,
+        "peak_bytes": peak,
+    }
+
+def run(years_list, backends, repeat):
+    results = []
+    for years in years_list:
+        t0 = time.perf_counter()
+        records = list(plan_years(years))
+        schedule_s = time.perf_counter() - t0
+        logger.info("%d plan-year(s): %d records scheduled in %.3fs", years, len(records), schedule_s)
+        for backend in backends:
+            result = run_case(backend, years, records, schedule_s, repeat)
+            logger.info("  %-9s %8d events  %7.3fs  %10.0f events/s  %11d bytes  peak %8.1f KiB",
+                        backend, result["events"], result["serialize_s"], result["events_per_s"],
+                        result["bytes"], result["peak_bytes"] / 1024)
+            results.append(result)
+    return results
+
+def find_regressions(results, baseline, threshold):
+    # Compares runs that exist in both sets; returns human-readable messages
+    previous = {(r["backend"], r["years"]): r for r in baseline["results"]}
+    messages = []
+    for r in results:
+        old = previous.get((r["backend"], r["years"]))
+        if not old:
+            continue
+        if old["events_per_s"] and r["events_per_s"] < old["events_per_s"] * (1 - threshold):
+            messages.append(f"{r['backend']} x{r['years']}: events/s {old['events_per_s']:.0f} -> "
+                            f"{r['events_per_s']:.0f}")
+        if r["peak_bytes"] > max(old["peak_bytes"] * (1 + threshold), old["peak_bytes"] + MEMORY_SLACK):
+            messages.append(f"{r['backend']} x{r['years']}: peak memory {old['peak_bytes']} -> "
+                            f"{r['peak_bytes']} bytes")
+    return messages
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the raw and icalendar ICS backends.")
+    parser.add_argument("--years", default="1,10,100", help="comma-separated plan-years (default: %(default)s)")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="comma-separated (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the best is kept")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative slowdown / memory growth (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    for backend in backends:
+        if backend not in BACKENDS:
+            parser.error(f"unknown backend {backend!r}")
+    if "icalendar" in backends:
+        try:
+            import icalendar  # noqa: F401
+        except ImportError:
+            logger.warning("icalendar is not installed; skipping that backend")
+            backends.remove("icalendar")
+
+    results = run([int(y) for y in args.years.split(",")], backends, args.repeat)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info("Saved %s", args.output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for message in regressions:
+            logger.error("Regression: %s", message)
+        if regressions:
+            return 1
+        logger.info("No regressions beyond %.0f%% against %s", args.threshold * 100, args.baseline)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())